@@ -16,7 +16,8 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
-from bbutil.database.types import Types, Column, DataType, Data, select_interval
+from bbutil.database.types import (Types, Column, Index, DataType, Row, Data, ListValue, JsonValue,
+                                   select_interval, create_row_type, create_row_decoder)
 from bbutil.database.sqlite import SQLite
 from bbutil.database.table import Table
 from bbutil.database.database import Database
@@ -24,15 +25,26 @@ from bbutil.database.database import Database
 __all__ = [
     "sqlite",
 
+    "aio",
+    "cache",
     "database",
+    "lookup",
     "table",
+    "transfer",
     "types",
+    "writer",
 
     "Types",
     "Column",
+    "Index",
+    "Row",
     "Data",
+    "ListValue",
+    "JsonValue",
     "DataType",
     "select_interval",
+    "create_row_type",
+    "create_row_decoder",
 
     "SQLite",
     "Table",
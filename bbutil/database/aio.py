@@ -0,0 +1,262 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import asyncio
+import functools
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Optional, List, Dict, Tuple, Union, AsyncIterator
+
+import bbutil
+
+from bbutil.database.types import Row
+from bbutil.database.table import Table
+from bbutil.database.database import Database
+
+__all__ = [
+    "AsyncTable",
+    "AsyncDatabase"
+]
+
+
+async def _run(executor: ThreadPoolExecutor, function, *args, **kwargs):
+    _loop = asyncio.get_running_loop()
+    _result = await _loop.run_in_executor(executor, functools.partial(function, *args, **kwargs))
+    return _result
+
+
+@dataclass
+class AsyncTable(object):
+
+    table: Optional[Table] = None
+    writer: Optional[ThreadPoolExecutor] = None
+    reader: Optional[ThreadPoolExecutor] = None
+    delay: float = 0.0
+    batch_size: int = 10000
+    commits: int = 0
+    _pending: List[Tuple[List[Row], asyncio.Future]] = field(default_factory=list)
+    _task: Optional[asyncio.Task] = None
+
+    @property
+    def name(self) -> str:
+        return self.table.name
+
+    @property
+    def pending(self) -> int:
+        _count = 0
+        for _item in self._pending:
+            _count += len(_item[0])
+        return _count
+
+    def _take(self) -> List[Tuple[List[Row], asyncio.Future]]:
+        _count = 0
+        _index = 0
+
+        for _item in self._pending:
+            if (_index > 0) and ((_count + len(_item[0])) > self.batch_size):
+                break
+            _count += len(_item[0])
+            _index += 1
+
+        _pending = self._pending[:_index]
+        self._pending = self._pending[_index:]
+        return _pending
+
+    async def _write(self):
+        while len(self._pending) > 0:
+            await asyncio.sleep(self.delay)
+
+            _pending = self._take()
+            _groups = []
+            for _item in _pending:
+                _groups.append(_item[0])
+
+            try:
+                _result = await _run(self.writer, self.table.sqlite.insert_groups, self.table.name,
+                                     self.table.names, _groups)
+            except Exception as e:
+                bbutil.log.exception(e)
+                _result = [-1] * len(_groups)
+
+            self.commits += 1
+            self.table.invalidate()
+
+            for _item, _count in zip(_pending, _result):
+                _future = _item[1]
+                if _future.done() is False:
+                    _future.set_result(_count)
+
+        self._task = None
+        return
+
+    async def flush(self):
+        while self._task is not None:
+            await asyncio.shield(self._task)
+        return
+
+    async def store(self, data: Union[Row, List[Row]] = None) -> int:
+        _data = data
+        if data is None:
+            _data = list(self.table.data)
+
+        if isinstance(_data, Row) is True:
+            _data = [_data]
+
+        if len(_data) == 0:
+            return 0
+
+        _loop = asyncio.get_running_loop()
+        _future = _loop.create_future()
+        self._pending.append((_data, _future))
+
+        if self._task is None:
+            self._task = _loop.create_task(self._write())
+
+        _count = await _future
+        return _count
+
+    async def update(self, data: Row, data_filter: str, filter_value=None) -> bool:
+        await self.flush()
+
+        _check = await _run(self.writer, self.table.update, data, data_filter, filter_value)
+        return _check
+
+    async def update_many(self, data_list: List[Row], key_column: str) -> int:
+        await self.flush()
+
+        _count = await _run(self.writer, self.table.update_many, data_list, key_column)
+        return _count
+
+    async def upsert(self, data: Union[Row, List[Row]] = None) -> int:
+        await self.flush()
+
+        _count = await _run(self.writer, self.table.upsert, data)
+        return _count
+
+    async def select(self, sql_filter: str = "", names=None, data_values=None, verbose: bool = False) -> List[Row]:
+        _result = await _run(self.reader, self.table.select, sql_filter, names, data_values, verbose)
+        return _result
+
+    async def count(self) -> int:
+        _count = await _run(self.reader, self.table.check)
+        return _count
+
+    async def iterate(self, sql_filter: str = "", names=None, data_values=None,
+                      batch_size: int = 1000) -> AsyncIterator[Row]:
+        # the cursor of a stream stays on its own thread, so it neither blocks the readers nor the writer
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bbutil-stream")
+        _rows = self.table.iter_select(sql_filter, names, data_values, batch_size)
+
+        try:
+            while True:
+                _batch = await _run(_executor, list, islice(_rows, batch_size))
+                if len(_batch) == 0:
+                    break
+
+                for _item in _batch:
+                    yield _item
+        finally:
+            await _run(_executor, _rows.close)
+            await _run(_executor, self.table.sqlite.manager.close_thread)
+            _executor.shutdown(wait=False)
+        return
+
+
+@dataclass
+class AsyncDatabase(object):
+
+    database: Optional[Database] = None
+    readers: int = 4
+    delay: float = 0.0
+    batch_size: int = 10000
+    tables: Dict[str, AsyncTable] = field(default_factory=dict)
+    _writer: Optional[ThreadPoolExecutor] = None
+    _reader: Optional[ThreadPoolExecutor] = None
+
+    def get_table(self, name: str) -> Optional[AsyncTable]:
+        try:
+            _table = self.tables[name]
+        except KeyError:
+            return None
+        return _table
+
+    async def start(self) -> bool:
+        if self.database is None:
+            bbutil.log.error("No database!")
+            return False
+
+        self.database.use_threads = True
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bbutil-writer")
+        self._reader = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix="bbutil-reader")
+
+        _check = await _run(self._writer, self.database.start)
+        if _check is False:
+            await self.stop()
+            return False
+
+        self.tables.clear()
+
+        for _table in self.database.tables:
+            _async = AsyncTable(table=_table,
+                                writer=self._writer,
+                                reader=self._reader,
+                                delay=self.delay,
+                                batch_size=self.batch_size)
+            self.tables[_table.name] = _async
+        return True
+
+    async def flush(self):
+        for _table in self.tables.values():
+            await _table.flush()
+        return
+
+    async def store(self) -> int:
+        _results = await asyncio.gather(*[_table.store() for _table in self.tables.values()])
+
+        _count = 0
+        for _result in _results:
+            if _result == -1:
+                return -1
+            _count += _result
+        return _count
+
+    async def load(self) -> int:
+        await self.flush()
+
+        _count = await _run(self._writer, self.database.load)
+        return _count
+
+    async def stop(self) -> bool:
+        await self.flush()
+
+        _check = True
+
+        if (self.database is not None) and (self.database.sqlite is not None):
+            _check = await _run(self._writer, self.database.sqlite.close)
+
+        if self._reader is not None:
+            self._reader.shutdown(wait=True)
+            self._reader = None
+
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        return _check
@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import copy
+import threading
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, List, Any
+
+import bbutil
+
+from bbutil.database.types import Row
+
+__all__ = [
+    "ResultCache"
+]
+
+
+def _copy_rows(rows: List[Row]) -> List[Row]:
+    # callers may change their rows, the cached entries must stay as they were read
+    return [copy.copy(_row) for _row in rows]
+
+
+@dataclass
+class ResultCache(object):
+
+    name: str = ""
+    max_rows: int = 10000
+    rows: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    _entries: OrderedDict = field(default_factory=OrderedDict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def count(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any) -> Optional[List[Row]]:
+        with self._lock:
+            try:
+                _rows = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return _copy_rows(_rows)
+
+    def put(self, key: Any, rows: List[Row]) -> bool:
+        _count = len(rows)
+        if _count > self.max_rows:
+            return False
+
+        with self._lock:
+            _old = self._entries.pop(key, None)
+            if _old is not None:
+                self.rows -= len(_old)
+
+            while (self.rows + _count) > self.max_rows:
+                _key, _evicted = self._entries.popitem(last=False)
+                self.rows -= len(_evicted)
+                self.evictions += 1
+
+            self._entries[key] = _copy_rows(rows)
+            self.rows += _count
+        return True
+
+    def invalidate(self):
+        with self._lock:
+            if len(self._entries) == 0:
+                return
+
+            self._entries.clear()
+            self.rows = 0
+            self.invalidations += 1
+        return
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.rows = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+        return
+
+    def report(self):
+        _total = self.hits + self.misses
+
+        _ratio = 0.0
+        if _total > 0:
+            _ratio = self.hits * 100.0 / _total
+
+        _text = "Cache hits {0:d}, misses {1:d} ({2:.1f}%), evictions {3:d}, invalidations {4:d}, rows {5:d}"
+        bbutil.log.inform(self.name, _text.format(self.hits, self.misses, _ratio, self.evictions,
+                                                  self.invalidations, self.rows))
+        return
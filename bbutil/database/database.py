@@ -18,12 +18,15 @@
 
 import abc
 from abc import ABCMeta
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, Dict, Iterator
 
 import bbutil
 
 from bbutil.database.sqlite import SQLite
+from bbutil.database.sqlite.types import Transaction, Maintenance
 from bbutil.database.table import Table
 
 __all__ = [
@@ -38,6 +41,14 @@ class Database(metaclass=ABCMeta):
     sqlite: Optional[SQLite] = None
     tables: List[Table] = field(default_factory=list)
     filename: str = ""
+    profile: str = ""
+    use_threads: bool = False
+    lazy: bool = False
+    parallel: bool = False
+    workers: int = 4
+    use_catalog: bool = False
+    maintenance: Dict[str, Maintenance] = field(default_factory=dict)
+    _table_map: Dict[str, Table] = field(default_factory=dict)
 
     @abc.abstractmethod
     def init(self):
@@ -51,11 +62,33 @@ class Database(metaclass=ABCMeta):
     def clear_data(self):
         pass
 
-    def get_table(self, name: str) -> Optional[Table]:
+    def _find_table(self, name: str) -> Optional[Table]:
+        try:
+            _table = self._table_map[name]
+        except KeyError:
+            _table = None
+
+        if (_table is not None) and (_table.name == name) and (len(self._table_map) == len(self.tables)):
+            return _table
+
+        self._table_map.clear()
         for _table in self.tables:
-            if _table.name == name:
-                return _table
-        return None
+            self._table_map[_table.name] = _table
+
+        try:
+            _table = self._table_map[name]
+        except KeyError:
+            return None
+        return _table
+
+    def get_table(self, name: str) -> Optional[Table]:
+        _table = self._find_table(name)
+        if _table is None:
+            return None
+
+        if (self.lazy is True) and (_table.loaded is False) and (self.sqlite is not None):
+            _table.ensure()
+        return _table
 
     def clear(self):
         for _table in self.tables:
@@ -64,16 +97,164 @@ class Database(metaclass=ABCMeta):
         self.clear_data()
         return
 
+    @contextmanager
+    def transaction(self, write: bool = True) -> Iterator[Transaction]:
+        _transaction = None
+
+        try:
+            with self.sqlite.transaction(write) as _transaction:
+                yield _transaction
+        finally:
+            # result caches may hold rows that were rolled back
+            if (_transaction is not None) and (_transaction.committed is False):
+                for _table in self.tables:
+                    _table.invalidate()
+        return
+
+    def _report(self, result: Maintenance):
+        self.maintenance[result.operation] = result
+
+        if result.success is False:
+            bbutil.log.error("{0:s} of {1:s} has failed!".format(result.operation, self.name))
+            return
+
+        _text = "{0:s}: {1:d} -> {2:d} pages, {3:d} free, {4:.3f}s".format(result.operation,
+                                                                          result.pages_before,
+                                                                          result.pages_after,
+                                                                          result.free_pages,
+                                                                          result.duration)
+        if result.operation == "backup":
+            _text = "backup: {0:d} pages in {1:d} steps, {2:.3f}s".format(result.pages,
+                                                                          result.steps,
+                                                                          result.duration)
+
+        bbutil.log.inform(self.name, _text)
+        return
+
+    def backup(self, target: str, pages_per_step: int = 256, sleep: float = 0.0) -> Maintenance:
+        _result = self.sqlite.backup(target, pages_per_step, sleep)
+        self._report(_result)
+        return _result
+
+    def vacuum(self, incremental: bool = True, pages: int = 0) -> Maintenance:
+        _result = self.sqlite.vacuum(incremental, pages)
+        self._report(_result)
+        return _result
+
+    def analyze(self) -> Maintenance:
+        _result = self.sqlite.analyze()
+        self._report(_result)
+        return _result
+
+    def optimize(self) -> Maintenance:
+        _result = self.sqlite.optimize()
+        self._report(_result)
+        return _result
+
+    def maintain(self, incremental: bool = True) -> bool:
+        _success = True
+
+        # 2 is INCREMENTAL, without it only an explicit full vacuum is run
+        _mode = self.sqlite.get_auto_vacuum()
+        if (incremental is False) or (_mode == 2):
+            _result = self.vacuum(incremental)
+            _success = _result.success
+        else:
+            bbutil.log.debug1(self.name, "No incremental auto_vacuum, skip vacuum")
+
+        _result = self.optimize()
+        if _result.success is False:
+            return False
+        return _success
+
+    def _store_parallel(self) -> int:
+        _groups = []
+        _tables = []
+
+        for _table in self.tables:
+            if len(_table.data) == 0:
+                continue
+
+            _groups.append((_table.name, _table.names, _table.data))
+            _tables.append(_table)
+
+        if len(_groups) == 0:
+            return 0
+
+        _timer = bbutil.log.timer("Store {0:d} tables".format(len(_groups)))
+        _results = self.sqlite.insert_tables(_groups)
+        _timer.stop()
+
+        _count = 0
+        for _table, _result in zip(_tables, _results):
+            _table.invalidate()
+
+            if _result == -1:
+                return -1
+            _count += _result
+        return _count
+
     def store(self) -> int:
+        if self.parallel is True:
+            _count = self._store_parallel()
+            return _count
+
         _count = 0
         for _table in self.tables:
             _count += _table.store()
         return _count
 
+    def _load_table(self, table: Table) -> int:
+        _timer = bbutil.log.timer("Load {0:s}".format(table.name))
+        _count = table.load(verbose=False)
+        _timer.stop()
+
+        # every table is read with its own connection, the worker thread does not keep it
+        self.sqlite.manager.close_thread()
+        return _count
+
+    def _load_parallel(self) -> int:
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bbutil-load") as _executor:
+            _results = list(_executor.map(self._load_table, self.tables))
+
+        if -1 in _results:
+            bbutil.log.error("Unable to load all tables of {0:s}!".format(self.name))
+            return -1
+
+        _count = sum(_results)
+        bbutil.log.inform(self.name, "Loaded {0:d} from {1:d} tables".format(_count, len(self.tables)))
+        return _count
+
     def load(self) -> int:
+        if self.lazy is True:
+            bbutil.log.debug1(self.name, "Tables are loaded on first access")
+            return 0
+
+        if self.parallel is True:
+            if self.sqlite.use_threads is True:
+                _count = self._load_parallel()
+                return _count
+
+            bbutil.log.warn(self.name, "Parallel load needs threaded connections!")
+
         _count = 0
         for _table in self.tables:
-            _count += _table.load()
+            _result = _table.load()
+            if _result == -1:
+                return -1
+            _count += _result
+        return _count
+
+    def refresh(self) -> int:
+        _count = 0
+        for _table in self.tables:
+            if _table.loaded is False:
+                continue
+
+            _result = _table.refresh()
+            if _result == -1:
+                return -1
+            _count += _result
         return _count
 
     def start(self) -> bool:
@@ -83,9 +264,14 @@ class Database(metaclass=ABCMeta):
             bbutil.log.error("File- or database-name is missing!")
             return False
 
-        self.sqlite = SQLite(name=self.name, filename=self.filename)
+        _use_threads = self.use_threads or self.parallel
 
-        self.sqlite.prepare()
+        self.sqlite = SQLite(name=self.name, filename=self.filename, profile=self.profile,
+                             use_threads=_use_threads, use_catalog=self.use_catalog)
+
+        _check = self.sqlite.prepare()
+        if _check is False:
+            return False
 
         _check = self.prepare()
         if _check is False:
@@ -0,0 +1,164 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import abc
+from abc import ABCMeta
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import List, Dict, Any
+
+from bbutil.database.types import Row
+
+__all__ = [
+    "Lookup",
+    "HashLookup",
+    "SortedLookup"
+]
+
+
+@dataclass
+class Lookup(metaclass=ABCMeta):
+
+    name: str = ""
+    columns: List[str] = field(default_factory=list)
+
+    def key(self, item: Row) -> Any:
+        if len(self.columns) == 1:
+            return getattr(item, self.columns[0], None)
+
+        _key = []
+        for _column in self.columns:
+            _key.append(getattr(item, _column, None))
+        return tuple(_key)
+
+    def match(self, names: List[str]) -> bool:
+        if len(names) != len(self.columns):
+            return False
+
+        for _name in names:
+            if _name not in self.columns:
+                return False
+        return True
+
+    @abc.abstractmethod
+    def add(self, item: Row):
+        pass
+
+    @abc.abstractmethod
+    def find(self, key: Any) -> List[Row]:
+        pass
+
+    @abc.abstractmethod
+    def clear(self):
+        pass
+
+
+@dataclass
+class HashLookup(Lookup):
+
+    index: Dict[Any, List[Row]] = field(default_factory=dict)
+
+    def add(self, item: Row):
+        _key = self.key(item)
+
+        try:
+            _list = self.index[_key]
+        except KeyError:
+            _list = []
+            self.index[_key] = _list
+
+        _list.append(item)
+        return
+
+    def find(self, key: Any) -> List[Row]:
+        try:
+            _list = self.index[key]
+        except KeyError:
+            return []
+        return list(_list)
+
+    def clear(self):
+        self.index.clear()
+        return
+
+
+@dataclass
+class SortedLookup(Lookup):
+
+    keys: List[Any] = field(default_factory=list)
+    items: List[Row] = field(default_factory=list)
+    _pending: List[Row] = field(default_factory=list)
+
+    def add(self, item: Row):
+        self._pending.append(item)
+        return
+
+    def _sort(self):
+        if len(self._pending) == 0:
+            return
+
+        _entries = []
+        for _item in self._pending:
+            _key = self.key(_item)
+            if _key is None:
+                continue
+
+            if (type(_key) is tuple) and (None in _key):
+                continue
+            _entries.append((_key, _item))
+
+        self._pending.clear()
+
+        for (_key, _item) in zip(self.keys, self.items):
+            _entries.append((_key, _item))
+
+        _entries.sort(key=lambda _entry: _entry[0])
+
+        self.keys = [_entry[0] for _entry in _entries]
+        self.items = [_entry[1] for _entry in _entries]
+        return
+
+    def find(self, key: Any) -> List[Row]:
+        # rows with a None key are not sorted in, and range() reads None as an open bound
+        if key is None:
+            return []
+
+        if (type(key) is tuple) and (None in key):
+            return []
+
+        _result = self.range(key, key)
+        return _result
+
+    def range(self, low: Any = None, high: Any = None) -> List[Row]:
+        self._sort()
+
+        _start = 0
+        if low is not None:
+            _start = bisect_left(self.keys, low)
+
+        _end = len(self.keys)
+        if high is not None:
+            _end = bisect_right(self.keys, high)
+
+        return self.items[_start:_end]
+
+    def clear(self):
+        self.keys.clear()
+        self.items.clear()
+        self._pending.clear()
+        return
@@ -17,17 +17,24 @@
 #
 
 import sqlite3
-from dataclasses import dataclass
-from typing import Optional, List, Union
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Optional, List, Union, Iterator, Dict, Tuple
 
 import bbutil
-from bbutil.database.sqlite.types import Execute
+from bbutil.database.sqlite.types import Execute, Transaction, Maintenance
 from bbutil.database.sqlite.manager import Connection
-from bbutil.database.types import Data
+from bbutil.database.sqlite.catalog import Catalog
+from bbutil.database.types import Row, Index
 
 __all__ = [
     "types",
     "manager",
+    "pragma",
+    "catalog",
 
     "SQLite"
 ]
@@ -41,15 +48,335 @@ class SQLite(object):
     use_memory: bool = False
     use_scrict: bool = False
     filename: str = ""
-
-    def prepare(self):
+    use_pool: bool = False
+    pool_timeout: float = 300.0
+    profile: str = ""
+    cached_statements: int = 128
+    use_threads: bool = False
+    dropped: int = 0
+    statement_cache_size: int = 256
+    statement_hits: int = 0
+    statement_misses: int = 0
+    use_catalog: bool = False
+    catalog: Catalog = field(default_factory=Catalog)
+    _statements: Dict[tuple, str] = field(default_factory=dict)
+
+    def prepare(self) -> bool:
         if self.manager is not None:
-            return
+            return True
 
         self.manager: Connection = Connection()
-        self.manager.setup(use_memory=self.use_memory, filename=self.filename)
+        _check = self.manager.setup(use_memory=self.use_memory,
+                                    filename=self.filename,
+                                    use_pool=self.use_pool,
+                                    pool_timeout=self.pool_timeout,
+                                    profile=self.profile,
+                                    cached_statements=self.cached_statements,
+                                    use_threads=self.use_threads)
+        if _check is False:
+            bbutil.log.error("Unable to setup connection for {0:s}!".format(self.name))
+            return False
+        return True
+
+    @staticmethod
+    def _build_statement(operation: str, table_name: str, names: tuple, sql_filter: str) -> str:
+        _names = ", ".join(names)
+        _placeholder = ", ".join(['?'] * len(names))
+
+        if operation == "insert":
+            sql = 'INSERT INTO "{0:s}" ({1:s}) VALUES ({2:s});'.format(table_name, _names, _placeholder)
+            return sql
+
+        if operation == "insert_ignore":
+            sql = 'INSERT OR IGNORE INTO "{0:s}" ({1:s}) VALUES ({2:s});'.format(table_name, _names, _placeholder)
+            return sql
+
+        if operation == "update":
+            _sets = []
+            for _name in names:
+                _line = "{0:s} = ?".format(_name)
+                _sets.append(_line)
+
+            sql = 'UPDATE "{0:s}" SET {1:s} WHERE {2:s};'.format(table_name, ", ".join(_sets), sql_filter)
+            return sql
+
+        if operation == "upsert":
+            _conflicts = []
+            for _name in sql_filter.split(", "):
+                _conflicts.append(_name)
+
+            _sets = []
+            for _name in names:
+                if _name in _conflicts:
+                    continue
+                _line = "{0:s} = excluded.{0:s}".format(_name)
+                _sets.append(_line)
+
+            _action = "NOTHING"
+            if len(_sets) > 0:
+                _action = "UPDATE SET {0:s}".format(", ".join(_sets))
+
+            sql = 'INSERT INTO "{0:s}" ({1:s}) VALUES ({2:s}) ON CONFLICT ({3:s}) DO {4:s};'.format(table_name,
+                                                                                                  _names,
+                                                                                                  _placeholder,
+                                                                                                  sql_filter,
+                                                                                                  _action)
+            return sql
+
+        if operation == "count":
+            sql = "SELECT count(*) FROM {0:s};".format(table_name)
+
+            if sql_filter != "":
+                sql = "SELECT count(*) FROM {0:s} WHERE {1:s};".format(table_name, sql_filter)
+            return sql
+
+        _selector = "*"
+        if len(names) != 0:
+            _selector = _names
+
+        if operation == "page":
+            sql = "SELECT {0:s} FROM {1:s} {2:s};".format(_selector, table_name, sql_filter)
+            return sql
+
+        sql = "SELECT {0:s} FROM {1:s};".format(_selector, table_name)
+
+        if sql_filter != "":
+            sql = "SELECT {0:s} FROM {1:s} WHERE {2:s};".format(_selector, table_name, sql_filter)
+        return sql
+
+    def statement(self, operation: str, table_name: str, names: list, sql_filter: str = "") -> str:
+        _key = (operation, table_name, tuple(names), sql_filter)
+
+        try:
+            sql = self._statements[_key]
+        except KeyError:
+            self.statement_misses += 1
+            sql = self._build_statement(operation, table_name, _key[2], sql_filter)
+
+            if len(self._statements) < self.statement_cache_size:
+                self._statements[_key] = sql
+            return sql
+
+        self.statement_hits += 1
+        return sql
+
+    def clear_statements(self):
+        self._statements.clear()
+        self.statement_hits = 0
+        self.statement_misses = 0
+        return
+
+    @contextmanager
+    def transaction(self, write: bool = True) -> Iterator[Transaction]:
+        _transaction = self.manager.begin(write)
+        if _transaction is None:
+            raise sqlite3.OperationalError("Unable to begin transaction!")
+
+        try:
+            yield _transaction
+        except BaseException:
+            _transaction.failed = True
+            self.manager.end(_transaction)
+            raise
+
+        _check = self.manager.end(_transaction)
+        if _check is False:
+            raise sqlite3.OperationalError("Transaction has failed!")
         return
 
+    @staticmethod
+    def _page_counts(cursor: sqlite3.Cursor) -> Tuple[int, int]:
+        cursor.execute("PRAGMA page_count")
+        (_pages,) = cursor.fetchone()
+
+        cursor.execute("PRAGMA freelist_count")
+        (_free,) = cursor.fetchone()
+        return _pages, _free
+
+    def backup(self, target: str, pages_per_step: int = 256, sleep: float = 0.0) -> Maintenance:
+        _result = Maintenance(operation="backup")
+
+        if pages_per_step <= 0:
+            bbutil.log.error("Invalid number of pages per step: {0:d}".format(pages_per_step))
+            return _result
+
+        _source = self.manager.open_detached()
+        if _source is None:
+            return _result
+
+        _progress = []
+
+        def _step(status: int, remaining: int, total: int):
+            if total == 0:
+                return
+
+            if len(_progress) == 0:
+                _progress.append(bbutil.log.progress(total))
+
+            _progress[0].set(total - remaining)
+            _result.pages = total
+            _result.steps += 1
+            return
+
+        _start = time.perf_counter()
+
+        try:
+            _target = sqlite3.connect(target)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to open backup: {0:s}".format(target))
+            bbutil.log.exception(e)
+            _source.close()
+            return _result
+
+        try:
+            _source.backup(_target, pages=pages_per_step, progress=_step, sleep=sleep)
+        except sqlite3.DatabaseError as e:
+            bbutil.log.error("Unable to backup to: {0:s}".format(target))
+            bbutil.log.exception(e)
+            _target.close()
+            _source.close()
+            return _result
+
+        _result.duration = time.perf_counter() - _start
+
+        _target.close()
+        _source.close()
+
+        if len(_progress) > 0:
+            bbutil.log.clear()
+
+        bbutil.log.debug1(self.name, "Backup {0:d} pages to {1:s}".format(_result.pages, target))
+
+        _result.success = True
+        return _result
+
+    def get_auto_vacuum(self) -> int:
+        _check = self.manager.connect(write=False)
+        if _check is False:
+            return -1
+
+        c = self.manager.cursor()
+
+        try:
+            c.execute("PRAGMA auto_vacuum")
+            (_mode,) = c.fetchone()
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to read auto_vacuum!")
+            bbutil.log.exception(e)
+            self.manager.abort()
+            return -1
+
+        _check = self.manager.release()
+        if _check is False:
+            return -1
+        return _mode
+
+    def vacuum(self, incremental: bool = True, pages: int = 0) -> Maintenance:
+        _result = Maintenance(operation="vacuum")
+
+        if self.manager.in_transaction is True:
+            bbutil.log.error("Unable to vacuum inside a transaction!")
+            return _result
+
+        _check = self.manager.connect()
+        if _check is False:
+            return _result
+
+        c = self.manager.cursor()
+        _start = time.perf_counter()
+
+        try:
+            _result.pages_before, _result.free_pages = self._page_counts(c)
+
+            c.execute("PRAGMA auto_vacuum")
+            (_mode,) = c.fetchone()
+
+            if (incremental is True) and (_mode != 2):
+                bbutil.log.error("No incremental auto_vacuum, use incremental=False for a full vacuum!")
+                _result.operation = "incremental_vacuum"
+                self.manager.release()
+                return _result
+
+            if incremental is True:
+                # execute() steps the pragma only once, which frees a single page
+                _result.operation = "incremental_vacuum"
+                c.executescript("PRAGMA incremental_vacuum({0:d});".format(pages))
+            else:
+                c.execute("VACUUM")
+
+            _result.pages_after, _free = self._page_counts(c)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to vacuum database!")
+            bbutil.log.exception(e)
+            self.manager.abort()
+            return _result
+
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return _result
+
+        _check = self.manager.release()
+        if _check is False:
+            return _result
+
+        _result.pages = _result.pages_before - _result.pages_after
+        _result.duration = time.perf_counter() - _start
+        _result.success = True
+        return _result
+
+    def _maintain(self, operation: str, command: str) -> Maintenance:
+        _result = Maintenance(operation=operation)
+
+        _check = self.manager.connect()
+        if _check is False:
+            return _result
+
+        c = self.manager.cursor()
+        _start = time.perf_counter()
+
+        try:
+            _result.pages_before, _result.free_pages = self._page_counts(c)
+            c.execute(command)
+            c.fetchall()
+            _result.pages_after, _free = self._page_counts(c)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to {0:s} database!".format(operation))
+            bbutil.log.exception(e)
+            self.manager.abort()
+            return _result
+
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return _result
+
+        _check = self.manager.release()
+        if _check is False:
+            return _result
+
+        # ANALYZE creates the sqlite_stat tables
+        self.catalog.invalidate()
+
+        _result.duration = time.perf_counter() - _start
+        _result.success = True
+        return _result
+
+    def analyze(self) -> Maintenance:
+        _result = self._maintain("analyze", "ANALYZE")
+        return _result
+
+    def optimize(self) -> Maintenance:
+        _result = self._maintain("optimize", "PRAGMA optimize")
+        return _result
+
+    def close(self) -> bool:
+        if self.manager is None:
+            return True
+
+        _check = self.manager.close()
+        return _check
+
     @staticmethod
     def check_minmal_version(major: int, minor: int, patch: int = 0) -> bool:
         _info = sqlite3.sqlite_version_info
@@ -80,8 +407,41 @@ class SQLite(object):
 
         return True
 
+    def _load_catalog(self) -> bool:
+        if self.catalog.loaded is True:
+            return True
+
+        _check = self.manager.connect(write=False)
+        if _check is False:
+            return False
+
+        c = self.manager.cursor()
+
+        try:
+            self.catalog.load(c)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to load schema catalog!")
+            bbutil.log.exception(e)
+            self.manager.abort()
+            return False
+
+        bbutil.log.debug1(self.name, "Load schema catalog: {0:d} tables".format(len(self.catalog.tables)))
+
+        _check = self.manager.release()
+        if _check is False:
+            return False
+        return True
+
     def check(self, table_name: str) -> int:
-        _check = self.manager.connect()
+        if self.use_catalog is True:
+            _check = self._load_catalog()
+            if _check is False:
+                return False
+
+            _check = self.catalog.has_table(table_name)
+            return _check
+
+        _check = self.manager.connect(write=False)
         if _check is False:
             return False
 
@@ -110,15 +470,20 @@ class SQLite(object):
 
         return _res
 
-    def _count_table(self, table_name: str) -> int:
+    def _count_table(self, table_name: str, sql_filter: str = "", data: Optional[list] = None) -> int:
         c = self.manager.cursor()
-        command = "SELECT count(*) FROM {0:s};".format(table_name)
+        command = self.statement("count", table_name, [], sql_filter)
+
+        if data is None:
+            data = []
 
         try:
-            c.execute(command)
-        except sqlite3.OperationalError as e:
+            self._select_execute(c, command, data)
+        except (sqlite3.OperationalError, sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
             bbutil.log.error("Unable to count rows: {0:s}".format(table_name))
             bbutil.log.exception(e)
+            bbutil.log.error("SQL:  " + str(command))
+            bbutil.log.error("DATA: " + str(data))
             self.manager.abort()
             return -1
 
@@ -128,12 +493,12 @@ class SQLite(object):
         bbutil.log.debug1(self.name, "Count table: {0:s}, {1:d}".format(table_name, count))
         return count
 
-    def count(self, table_name: str) -> int:
-        _check = self.manager.connect()
+    def count(self, table_name: str, sql_filter: str = "", data: Optional[list] = None) -> int:
+        _check = self.manager.connect(write=False)
         if _check is False:
             return -1
 
-        _count = self._count_table(table_name)
+        _count = self._count_table(table_name, sql_filter, data)
         if _count == -1:
             return -1
 
@@ -144,8 +509,18 @@ class SQLite(object):
         return _count
 
     def check_table(self, table_name: str, connect: bool = True) -> bool:
+        if (self.use_catalog is True) and (connect is True):
+            _check = self._load_catalog()
+            if _check is False:
+                return False
+
+            bbutil.log.debug1(self.name, "Check for table: {0:s}".format(table_name))
+
+            _check = self.catalog.has_table(table_name)
+            return _check
+
         if connect is True:
-            _check = self.manager.connect()
+            _check = self.manager.connect(write=False)
             if _check is False:
                 return False
 
@@ -161,7 +536,7 @@ class SQLite(object):
             bbutil.log.error("Unable to check for table: {0:s}".format(table_name))
             bbutil.log.exception(e)
             if connect is True:
-                self.manager.release()
+                self.manager.abort()
             return False
 
         result = c.fetchone()
@@ -177,6 +552,8 @@ class SQLite(object):
         return True
 
     def create_table(self, table_name: str, column_list: list, unique_list: list) -> bool:
+        self.catalog.invalidate()
+
         _check = self.manager.connect()
         if _check is False:
             return False
@@ -215,7 +592,7 @@ class SQLite(object):
 
         _check = self.manager.commit()
         if _check is False:
-            self.manager.release()
+            self.manager.abort()
             return False
 
         _check = self.manager.release()
@@ -224,7 +601,15 @@ class SQLite(object):
         return True
 
     def get_scheme(self, table_name: str) -> Optional[list]:
-        _check = self.manager.connect()
+        if self.use_catalog is True:
+            _check = self._load_catalog()
+            if _check is False:
+                return None
+
+            _scheme = self.catalog.get_scheme(table_name)
+            return _scheme
+
+        _check = self.manager.connect(write=False)
         if _check is False:
             return None
 
@@ -242,10 +627,14 @@ class SQLite(object):
             self.manager.abort()
             return None
 
-        _fetchlist = []
-
-        for _data in c:
-            _fetchlist.append(_data)
+        try:
+            _fetchlist = c.fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            bbutil.log.error("Unable to read rows from table: {0:s}".format(table_name))
+            bbutil.log.exception(e)
+            bbutil.log.error("SQL:  " + str(command))
+            self.manager.abort()
+            return None
 
         _check = self.manager.release()
         if _check is False:
@@ -256,6 +645,138 @@ class SQLite(object):
 
         return _fetchlist
 
+    def get_indexes(self, table_name: str) -> Optional[List[Index]]:
+        if self.use_catalog is True:
+            _check = self._load_catalog()
+            if _check is False:
+                return None
+
+            _indexes = self.catalog.get_indexes(table_name)
+            return _indexes
+
+        _check = self.manager.connect(write=False)
+        if _check is False:
+            return None
+
+        _connection = self.manager.connection
+        c = _connection.cursor()
+
+        command = "SELECT il.name, il.\"unique\", ii.name " \
+                  "FROM pragma_index_list('{0:s}') AS il, pragma_index_info(il.name) AS ii " \
+                  "WHERE il.origin = 'c' ORDER BY il.name, ii.seqno".format(table_name)
+
+        try:
+            c.execute(command)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to get indexes: {0:s}".format(table_name))
+            bbutil.log.exception(e)
+            self.manager.abort()
+            return None
+
+        _indexes = {}
+
+        for _data in c:
+            try:
+                _index = _indexes[_data[0]]
+            except KeyError:
+                _index = Index(name=_data[0], unique=(_data[1] == 1))
+                _indexes[_data[0]] = _index
+            _index.columns.append(_data[2])
+
+        _check = self.manager.release()
+        if _check is False:
+            return None
+
+        return list(_indexes.values())
+
+    def _execute_command(self, command: str, error: str) -> bool:
+        _connection = self.manager.connection
+        c = _connection.cursor()
+
+        try:
+            c.execute(command)
+        except (sqlite3.OperationalError, sqlite3.IntegrityError) as e:
+            bbutil.log.error(error)
+            bbutil.log.exception(e)
+            bbutil.log.error("SQL:  " + command)
+            self.manager.abort()
+            return False
+        return True
+
+    def _missing_indexes(self, table_name: str, index_list: List[Index]) -> Optional[List[Index]]:
+        _check = self._load_catalog()
+        if _check is False:
+            return None
+
+        _found = []
+        for _index in self.catalog.get_indexes(table_name):
+            _found.append(_index.name)
+
+        _missing = []
+        for _index in index_list:
+            if _index.name in _found:
+                continue
+            _missing.append(_index)
+        return _missing
+
+    def create_indexes(self, table_name: str, index_list: List[Index]) -> bool:
+        if self.use_catalog is True:
+            index_list = self._missing_indexes(table_name, index_list)
+            if index_list is None:
+                return False
+
+            if len(index_list) == 0:
+                return True
+
+        self.catalog.invalidate()
+
+        _check = self.manager.connect()
+        if _check is False:
+            return False
+
+        for _index in index_list:
+            _error = "Unable to create index: {0:s}".format(_index.name)
+            _check = self._execute_command(_index.create(table_name), _error)
+            if _check is False:
+                return False
+
+            bbutil.log.debug1(self.name, "Create index: {0:s}".format(_index.name))
+
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return False
+
+        _check = self.manager.release()
+        if _check is False:
+            return False
+        return True
+
+    def drop_indexes(self, index_list: List[str]) -> bool:
+        self.catalog.invalidate()
+
+        _check = self.manager.connect()
+        if _check is False:
+            return False
+
+        for _name in index_list:
+            _error = "Unable to drop index: {0:s}".format(_name)
+            _check = self._execute_command('DROP INDEX IF EXISTS "{0:s}"'.format(_name), _error)
+            if _check is False:
+                return False
+
+            bbutil.log.debug1(self.name, "Drop index: {0:s}".format(_name))
+
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return False
+
+        _check = self.manager.release()
+        if _check is False:
+            return False
+        return True
+
     def _add_columns(self, table_name: str, column_data: str) -> bool:
         _connection = self.manager.connection
         c = _connection.cursor()
@@ -273,6 +794,8 @@ class SQLite(object):
         return True
 
     def add_columns(self, table_name: str, column_list: list) -> bool:
+        self.catalog.invalidate()
+
         _check = self.manager.connect()
         if _check is False:
             return False
@@ -312,6 +835,8 @@ class SQLite(object):
         if _check is False:
             return False
 
+        self.catalog.invalidate()
+
         _check = self.manager.connect()
         if _check is False:
             return False
@@ -331,6 +856,8 @@ class SQLite(object):
         return True
 
     def rename_table(self, table_name: str, new_name: str) -> bool:
+        self.catalog.invalidate()
+
         _check = self.manager.connect()
         if _check is False:
             return False
@@ -363,6 +890,8 @@ class SQLite(object):
 
         print(sqlite3.sqlite_version_info)
 
+        self.catalog.invalidate()
+
         _check = self.manager.connect()
         if _check is False:
             return False
@@ -390,13 +919,10 @@ class SQLite(object):
             return False
         return True
 
-    @staticmethod
-    def _single_execute(table_name: str, names: list, data: Data) -> Optional[Execute]:
+    def _single_execute(self, table_name: str, names: list, data: Row) -> Optional[Execute]:
         _data = []
-        _names = ", ".join(names)
-        _placeholder = ", ".join(['?'] * len(names))
 
-        sql = 'INSERT INTO "{0:s}" ({1:s}) VALUES ({2:s});'.format(table_name, _names, _placeholder)
+        sql = self.statement("insert", table_name, names)
 
         for _line in names:
             try:
@@ -409,14 +935,10 @@ class SQLite(object):
         _execute = Execute(sql=sql, data=_data)
         return _execute
 
-    @staticmethod
-    def _many_execute(table_name: str, names: list, data_list: List[Data]) -> Optional[Execute]:
+    def _many_execute(self, table_name: str, names: list, data_list: List[Row]) -> Optional[Execute]:
         _data = []
-        _length = len(data_list)
-        _names = ", ".join(names)
-        _placeholder = ", ".join(['?'] * len(names))
 
-        sql = 'INSERT OR IGNORE INTO "{0:s}" ({1:s}) VALUES ({2:s});'.format(table_name, _names, _placeholder)
+        sql = self.statement("insert_ignore", table_name, names)
 
         for _item in data_list:
             _value = []
@@ -433,12 +955,12 @@ class SQLite(object):
         _execute = Execute(sql=sql, data=_data)
         return _execute
 
-    def _insert(self, table_name: str, names: list, data: Union[Data, List[Data]]) -> int:
+    def _insert(self, table_name: str, names: list, data: Union[Row, List[Row]]) -> int:
         c = self.manager.cursor()
 
         _is_many = True
 
-        if type(data) is Data:
+        if isinstance(data, Row) is True:
             _is_many = False
 
         if _is_many is False:
@@ -510,14 +1032,14 @@ class SQLite(object):
         return interval
 
     @staticmethod
-    def _split_list(data_list: List[Data], chunk_size: int) -> list:
+    def _split_list(data_list: List[Row], chunk_size: int) -> list:
         chunked_list = []
         for i in range(0, len(data_list), chunk_size):
             chunked_list.append(data_list[i:i + chunk_size])
 
         return chunked_list
 
-    def _insert_list(self, table_name: str, names: list, data_list: List[Data]) -> int:
+    def _insert_list(self, table_name: str, names: list, data_list: List[Row]) -> int:
         _chunk_size = self._get_chunk_size(len(data_list))
         _split_list = self._split_list(data_list, _chunk_size)
         _max = len(_split_list) + 1
@@ -541,18 +1063,102 @@ class SQLite(object):
         bbutil.log.clear()
 
         if _counter != _stored:
+            self.dropped += _counter - _stored
             bbutil.log.warn(self.name, "Entries {0:d}, Stored {1:d}".format(_counter, _stored))
         else:
             bbutil.log.inform(self.name, "Stored {0:d}".format(_counter))
 
         return _stored
 
-    def insert(self, table_name: str, names: list, data: Union[Data, List[Data]]) -> int:
+    @staticmethod
+    def _bulk_values(names: list, data_list: List[Row]):
+        _getter = attrgetter(*names)
+
+        if len(names) == 1:
+            for _item in data_list:
+                yield _getter(_item),
+            return
+
+        for _item in data_list:
+            yield _getter(_item)
+        return
+
+    def _bulk_execute(self, cursor: sqlite3.Cursor, sql: str, names: list, data_list: List[Row]) -> int:
+        try:
+            cursor.executemany(sql, self._bulk_values(names, data_list))
+        except AttributeError as e:
+            bbutil.log.exception(e)
+            bbutil.log.error("Data format does not fit database table!")
+            return -1
+        except sqlite3.InterfaceError as e:
+            bbutil.log.exception(e)
+            bbutil.log.error("One or more values is an invalid format!")
+            bbutil.log.error("SQL:  " + str(sql))
+            return -1
+        except OverflowError as e:
+            bbutil.log.exception(e)
+            bbutil.log.error("One or more values is too large!")
+            bbutil.log.error("SQL:  " + str(sql))
+            return -1
+        except sqlite3.IntegrityError:
+            return -1
+        except Exception as e:
+            bbutil.log.exception(e)
+            bbutil.log.error("SQL:  " + str(sql))
+            return -1
+
+        return cursor.rowcount
+
+    def _insert_bulk(self, table_name: str, names: list, data_list: List[Row], batch_size: int = 0) -> int:
+        if len(data_list) == 0:
+            return 0
+
+        c = self.manager.cursor()
+
+        sql = self.statement("insert_ignore", table_name, names)
+
+        _counter = len(data_list)
+        if (batch_size <= 0) or (batch_size > _counter):
+            batch_size = _counter
+
+        _stored = 0
+
+        for _start in range(0, _counter, batch_size):
+            _result = self._bulk_execute(c, sql, names, data_list[_start:_start + batch_size])
+            if _result == -1:
+                self.manager.rollback()
+                return -1
+
+            _stored += _result
+
+            if batch_size == _counter:
+                continue
+
+            _check = self.manager.commit()
+            if _check is False:
+                return -1
+
+        _check = self.manager.commit()
+        if _check is False:
+            return -1
+
+        if _counter != _stored:
+            self.dropped += _counter - _stored
+            bbutil.log.warn(self.name, "Entries {0:d}, Stored {1:d}".format(_counter, _stored))
+        else:
+            bbutil.log.inform(self.name, "Stored {0:d}".format(_counter))
+
+        return _stored
+
+    def insert(self, table_name: str, names: list, data: Union[Row, List[Row]],
+               bulk: bool = False, batch_size: int = 0) -> int:
         _check = self.manager.connect()
         if _check is False:
             return -1
 
-        if type(data) is list:
+        if (type(data) is list) and (bulk is True):
+            count = self._insert_bulk(table_name, names, data, batch_size)
+        elif type(data) is list:
             count = self._insert_list(table_name, names, data)
         else:
             count = self._insert(table_name, names, data)
@@ -567,22 +1173,54 @@ class SQLite(object):
 
         return count
 
-    def update(self, table_name: str, names: list, data: Data, sql_filter: str, filter_value=None) -> bool:
+    def insert_tables(self, groups: List[Tuple[str, list, List[Row]]]) -> List[int]:
+        _failed = [-1] * len(groups)
+
         _check = self.manager.connect()
         if _check is False:
-            return False
+            return _failed
 
         c = self.manager.cursor()
 
-        _sets = []
-        for _name in names:
-            _line = "{0:s} = ?".format(_name)
-            _sets.append(_line)
+        _result = []
+
+        for _table_name, _names, _data_list in groups:
+            sql = self.statement("insert_ignore", _table_name, _names)
+
+            _count = self._bulk_execute(c, sql, _names, _data_list)
+            if _count == -1:
+                self.manager.rollback()
+                self.manager.abort()
+                return _failed
+            _result.append(_count)
 
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return _failed
+
+        _check = self.manager.release()
+        if _check is False:
+            return _failed
+
+        for _group, _count in zip(groups, _result):
+            self.dropped += len(_group[2]) - _count
+
+        bbutil.log.debug1(self.name, "Insert {0:d} groups in one transaction".format(len(groups)))
+        return _result
+
+    def insert_groups(self, table_name: str, names: list, groups: List[List[Row]]) -> List[int]:
+        _groups = []
+        for _data_list in groups:
+            _groups.append((table_name, names, _data_list))
+
+        _result = self.insert_tables(_groups)
+        return _result
+
+    def update(self, table_name: str, names: list, data: Row, sql_filter: str, filter_value=None) -> bool:
         _data = []
-        _names = ", ".join(_sets)
 
-        sql = 'UPDATE "{0:s}" SET {1:s} WHERE {2:s};'.format(table_name, _names, sql_filter)
+        sql = self.statement("update", table_name, names, sql_filter)
 
         for _line in names:
             _value = getattr(data, _line)
@@ -591,23 +1229,44 @@ class SQLite(object):
         if filter_value is not None:
             _data.append(filter_value)
 
+        _check = self.manager.connect()
+        if _check is False:
+            return False
+
+        c = self.manager.cursor()
+
         try:
             c.execute(sql, _data)
         except sqlite3.IntegrityError:
+            self.manager.rollback()
+            self.manager.abort()
+            return False
+        except (sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
+            bbutil.log.exception(e)
+            bbutil.log.error("One or more values is an invalid format!")
+            bbutil.log.error("SQL:  " + str(sql))
+            bbutil.log.error("DATA: " + str(_data))
+            self.manager.rollback()
+            self.manager.abort()
             return False
         except sqlite3.OperationalError as e:
             bbutil.log.error("SQL:  " + str(sql))
             bbutil.log.error("DATA: " + str(_data))
             bbutil.log.exception(e)
+            self.manager.rollback()
+            self.manager.abort()
             return False
         except OverflowError as e:
             bbutil.log.exception(e)
             bbutil.log.error("SQL:  " + str(sql))
             bbutil.log.error("DATA: " + str(_data))
+            self.manager.rollback()
+            self.manager.abort()
             return False
 
         _check = self.manager.commit()
         if _check is False:
+            self.manager.abort()
             return False
 
         _check = self.manager.release()
@@ -616,6 +1275,72 @@ class SQLite(object):
 
         return True
 
+    def _execute_many(self, sql: str, names: list, data_list: List[Row]) -> int:
+        _check = self.manager.connect()
+        if _check is False:
+            return -1
+
+        c = self.manager.cursor()
+
+        _count = self._bulk_execute(c, sql, names, data_list)
+        if _count == -1:
+            self.manager.rollback()
+            self.manager.abort()
+            return -1
+
+        _check = self.manager.commit()
+        if _check is False:
+            self.manager.abort()
+            return -1
+
+        _check = self.manager.release()
+        if _check is False:
+            return -1
+
+        return _count
+
+    def update_many(self, table_name: str, names: list, data_list: List[Row], key_column: str) -> int:
+        if len(data_list) == 0:
+            return 0
+
+        _filter = "{0:s} = ?".format(key_column)
+        sql = self.statement("update", table_name, names, _filter)
+
+        _names = list(names)
+        _names.append(key_column)
+
+        _count = self._execute_many(sql, _names, data_list)
+        if _count == -1:
+            return -1
+
+        bbutil.log.debug1(self.name, "Update {0:d} in {1:s}".format(_count, table_name))
+        return _count
+
+    def upsert(self, table_name: str, names: list, data: Union[Row, List[Row]], conflict_list: list) -> int:
+        _check = self.check_minmal_version(3, 24, 0)
+        if _check is False:
+            return -1
+
+        if len(conflict_list) == 0:
+            bbutil.log.error("No conflict columns for upsert: {0:s}".format(table_name))
+            return -1
+
+        _data_list = data
+        if isinstance(data, Row) is True:
+            _data_list = [data]
+
+        if len(_data_list) == 0:
+            return 0
+
+        sql = self.statement("upsert", table_name, names, ", ".join(conflict_list))
+
+        _count = self._execute_many(sql, names, _data_list)
+        if _count == -1:
+            return -1
+
+        bbutil.log.debug1(self.name, "Upsert {0:d} in {1:s}".format(_count, table_name))
+        return _count
+
     @staticmethod
     def _select_execute(cursor: sqlite3.Cursor, command: str, data: list):
         if len(data) == 0:
@@ -624,46 +1349,157 @@ class SQLite(object):
             cursor.execute(command, data)
         return
 
-    def select(self, table_name: str, names: list, sql_filter: str, data: list) -> Optional[list]:
-        _check = self.manager.connect()
+    def iter_batches(self, table_name: str, names: list, sql_filter: str, data: list,
+                     batch_size: int = 1000) -> Iterator[List[tuple]]:
+        # the connection stays locked until the generator is exhausted or closed, calls from the loop body fail
+        # the generator returns False when the select failed, use "yield from" to get it
+        _check = self.manager.connect(write=False)
         if _check is False:
-            return None
+            return False
 
         c = self.manager.cursor()
+        command = self.statement("select", table_name, names, sql_filter)
 
-        _selector = "*"
-        if len(names) != 0:
-            _selector = ", ".join(names)
+        bbutil.log.debug1(table_name, command)
 
-        command = "SELECT {0:s} FROM {1:s};".format(_selector, table_name)
+        _failed = False
 
-        if sql_filter != "":
-            command = "SELECT {0:s} FROM {1:s} WHERE {2:s};".format(_selector, table_name, sql_filter)
+        try:
+            try:
+                self._select_execute(c, command, data)
+            except (sqlite3.OperationalError, sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
+                bbutil.log.error("Unable to search table: {0:s}".format(table_name))
+                bbutil.log.exception(e)
+                bbutil.log.error("SQL:  " + str(command))
+                bbutil.log.error("DATA: " + str(data))
+                _failed = True
+                return False
+            except OverflowError as e:
+                bbutil.log.error("Unable to search table due to overflow: {0:s}".format(table_name))
+                bbutil.log.exception(e)
+                bbutil.log.error("SQL:  " + str(command))
+                bbutil.log.error("DATA: " + str(data))
+                _failed = True
+                return False
+
+            while True:
+                try:
+                    _batch = c.fetchmany(batch_size)
+                except (sqlite3.Error, ValueError) as e:
+                    bbutil.log.error("Unable to read rows from table: {0:s}".format(table_name))
+                    bbutil.log.exception(e)
+                    bbutil.log.error("SQL:  " + str(command))
+                    _failed = True
+                    return False
+
+                if len(_batch) == 0:
+                    break
+
+                yield _batch
+        finally:
+            c.close()
+            if _failed is True:
+                self.manager.abort()
+            else:
+                self.manager.release()
+        return True
+
+    def iter_select(self, table_name: str, names: list, sql_filter: str, data: list,
+                    batch_size: int = 1000) -> Iterator[tuple]:
+        _batches = self.iter_batches(table_name, names, sql_filter, data, batch_size)
+
+        try:
+            for _batch in _batches:
+                for _data in _batch:
+                    yield _data
+        finally:
+            _batches.close()
+        return
+
+    def _fetch(self, table_name: str, command: str, data: list) -> Optional[list]:
+        _check = self.manager.connect(write=False)
+        if _check is False:
+            return None
+
+        c = self.manager.cursor()
 
         bbutil.log.debug1(table_name, command)
 
         try:
             self._select_execute(c, command, data)
-        except sqlite3.OperationalError as e:
+        except (sqlite3.OperationalError, sqlite3.ProgrammingError, sqlite3.InterfaceError) as e:
             bbutil.log.error("Unable to search table: {0:s}".format(table_name))
             bbutil.log.exception(e)
             bbutil.log.error("SQL:  " + str(command))
             bbutil.log.error("DATA: " + str(data))
+            self.manager.abort()
             return None
         except OverflowError as e:
             bbutil.log.error("Unable to search table due to overflow: {0:s}".format(table_name))
             bbutil.log.exception(e)
             bbutil.log.error("SQL:  " + str(command))
             bbutil.log.error("DATA: " + str(data))
+            self.manager.abort()
             return None
 
-        _fetchlist = []
-
-        for _data in c:
-            _fetchlist.append(_data)
+        try:
+            _fetchlist = c.fetchall()
+        except (sqlite3.Error, ValueError) as e:
+            bbutil.log.error("Unable to read rows from table: {0:s}".format(table_name))
+            bbutil.log.exception(e)
+            bbutil.log.error("SQL:  " + str(command))
+            self.manager.abort()
+            return None
 
         _check = self.manager.release()
         if _check is False:
             return None
 
         return _fetchlist
+
+    def select(self, table_name: str, names: list, sql_filter: str, data: list) -> Optional[list]:
+        command = self.statement("select", table_name, names, sql_filter)
+
+        _fetchlist = self._fetch(table_name, command, data)
+        return _fetchlist
+
+    def page(self, table_name: str, names: list, order_by: List[str], after: Optional[list] = None,
+             limit: int = 100, sql_filter: str = "", data: Optional[list] = None,
+             descending: bool = False) -> Optional[list]:
+        if len(order_by) == 0:
+            bbutil.log.error("No order for page: {0:s}".format(table_name))
+            return None
+
+        _data = []
+        if data is not None:
+            _data.extend(data)
+
+        _operator = ">"
+        _order = ", ".join(order_by)
+        if descending is True:
+            _operator = "<"
+            _order = ", ".join(["{0:s} DESC".format(_name) for _name in order_by])
+
+        _filters = []
+        if sql_filter != "":
+            _filters.append("({0:s})".format(sql_filter))
+
+        if after is not None:
+            if len(after) != len(order_by):
+                bbutil.log.error("Page key does not fit order: {0:s}".format(", ".join(order_by)))
+                return None
+
+            _placeholder = ", ".join(['?'] * len(order_by))
+            _filters.append("({0:s}) {1:s} ({2:s})".format(", ".join(order_by), _operator, _placeholder))
+            _data.extend(after)
+
+        _clause = "ORDER BY {0:s} LIMIT ?".format(_order)
+        if len(_filters) > 0:
+            _clause = "WHERE {0:s} {1:s}".format(" AND ".join(_filters), _clause)
+
+        _data.append(limit)
+
+        command = self.statement("page", table_name, names, _clause)
+
+        _fetchlist = self._fetch(table_name, command, _data)
+        return _fetchlist
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import sqlite3
+import threading
+
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Tuple
+
+from bbutil.database.types import Index
+
+__all__ = [
+    "Catalog"
+]
+
+_tables_command = "SELECT m.name, p.name, p.type " \
+                  "FROM sqlite_master AS m, pragma_table_info(m.name) AS p " \
+                  "WHERE m.type = 'table' ORDER BY m.name, p.cid"
+
+_indexes_command = "SELECT m.name, il.name, il.\"unique\", ii.name " \
+                   "FROM sqlite_master AS m, pragma_index_list(m.name) AS il, pragma_index_info(il.name) AS ii " \
+                   "WHERE m.type = 'table' AND il.origin = 'c' ORDER BY m.name, il.name, ii.seqno"
+
+
+@dataclass
+class Catalog(object):
+
+    loaded: bool = False
+    loads: int = 0
+    tables: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
+    indexes: Dict[str, List[Index]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def load(self, cursor: sqlite3.Cursor):
+        _tables = {}
+        _indexes = {}
+
+        cursor.execute(_tables_command)
+        for _data in cursor:
+            _tables.setdefault(_data[0], []).append((_data[1], _data[2]))
+
+        cursor.execute(_indexes_command)
+
+        _found = {}
+        for _data in cursor:
+            _key = (_data[0], _data[1])
+
+            try:
+                _index = _found[_key]
+            except KeyError:
+                _index = Index(name=_data[1], unique=(_data[2] == 1))
+                _found[_key] = _index
+                _indexes.setdefault(_data[0], []).append(_index)
+            _index.columns.append(_data[3])
+
+        with self._lock:
+            self.tables = _tables
+            self.indexes = _indexes
+            self.loaded = True
+            self.loads += 1
+        return
+
+    def invalidate(self):
+        with self._lock:
+            self.loaded = False
+            self.tables = {}
+            self.indexes = {}
+        return
+
+    def has_table(self, table_name: str) -> bool:
+        _check = table_name in self.tables
+        return _check
+
+    def get_scheme(self, table_name: str) -> Optional[list]:
+        try:
+            _scheme = self.tables[table_name]
+        except KeyError:
+            return None
+        return list(_scheme)
+
+    def get_indexes(self, table_name: str) -> List[Index]:
+        _indexes = []
+        for _index in self.indexes.get(table_name, []):
+            _indexes.append(Index(name=_index.name, columns=list(_index.columns), unique=_index.unique))
+        return _indexes
@@ -16,42 +16,114 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import itertools
 import sqlite3
+import threading
+import time
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from multiprocessing import Lock
-from typing import Optional
+from typing import Optional, List, Union
 
 import bbutil
+from bbutil.database.sqlite.types import Pooled, Transaction, TransactionState
+from bbutil.database.sqlite.pragma import Profile, get_profile
 
 __all__ = [
     "Connection"
 ]
 
+_memory_counter = itertools.count(1)
+
 
 @dataclass
 class Connection(object):
 
     use_memory: bool = False
     filename: str = ""
+    # the lock hands out one connection at a time, so the pool keeps that single connection open between calls
+    # pool_timeout is checked by the next connect(), an idle connection stays open until then or close()
+    use_pool: bool = False
+    pool_timeout: float = 300.0
+    profile: Optional[Profile] = None
+    cached_statements: int = 128
+    use_threads: bool = False
 
     _lock: Optional[Lock] = None
+    _owner: int = 0
     _connection: Optional[sqlite3.Connection] = None
     _cursor: Optional[sqlite3.Cursor] = None
+    _pooled: Optional[Pooled] = None
+    _memory: Optional[sqlite3.Connection] = None
+    _memory_uri: str = ""
+    _write_lock: Optional[threading.Lock] = None
+    _threads_lock: Optional[threading.Lock] = None
+    _local: Optional[threading.local] = None
+    _threads: List[sqlite3.Connection] = field(default_factory=list)
+    _transaction: Optional[TransactionState] = None
 
     @property
     def connection(self) -> Optional[sqlite3.Connection]:
+        if self.use_threads is True:
+            if getattr(self._local, "active", False) is False:
+                return None
+            return self._local.connection
         return self._connection
 
+    @property
+    def _same_thread(self) -> bool:
+        # pooled connections are handed to whichever thread holds the lock next
+        if (self.use_threads is True) or (self.use_pool is True):
+            return False
+        return True
+
+    @property
+    def pool_count(self) -> int:
+        if self._pooled is None:
+            return 0
+        return 1
+
+    @property
+    def thread_count(self) -> int:
+        return len(self._threads)
+
+    @property
+    def _state(self) -> Optional[TransactionState]:
+        if self.use_threads is True:
+            return getattr(self._local, "transaction", None)
+
+        _state = self._transaction
+        if (_state is not None) and (_state.owner == threading.get_ident()):
+            return _state
+        return None
+
+    @property
+    def in_transaction(self) -> bool:
+        if self._state is None:
+            return False
+        return True
+
+    def _fail_transaction(self):
+        self._state.levels[-1].failed = True
+        return
+
     def cursor(self) -> Optional[sqlite3.Cursor]:
-        if self._connection is not None:
-            return self._connection.cursor()
+        _connection = self.connection
+        if _connection is not None:
+            return _connection.cursor()
         return None
 
-    def setup(self, **kwargs):
+    def setup(self, **kwargs) -> bool:
+        _result = True
+
         if self._lock is None:
             self._lock = Lock()
 
+        if self._local is None:
+            self._write_lock = threading.Lock()
+            self._threads_lock = threading.Lock()
+            self._local = threading.local()
+
         _value = kwargs.get("use_memory", None)
         if _value is not None:
             self.use_memory = _value
@@ -59,75 +131,358 @@ class Connection(object):
         _value = kwargs.get("filename", None)
         if _value is not None:
             self.filename = _value
+
+        _value = kwargs.get("use_pool", None)
+        if _value is not None:
+            self.use_pool = _value
+
+        _value = kwargs.get("pool_timeout", None)
+        if _value is not None:
+            self.pool_timeout = _value
+
+        _value = kwargs.get("profile", None)
+        if _value is not None:
+            _result = self.set_profile(_value)
+
+        _value = kwargs.get("cached_statements", None)
+        if _value is not None:
+            self.cached_statements = _value
+
+        _value = kwargs.get("use_threads", None)
+        if _value is not None:
+            self.use_threads = _value
+        return _result
+
+    def set_profile(self, profile: Union[str, Profile]) -> bool:
+        if type(profile) is str:
+            if profile == "":
+                self.profile = None
+                return True
+
+            _profile = get_profile(profile)
+            if _profile is None:
+                bbutil.log.error("Unknown profile: {0:s}".format(profile))
+                return False
+            profile = _profile
+
+        self.profile = profile
+        return True
+
+    def _apply_profile(self, connection: sqlite3.Connection) -> bool:
+        _commands = []
+
+        if self.profile is not None:
+            _commands = self.profile.commands
+
+        if (self.use_threads is True) and (self.use_memory is False):
+            _commands = _commands + ["PRAGMA journal_mode=WAL;"]
+
+        if len(_commands) == 0:
+            return True
+
+        c = connection.cursor()
+
+        for _command in _commands:
+            try:
+                c.execute(_command)
+                c.fetchall()
+            except (sqlite3.OperationalError, sqlite3.ProgrammingError) as e:
+                if self.profile is not None:
+                    bbutil.log.error("Unable to apply profile: {0:s}".format(self.profile.name))
+                bbutil.log.error("SQL:  " + _command)
+                bbutil.log.exception(e)
+                return False
+
+        c.close()
+        return True
+
+    @staticmethod
+    def _close(connection: sqlite3.Connection) -> bool:
+        try:
+            connection.close()
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to close connection!")
+            bbutil.log.exception(e)
+            return False
+        return True
+
+    def _evict_pool(self):
+        if self._pooled is None:
+            return
+
+        if (time.monotonic() - self._pooled.timestamp) > self.pool_timeout:
+            self._close(self._pooled.connection)
+            self._pooled = None
         return
 
-    def _connect_memory(self) -> bool:
+    def _connect_pool(self) -> bool:
+        self._evict_pool()
+
+        if self._pooled is None:
+            return False
+
+        self._connection = self._pooled.connection
+        self._pooled = None
+        return True
+
+    @staticmethod
+    def _finish(connection: sqlite3.Connection) -> bool:
+        if connection.in_transaction is False:
+            return True
+
         try:
-            self._connection = sqlite3.connect(':memory:',
-                                               detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+            connection.rollback()
         except sqlite3.OperationalError as e:
-            self._connection = None
-            bbutil.log.error("Unable to create database in memory!")
+            bbutil.log.error("Unable to rollback connection!")
             bbutil.log.exception(e)
             return False
+        return True
 
-        self.filename = "memory"
+    def _release_pool(self) -> bool:
+        _connection = self._connection
+
+        _check = self._finish(_connection)
+        if _check is False:
+            return False
+
+        self._pooled = Pooled(connection=_connection, timestamp=time.monotonic())
         return True
 
-    def _connect_file(self) -> bool:
+    def _open_memory(self) -> Optional[sqlite3.Connection]:
+        if self._memory_uri == "":
+            self._memory_uri = "file:bbutil_memory_{0:d}?mode=memory&cache=shared".format(next(_memory_counter))
+
+        try:
+            if self._memory is None:
+                self._memory = sqlite3.connect(self._memory_uri, uri=True,
+                                               detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                                               check_same_thread=False)
+
+            _connection = sqlite3.connect(self._memory_uri, uri=True,
+                                          detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                                          cached_statements=self.cached_statements,
+                                          check_same_thread=self._same_thread)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to create database in memory!")
+            bbutil.log.exception(e)
+            return None
+
+        self.filename = "memory"
+        return _connection
+
+    def _open_file(self) -> Optional[sqlite3.Connection]:
         try:
-            self._connection = sqlite3.connect(self.filename,
-                                               detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+            _connection = sqlite3.connect(self.filename,
+                                          detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                                          cached_statements=self.cached_statements,
+                                          check_same_thread=self._same_thread)
         except sqlite3.OperationalError as e:
             bbutil.log.error("Unable to create database: {0:s}".format(self.filename))
             bbutil.log.exception(e)
-            return False
+            return None
 
         bbutil.log.debug1("SQLite3", "Connect to {0:s}".format(self.filename))
+        return _connection
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        if self.use_memory is True:
+            _connection = self._open_memory()
+        else:
+            _connection = self._open_file()
+
+        if _connection is None:
+            return None
+
+        _check = self._apply_profile(_connection)
+        if _check is False:
+            self._close(_connection)
+            return None
+        return _connection
+
+    def open_detached(self) -> Optional[sqlite3.Connection]:
+        # a connection outside the lock, the pool and the thread connections, e.g. for backups
+        _connection = self._open()
+        return _connection
+
+    def _connect_thread(self, write: bool) -> bool:
+        if getattr(self._local, "active", False) is True:
+            bbutil.log.error("Connection is still active!")
+            return False
+
+        # shared cache memory databases lock whole tables, so readers have to wait for writers as well
+        if self.use_memory is True:
+            write = True
+
+        if write is True:
+            self._write_lock.acquire()
+
+        _connection = getattr(self._local, "connection", None)
+        if _connection is None:
+            _connection = self._open()
+            if _connection is None:
+                if write is True:
+                    self._write_lock.release()
+                return False
+
+            self._local.connection = _connection
+
+            with self._threads_lock:
+                self._threads.append(_connection)
+
+        self._local.active = True
+        self._local.write = write
         return True
 
-    def connect(self) -> bool:
+    def connect(self, write: bool = True) -> bool:
+        # operations inside a transaction join its connection
+        if self.in_transaction is True:
+            return True
+
+        if self.use_threads is True:
+            return self._connect_thread(write)
+
+        # iter_batches keeps the lock while it yields, a second connect from the same thread would never return
+        if self._owner == threading.get_ident():
+            bbutil.log.error("Connection is still active!")
+            return False
+
         self._lock.acquire()
+        self._owner = threading.get_ident()
 
         if self._connection is not None:
             bbutil.log.error("Connection is still active!")
             return False
 
-        if self.use_memory is True:
-            _check = self._connect_memory()
-        else:
-            _check = self._connect_file()
+        if self.use_pool is True:
+            _check = self._connect_pool()
+            if _check is True:
+                return True
 
-        if _check is False:
+        self._connection = self._open()
+        if self._connection is None:
+            self._owner = 0
             self._lock.release()
+            return False
 
-        return _check
+        return True
 
     def commit(self) -> bool:
-        if self._connection is None:
+        if self.in_transaction is True:
+            return True
+
+        _connection = self.connection
+        if _connection is None:
             bbutil.log.error("No connection!")
             return False
 
         try:
-            self._connection.commit()
+            _connection.commit()
         except sqlite3.OperationalError as e:
             bbutil.log.error("Unable to commit to database!")
             bbutil.log.exception(e)
             return False
         return True
 
+    def rollback(self) -> bool:
+        if self.in_transaction is True:
+            self._fail_transaction()
+            return True
+
+        _connection = self.connection
+        if _connection is None:
+            bbutil.log.error("No connection!")
+            return False
+
+        try:
+            _connection.rollback()
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to rollback database!")
+            bbutil.log.exception(e)
+            return False
+        return True
+
+    def _forget_thread(self):
+        _connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+
+        if _connection is None:
+            return
+
+        with self._threads_lock:
+            if _connection in self._threads:
+                self._threads.remove(_connection)
+
+        self._close(_connection)
+        return
+
+    def close_thread(self) -> bool:
+        if self.use_threads is False:
+            return True
+
+        if getattr(self._local, "active", False) is True:
+            bbutil.log.error("Connection is still active!")
+            return False
+
+        self._forget_thread()
+        return True
+
+    def _release_thread(self, close: bool) -> bool:
+        if getattr(self._local, "active", False) is False:
+            bbutil.log.error("No connection!")
+            return False
+
+        _check = True
+
+        if close is True:
+            self._forget_thread()
+        else:
+            _check = self._finish(self._local.connection)
+
+        self._local.active = False
+
+        if self._local.write is True:
+            self._write_lock.release()
+        return _check
+
     def abort(self):
+        if self.in_transaction is True:
+            self._fail_transaction()
+            return
+
+        if self.use_threads is True:
+            if getattr(self._local, "active", False) is True:
+                self._release_thread(True)
+            return
+
+        if self._connection is not None:
+            self._close(self._connection)
+            self._connection = None
+
         if self._lock is None:
             return
+
+        self._owner = 0
         self._lock.release()
         return
 
     def reset(self):
         self._lock = Lock()
+        self._owner = 0
         self._connection = None
+        self._transaction = None
+
+        self._write_lock = threading.Lock()
+        self._threads_lock = threading.Lock()
+        self._local = threading.local()
         return
 
     def release(self) -> bool:
+        if self.in_transaction is True:
+            return True
+
+        if self.use_threads is True:
+            return self._release_thread(False)
+
         if self._connection is None:
             bbutil.log.error("No connection!")
             return False
@@ -136,11 +491,12 @@ class Connection(object):
             bbutil.log.error("No valid lock!")
             return False
 
-        try:
-            self._connection.close()
-        except sqlite3.OperationalError as e:
-            bbutil.log.error("Unable to close connection!")
-            bbutil.log.exception(e)
+        if self.use_pool is True:
+            _check = self._release_pool()
+        else:
+            _check = self._close(self._connection)
+
+        if _check is False:
             return False
 
         self._connection = None
@@ -148,5 +504,122 @@ class Connection(object):
         if self.use_memory is False:
             bbutil.log.debug1("SQLite3", "Close {0:s}".format(self.filename))
 
+        self._owner = 0
         self._lock.release()
         return True
+
+    def _set_state(self, state: Optional[TransactionState]):
+        if self.use_threads is True:
+            self._local.transaction = state
+        else:
+            self._transaction = state
+        return
+
+    def _execute(self, command: str) -> bool:
+        try:
+            self.connection.execute(command)
+        except sqlite3.OperationalError as e:
+            bbutil.log.error("Unable to execute: {0:s}".format(command))
+            bbutil.log.exception(e)
+            return False
+        return True
+
+    def begin(self, write: bool = True) -> Optional[Transaction]:
+        _state = self._state
+
+        if _state is not None:
+            _depth = len(_state.levels) + 1
+            _transaction = Transaction(depth=_depth, savepoint="bbutil_{0:d}".format(_depth), write=write)
+
+            _check = self._execute('SAVEPOINT "{0:s}"'.format(_transaction.savepoint))
+            if _check is False:
+                return None
+
+            _state.levels.append(_transaction)
+            return _transaction
+
+        _check = self.connect(write)
+        if _check is False:
+            return None
+
+        _command = "BEGIN"
+        if write is True:
+            _command = "BEGIN IMMEDIATE"
+
+        _check = self._execute(_command)
+        if _check is False:
+            self.abort()
+            return None
+
+        _transaction = Transaction(depth=1, write=write)
+        self._set_state(TransactionState(owner=threading.get_ident(), levels=[_transaction]))
+        return _transaction
+
+    def _end_savepoint(self, transaction: Transaction) -> bool:
+        if transaction.failed is True:
+            self._execute('ROLLBACK TO "{0:s}"'.format(transaction.savepoint))
+
+        _check = self._execute('RELEASE "{0:s}"'.format(transaction.savepoint))
+        if _check is False:
+            transaction.failed = True
+
+        if transaction.failed is True:
+            return False
+
+        transaction.committed = True
+        return True
+
+    def end(self, transaction: Transaction) -> bool:
+        _state = self._state
+        if (_state is None) or (len(_state.levels) == 0) or (_state.levels[-1] is not transaction):
+            bbutil.log.error("Transaction is not active!")
+            return False
+
+        _state.levels.pop()
+
+        if len(_state.levels) > 0:
+            _check = self._end_savepoint(transaction)
+            return _check
+
+        self._set_state(None)
+
+        if transaction.failed is False:
+            _check = self.commit()
+            if _check is False:
+                transaction.failed = True
+
+        if transaction.failed is True:
+            self.rollback()
+            self.abort()
+            return False
+
+        _check = self.release()
+        if _check is False:
+            return False
+
+        transaction.committed = True
+        return True
+
+    def close(self) -> bool:
+        _result = True
+
+        if self._pooled is not None:
+            _result = self._close(self._pooled.connection)
+            self._pooled = None
+
+        if self._threads_lock is not None:
+            with self._threads_lock:
+                for _connection in self._threads:
+                    _check = self._close(_connection)
+                    if _check is False:
+                        _result = False
+                self._threads.clear()
+
+            self._local = threading.local()
+
+        if self._memory is not None:
+            _check = self._close(self._memory)
+            if _check is False:
+                _result = False
+            self._memory = None
+        return _result
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+from dataclasses import dataclass
+from typing import Optional, List, Dict
+
+__all__ = [
+    "Profile",
+
+    "profiles",
+    "get_profile"
+]
+
+
+@dataclass
+class Profile(object):
+
+    name: str = ""
+    journal_mode: str = ""
+    synchronous: str = ""
+    cache_size: int = 0
+    mmap_size: int = -1
+    temp_store: str = ""
+    auto_vacuum: str = ""
+
+    @property
+    def commands(self) -> List[str]:
+        _commands = []
+
+        if self.journal_mode != "":
+            _commands.append("PRAGMA journal_mode={0:s};".format(self.journal_mode))
+
+        if self.synchronous != "":
+            _commands.append("PRAGMA synchronous={0:s};".format(self.synchronous))
+
+        if self.cache_size != 0:
+            _commands.append("PRAGMA cache_size={0:d};".format(self.cache_size))
+
+        if self.mmap_size != -1:
+            _commands.append("PRAGMA mmap_size={0:d};".format(self.mmap_size))
+
+        if self.temp_store != "":
+            _commands.append("PRAGMA temp_store={0:s};".format(self.temp_store))
+
+        if self.auto_vacuum != "":
+            _commands.append("PRAGMA auto_vacuum={0:s};".format(self.auto_vacuum))
+        return _commands
+
+
+profiles: Dict[str, Profile] = {
+    "durable": Profile(name="durable",
+                       journal_mode="WAL",
+                       synchronous="FULL",
+                       cache_size=-16000,
+                       mmap_size=0,
+                       temp_store="DEFAULT"),
+    "fast-bulk": Profile(name="fast-bulk",
+                         journal_mode="WAL",
+                         synchronous="OFF",
+                         cache_size=-65536,
+                         mmap_size=268435456,
+                         temp_store="MEMORY"),
+    "read-mostly": Profile(name="read-mostly",
+                           journal_mode="WAL",
+                           synchronous="NORMAL",
+                           cache_size=-32768,
+                           mmap_size=268435456,
+                           temp_store="MEMORY")
+}
+
+
+def get_profile(name: str) -> Optional[Profile]:
+    try:
+        _profile = profiles[name]
+    except KeyError:
+        return None
+    return _profile
@@ -16,11 +16,18 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import sqlite3
+
 from dataclasses import dataclass, field
+from typing import Optional, List
 
 __all__ = [
     "Execute",
-    "Select"
+    "Select",
+    "Pooled",
+    "Transaction",
+    "TransactionState",
+    "Maintenance"
 ]
 
 
@@ -34,3 +41,36 @@ class Execute(object):
 class Select(object):
     number: int = -1
     data: list = field(default_factory=list)
+
+
+@dataclass
+class Pooled(object):
+    connection: Optional[sqlite3.Connection] = None
+    timestamp: float = 0.0
+
+
+@dataclass
+class Transaction(object):
+    depth: int = 0
+    savepoint: str = ""
+    write: bool = True
+    failed: bool = False
+    committed: bool = False
+
+
+@dataclass
+class TransactionState(object):
+    owner: int = 0
+    levels: List[Transaction] = field(default_factory=list)
+
+
+@dataclass
+class Maintenance(object):
+    operation: str = ""
+    success: bool = False
+    pages: int = 0
+    pages_before: int = 0
+    pages_after: int = 0
+    free_pages: int = 0
+    steps: int = 0
+    duration: float = 0.0
@@ -16,14 +16,27 @@
 #    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import csv
+import os
+import sqlite3
+import struct
+import time
+
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Any, Tuple
+from typing import Optional, List, Dict, Any, Tuple, Iterator, Union, Callable
 from enum import Enum
 
 import bbutil
 
-from bbutil.database import Column, Types, Data, DataType, select_interval
+from bbutil.database import (Column, Index, Types, Row, DataType, select_interval, create_row_type,
+                             create_row_decoder)
+from bbutil.database.types import array_codes
 from bbutil.database.sqlite import SQLite
+from bbutil.database.lookup import Lookup, HashLookup, SortedLookup
+from bbutil.database.writer import WriteBehind
+from bbutil.database.cache import ResultCache
+from bbutil.database.transfer import get_format, write_file, read_file
 
 
 __all__ = [
@@ -31,6 +44,13 @@ __all__ = [
 ]
 
 
+_numpy_types = {
+    "q": "int64",
+    "d": "float64",
+    "b": "bool"
+}
+
+
 class _InitType(Enum):
 
     has_table = 0
@@ -39,6 +59,20 @@ class _InitType(Enum):
     has_no_columns = 3
 
 
+@dataclass
+class _BatchState(object):
+
+    success: bool = True
+
+
+def _track_batches(batches: Iterator[List[tuple]], state: _BatchState) -> Iterator[List[tuple]]:
+    # iter_batches only logs a failed select, its return value tells it apart from an empty table
+    _success = yield from batches
+    if _success is False:
+        state.success = False
+    return
+
+
 @dataclass
 class Table(object):
 
@@ -47,18 +81,39 @@ class Table(object):
     _counter: int = 0
     keyword: str = ""
     sqlite: Optional[SQLite] = None
-    data: List[Data] = field(default_factory=list)
-    index: Dict[Any, List[Data]] = field(default_factory=dict)
+    data: List[Row] = field(default_factory=list)
+    index: Dict[Any, List[Row]] = field(default_factory=dict)
     columns: List[Column] = field(default_factory=list)
     missing_columns: List[Column] = field(default_factory=list)
     invalid_columns: List[Column] = field(default_factory=list)
     drop_columns: List[str] = field(default_factory=list)
+    indexes: List[Index] = field(default_factory=list)
+    missing_indexes: List[Index] = field(default_factory=list)
+    drop_indexes: List[str] = field(default_factory=list)
     names: List[str] = field(default_factory=list)
     suppress_warnings: bool = False
+    lookups: Dict[str, Lookup] = field(default_factory=dict)
+    writer: Optional[WriteBehind] = None
+    cache: Optional[ResultCache] = None
+    version_column: str = ""
+    loaded: bool = False
+    last_key: Optional[int] = None
+    last_version: Optional[int] = None
+    _row_type: Optional[type] = None
+    _decoder: Optional[Callable[[Tuple], Row]] = None
+    _column_map: Dict[str, Column] = field(default_factory=dict)
 
     def clear(self):
         self.data.clear()
         self.index.clear()
+        self.invalidate()
+
+        self.loaded = False
+        self.last_key = None
+        self.last_version = None
+
+        for _lookup in self.lookups.values():
+            _lookup.clear()
         return
 
     @property
@@ -86,43 +141,193 @@ class Table(object):
             _unique.append(_col.name)
         return _unique
 
-    def new_data(self) -> Data:
-        key_list = []
+    @property
+    def row_type(self) -> type:
+        if self._row_type is None:
+            _keys = []
+            for _column in self.columns:
+                _keys.append(_column.name)
+
+            self._row_type = create_row_type("{0:s}_row".format(self.name), _keys)
+        return self._row_type
+
+    @property
+    def decoder(self) -> Callable[[Tuple], Row]:
+        if self._decoder is None:
+            _types = []
+            for _column in self.columns:
+                _types.append(_column.type)
+
+            self._decoder = create_row_decoder(self.row_type, _types)
+        return self._decoder
+
+    def new_data(self) -> Row:
         value_list = []
 
         for _column in self.columns:
             # noinspection PyTypeChecker
             _datatype: DataType = _column.type.value
-
-            key_list.append(_column.name)
             value_list.append(_datatype.value)
 
-        _data = Data(keys=key_list, values=value_list)
+        _data = self.row_type(*value_list)
         return _data
 
     def add_column(self, name: str, data_type: Types, unique: bool = False, primarykey: bool = False,
-                   keyword: bool = False):
+                   keyword: bool = False, indexed: bool = False):
         for _column in self.columns:
             if _column.name == name:
                 return
 
-        _column = Column(name=name, primarykey=primarykey, type=data_type, unique=unique)
+        _column = Column(name=name, primarykey=primarykey, type=data_type, unique=unique, indexed=indexed)
         self.columns.append(_column)
+        self._row_type = None
+        self._decoder = None
 
         if keyword is True:
             self.keyword = name
 
+        if indexed is True:
+            _index = Index(name="index_{0:s}_{1:s}".format(self.name, name), columns=[name])
+            self.indexes.append(_index)
+
         if primarykey is False:
             self.names.append(name)
         return
 
     def get_column(self, name: str) -> Optional[Column]:
-        for _column in self.columns:
-            if _column.name == name:
-                return _column
+        if len(self._column_map) != len(self.columns):
+            self._column_map.clear()
+            for _column in self.columns:
+                self._column_map[_column.name] = _column
+
+        try:
+            _column = self._column_map[name]
+        except KeyError:
+            return None
+        return _column
+
+    def add_index(self, name: str, columns: List[str], unique: bool = False) -> bool:
+        if len(columns) == 0:
+            bbutil.log.error("No columns for index: {0:s}".format(name))
+            return False
+
+        for _name in columns:
+            _column = self.get_column(_name)
+            if _column is None:
+                bbutil.log.error("Column {0:s} in {1:s} not found!".format(_name, self.name))
+                return False
+
+        for _index in self.indexes:
+            if _index.name == name:
+                bbutil.log.error("Index {0:s} in {1:s} already exists!".format(name, self.name))
+                return False
+
+        _index = Index(name=name, columns=list(columns), unique=unique)
+        self.indexes.append(_index)
+        return True
+
+    def add_lookup(self, name: str, columns: List[str], ordered: bool = False) -> bool:
+        if len(columns) == 0:
+            bbutil.log.error("No columns for lookup: {0:s}".format(name))
+            return False
+
+        for _name in columns:
+            _column = self.get_column(_name)
+            if _column is None:
+                bbutil.log.error("Column {0:s} in {1:s} not found!".format(_name, self.name))
+                return False
+
+        if ordered is True:
+            _lookup = SortedLookup(name=name, columns=list(columns))
+        else:
+            _lookup = HashLookup(name=name, columns=list(columns))
+
+        for _item in self.data:
+            _lookup.add(_item)
+
+        self.lookups[name] = _lookup
+        return True
+
+    def _get_lookup(self, names: List[str], ordered: bool = False) -> Optional[Lookup]:
+        for _lookup in self.lookups.values():
+            if (ordered is True) and (type(_lookup) is not SortedLookup):
+                continue
+
+            _check = _lookup.match(names)
+            if _check is True:
+                return _lookup
         return None
 
-    def _process_datalist(self, data_list: List[Tuple], verbose: bool = True) -> Optional[List[Data]]:
+    def find(self, **kwargs) -> List[Row]:
+        _names = list(kwargs.keys())
+
+        _lookup = self._get_lookup(_names)
+
+        # sorted lookups skip None keys, those rows are only found by the scan
+        if (type(_lookup) is SortedLookup) and (None in kwargs.values()):
+            _lookup = None
+
+        if _lookup is not None:
+            _values = []
+            for _name in _lookup.columns:
+                _values.append(kwargs[_name])
+
+            if len(_values) == 1:
+                return _lookup.find(_values[0])
+            return _lookup.find(tuple(_values))
+
+        _result = []
+        for _item in self.data:
+            _found = True
+            for _name in _names:
+                if getattr(_item, _name, None) != kwargs[_name]:
+                    _found = False
+                    break
+
+            if _found is True:
+                _result.append(_item)
+        return _result
+
+    def range(self, column: str, low: Any = None, high: Any = None) -> List[Row]:
+        _lookup = self._get_lookup([column], ordered=True)
+        if _lookup is not None:
+            return _lookup.range(low, high)
+
+        _entries = []
+        for _item in self.data:
+            _value = getattr(_item, column, None)
+            if _value is None:
+                continue
+
+            if (low is not None) and (_value < low):
+                continue
+
+            if (high is not None) and (_value > high):
+                continue
+
+            _entries.append((_value, _item))
+
+        _entries.sort(key=lambda _entry: _entry[0])
+
+        _result = [_entry[1] for _entry in _entries]
+        return _result
+
+    def _process_data(self, data: Tuple, count: int) -> Optional[Row]:
+        try:
+            _entry = self.decoder(data)
+        except IndexError as e:
+            _number = len(data)
+            bbutil.log.error("Problem with data item {0:d}!".format(count))
+            bbutil.log.error("Column {0:d} ({1:s}) not found!".format(_number, self.columns[_number].name))
+            bbutil.log.exception(e)
+            return None
+        except ValueError as e:
+            bbutil.log.error("Problem with data item {0:d}!".format(count))
+            bbutil.log.exception(e)
+            return None
+        return _entry
+
+    def _process_datalist(self, data_list: List[Tuple], verbose: bool = True) -> Optional[List[Row]]:
         if data_list is None:
             if (self.suppress_warnings is False) and (verbose is True):
                 bbutil.log.warn(self.name, "No data!")
@@ -139,37 +344,25 @@ class Table(object):
             bbutil.log.inform("Table", "Load {0:d} from {1:s}".format(_count, self.name))
             progress = bbutil.log.progress(_count, select_interval(_count))
 
+        if progress is None:
+            _decoder = self.decoder
+
+            try:
+                _result = [_decoder(_data) for _data in data_list]
+            except (IndexError, ValueError):
+                _result = None
+
+            if _result is not None:
+                return _result
+
         _result = []
         _count = 0
         for _data in data_list:
-            _number = 0
-
-            key_list = []
-            value_list = []
-
-            for _col in self.columns:
-                try:
-                    _value = _data[_number]
-                except IndexError as e:
-                    bbutil.log.error("Problem with data item {0:d}!".format(_count))
-                    bbutil.log.error("Column {0:d} ({1:s}) not found!".format(_number, _col.name))
-                    bbutil.log.exception(e)
-                    return None
-
-                key_list.append(_col.name)
-
-                if _col.type is Types.bool:
-                    if _value == 1:
-                        _value = True
-                    else:
-                        _value = False
-
-                value_list.append(_value)
-                _number += 1
+            _entry = self._process_data(_data, _count)
+            if _entry is None:
+                return None
 
             _count += 1
-
-            _entry = Data(keys=key_list, values=value_list)
             _result.append(_entry)
 
             if progress is not None:
@@ -179,33 +372,337 @@ class Table(object):
             bbutil.log.clear()
         return _result
 
-    def select(self, sql_filter: str = "", names=None, data_values=None, verbose: bool = True) -> List[Data]:
+    def enable_cache(self, max_rows: int = 10000):
+        self.cache = ResultCache(name=self.name, max_rows=max_rows)
+        return
+
+    def invalidate(self):
+        if self.cache is None:
+            return
+
+        self.cache.invalidate()
+        return
+
+    def _cache_key(self, sql_filter: str, names: list, data_values: list) -> Optional[tuple]:
+        if self.cache is None:
+            return None
+
+        _key = (tuple(names), sql_filter, tuple(data_values))
+
+        try:
+            hash(_key)
+        except TypeError:
+            return None
+        return _key
+
+    def select(self, sql_filter: str = "", names=None, data_values=None, verbose: bool = True) -> List[Row]:
         if names is None:
             names = []
 
         if data_values is None:
             data_values = []
 
+        _key = self._cache_key(sql_filter, names, data_values)
+        if _key is not None:
+            _result = self.cache.get(_key)
+            if _result is not None:
+                return _result
+
         _data_list = self.sqlite.select(table_name=self.name, sql_filter=sql_filter, names=names, data=data_values)
         _result = self._process_datalist(_data_list, verbose)
 
         if _result is None:
+            _result = []
+
+        # failed queries are not cached, an empty result set is
+        if (_key is not None) and (_data_list is not None):
+            self.cache.put(_key, _result)
+
+        return _result
+
+    def _fetch(self, sql_filter: str, data_values: list, verbose: bool) -> Optional[List[Row]]:
+        _data_list = self.sqlite.select(table_name=self.name, sql_filter=sql_filter, names=[], data=data_values)
+        if _data_list is None:
+            return None
+
+        if len(_data_list) == 0:
             return []
 
+        # rows that can not be decoded are an error, not an empty table
+        _result = self._process_datalist(_data_list, verbose)
         return _result
 
-    def store(self, data: Data = None) -> int:
+    def _page_order(self, order_by: Union[str, List[str]]) -> Optional[List[str]]:
+        _order = order_by
+        if type(order_by) is str:
+            _order = [order_by]
+
+        if order_by == "":
+            _order = [self.columns[0].name]
+            for _column in self.columns:
+                if _column.primarykey is True:
+                    _order = [_column.name]
+                    break
+
+        for _name in _order:
+            _column = self.get_column(_name)
+            if _column is None:
+                bbutil.log.error("Column {0:s} in {1:s} not found!".format(_name, self.name))
+                return None
+        return _order
+
+    def page(self, order_by: Union[str, List[str]] = "", after=None, limit: int = 100, sql_filter: str = "",
+             data_values=None, descending: bool = False) -> List[Row]:
+        if len(self.columns) == 0:
+            bbutil.log.error("No columns: {0:s}".format(self.name))
+            return []
+
+        _order = self._page_order(order_by)
+        if _order is None:
+            return []
+
+        _after = after
+        if (after is not None) and (type(after) not in [list, tuple]):
+            _after = [after]
+
+        _data_list = self.sqlite.page(self.name, [], _order, _after, limit, sql_filter, data_values, descending)
+        _result = self._process_datalist(_data_list, False)
+
+        if _result is None:
+            return []
+
+        return _result
+
+    def count(self, sql_filter: str = "", data_values=None) -> int:
+        _count = self.sqlite.count(self.name, sql_filter, data_values)
+        return _count
+
+    def iter_select(self, sql_filter: str = "", names=None, data_values=None,
+                    batch_size: int = 1000) -> Iterator[Row]:
+        if names is None:
+            names = []
+
+        if data_values is None:
+            data_values = []
+
+        _rows = self.sqlite.iter_select(table_name=self.name, sql_filter=sql_filter, names=names,
+                                        data=data_values, batch_size=batch_size)
+
+        _count = 0
+        for _data in _rows:
+            _entry = self._process_data(_data, _count)
+            if _entry is None:
+                _rows.close()
+                return
+
+            _count += 1
+            yield _entry
+        return
+
+    def _get_columns(self, names: List[str]) -> Optional[Dict[str, Any]]:
+        _columns = {}
+
+        for _name in names:
+            _column = self.get_column(_name)
+            if _column is None:
+                bbutil.log.error("Column {0:s} in {1:s} not found!".format(_name, self.name))
+                return None
+
+            try:
+                _code = array_codes[_column.type]
+            except KeyError:
+                _columns[_name] = []
+                continue
+
+            _columns[_name] = array(_code)
+        return _columns
+
+    @staticmethod
+    def _convert_numpy(columns: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            import numpy
+        except ImportError as e:
+            bbutil.log.error("NumPy is not available!")
+            bbutil.log.exception(e)
+            return None
+
+        for _name in columns:
+            _values = columns[_name]
+            if type(_values) is not array:
+                continue
+
+            columns[_name] = numpy.frombuffer(_values, dtype=_numpy_types[_values.typecode])
+        return columns
+
+    def select_columns(self, names: Optional[List[str]] = None, sql_filter: str = "", data_values=None,
+                       batch_size: int = 1000, use_numpy: bool = False) -> Optional[Dict[str, Any]]:
+        if (names is None) or (len(names) == 0):
+            names = []
+            for _column in self.columns:
+                names.append(_column.name)
+
+        if data_values is None:
+            data_values = []
+
+        _columns = self._get_columns(names)
+        if _columns is None:
+            return None
+
+        _state = _BatchState()
+        _batches = self.sqlite.iter_batches(table_name=self.name, sql_filter=sql_filter, names=names,
+                                            data=data_values, batch_size=batch_size)
+
+        for _batch in _track_batches(_batches, _state):
+            _number = 0
+            for _values in zip(*_batch):
+                _name = names[_number]
+                _target = _columns[_name]
+                _number += 1
+
+                if type(_target) is list:
+                    _target.extend(_values)
+                    continue
+
+                try:
+                    _target.extend(array(_target.typecode, _values))
+                except (TypeError, OverflowError):
+                    _target = _target.tolist()
+                    _target.extend(_values)
+                    _columns[_name] = _target
+
+        if _state.success is False:
+            return None
+
+        if use_numpy is True:
+            return self._convert_numpy(_columns)
+
+        return _columns
+
+    def store(self, data: Row = None, bulk: bool = False, batch_size: int = 0) -> int:
         _data = data
         if data is None:
             _data = self.data
 
-        _count = self.sqlite.insert(self.name, self.names, _data)
+        _count = self.sqlite.insert(self.name, self.names, _data, bulk=bulk, batch_size=batch_size)
+        self.invalidate()
         return _count
 
-    def update(self, data: Data, data_filter: str, filter_value=None) -> bool:
+    @staticmethod
+    def _remove_file(filename: str):
+        if os.path.exists(filename) is False:
+            return
+
+        try:
+            os.remove(filename)
+        except OSError as e:
+            bbutil.log.error("Unable to remove {0:s}!".format(filename))
+            bbutil.log.exception(e)
+        return
+
+    def export_file(self, filename: str, file_format: str = "", batch_size: int = 10000, sql_filter: str = "",
+                    data_values=None) -> int:
+        _format = get_format(filename, file_format)
+        if _format is None:
+            bbutil.log.error("Unknown file format: {0:s}".format(filename))
+            return -1
+
+        if data_values is None:
+            data_values = []
+
+        _names = []
+        for _column in self.columns:
+            _names.append(_column.name)
+
+        _start = time.perf_counter()
+        _state = _BatchState()
+        _batches = self.sqlite.iter_batches(table_name=self.name, names=_names, sql_filter=sql_filter,
+                                            data=data_values, batch_size=batch_size)
+        _batches = _track_batches(_batches, _state)
+
+        try:
+            _count = write_file(filename, _format, self.columns, _batches)
+        except (OSError, ValueError, TypeError, csv.Error) as e:
+            bbutil.log.error("Unable to export {0:s} to {1:s}!".format(self.name, filename))
+            bbutil.log.exception(e)
+            _state.success = False
+            _count = -1
+        finally:
+            _batches.close()
+
+        if _state.success is False:
+            self._remove_file(filename)
+            return -1
+
+        _rate = _count / max(time.perf_counter() - _start, 1e-9)
+        bbutil.log.inform(self.name, "Export {0:d} rows to {1:s} ({2:.0f} rows/s)".format(_count, filename, _rate))
+        return _count
+
+    def _import_rows(self, filename: str, file_format: str, batch_size: int) -> int:
+        _count = 0
+        _row_type = None
+        _row_names = None
+
+        for _names, _rows in read_file(filename, file_format, self.columns, batch_size):
+            if _names != _row_names:
+                _row_type = create_row_type("{0:s}_import".format(self.name), _names)
+                _row_names = _names
+
+            _data = [_row_type(*_row) for _row in _rows]
+
+            _stored = self.sqlite.insert(self.name, _names, _data, bulk=True)
+            if _stored == -1:
+                return -1
+            _count += _stored
+        return _count
+
+    def import_file(self, filename: str, file_format: str = "", batch_size: int = 10000) -> int:
+        _format = get_format(filename, file_format)
+        if _format is None:
+            bbutil.log.error("Unknown file format: {0:s}".format(filename))
+            return -1
+
+        _start = time.perf_counter()
+        _count = -1
+
+        try:
+            # every batch joins the transaction, so the import is committed once or not at all
+            with self.sqlite.transaction() as _transaction:
+                _count = self._import_rows(filename, _format, batch_size)
+        except (OSError, ValueError, TypeError, csv.Error, struct.error, sqlite3.OperationalError) as e:
+            bbutil.log.error("Unable to import {0:s} into {1:s}!".format(filename, self.name))
+            bbutil.log.exception(e)
+            self.invalidate()
+            return -1
+
+        self.invalidate()
+
+        if (_count == -1) or (_transaction.committed is False):
+            bbutil.log.error("Unable to import {0:s} into {1:s}!".format(filename, self.name))
+            return -1
+
+        _rate = _count / max(time.perf_counter() - _start, 1e-9)
+        bbutil.log.inform(self.name, "Import {0:d} rows from {1:s} ({2:.0f} rows/s)".format(_count, filename, _rate))
+        return _count
+
+    def update(self, data: Row, data_filter: str, filter_value=None) -> bool:
         _check = self.sqlite.update(self.name, self.names, data, data_filter, filter_value)
+        self.invalidate()
         return _check
 
+    def update_many(self, data_list: List[Row], key_column: str) -> int:
+        _count = self.sqlite.update_many(self.name, self.names, data_list, key_column)
+        self.invalidate()
+        return _count
+
+    def upsert(self, data: Union[Row, List[Row]] = None) -> int:
+        _data = data
+        if data is None:
+            _data = self.data
+
+        _count = self.sqlite.upsert(self.name, self.names, _data, self.unique_list)
+        self.invalidate()
+        return _count
+
     def _check_table(self) -> _InitType:
         _type = _InitType.has_no_table
 
@@ -239,6 +736,72 @@ class Table(object):
         _check = self.sqlite.create_table(self.name, _columns, _unique)
         if _check is False:
             return False
+
+        _check = self._create_indexes()
+        if _check is False:
+            return False
+        return True
+
+    def _create_indexes(self) -> bool:
+        if len(self.indexes) == 0:
+            return True
+
+        _check = self.sqlite.create_indexes(self.name, self.indexes)
+        if _check is False:
+            return False
+        return True
+
+    def _check_indexes(self) -> bool:
+        self.missing_indexes.clear()
+        self.drop_indexes.clear()
+
+        _data = self.sqlite.get_indexes(self.name)
+        if _data is None:
+            bbutil.log.error("Indexes for {0:s} not found!".format(self.name))
+            return False
+
+        _indexes = {}
+        for _index in self.indexes:
+            _indexes[_index.name] = _index
+
+        _found = {}
+        for _index in _data:
+            _found[_index.name] = _index
+
+            try:
+                _expected = _indexes[_index.name]
+            except KeyError:
+                bbutil.log.error("Index {0:s} found, but no definition exists!".format(_index.name))
+                self.drop_indexes.append(_index.name)
+                continue
+
+            if _expected.match(_index) is False:
+                bbutil.log.error("Index {0:s} in {1:s} does not match!".format(_index.name, self.name))
+                self.drop_indexes.append(_index.name)
+                self.missing_indexes.append(_expected)
+
+        for _index in self.indexes:
+            if _index.name in _found:
+                continue
+
+            bbutil.log.error("Index {0:s} in {1:s} not found!".format(_index.name, self.name))
+            self.missing_indexes.append(_index)
+        return True
+
+    def _upgrade_indexes(self) -> bool:
+        _check = self._check_indexes()
+        if _check is False:
+            return False
+
+        if len(self.drop_indexes) > 0:
+            _check = self.sqlite.drop_indexes(self.drop_indexes)
+            if _check is False:
+                return False
+
+        if len(self.missing_indexes) > 0:
+            _check = self.sqlite.create_indexes(self.name, self.missing_indexes)
+            if _check is False:
+                return False
         return True
 
     def _rename_table(self) -> bool:
@@ -252,6 +815,8 @@ class Table(object):
         if check is True:
             return True
 
+        self.invalidate()
+
         count_invalid = len(self.invalid_columns)
 
         if count_invalid > 0:
@@ -273,6 +838,10 @@ class Table(object):
         if check is False:
             return False
 
+        check = self._upgrade_indexes()
+        if check is False:
+            return False
+
         if len(self.drop_columns) == 0:
             return True
 
@@ -290,7 +859,9 @@ class Table(object):
         if bbutil.log is None:
             return False
 
-        self.sqlite.prepare()
+        _check = self.sqlite.prepare()
+        if _check is False:
+            return False
 
         _type = self._check_table()
 
@@ -304,9 +875,11 @@ class Table(object):
 
         if _type is _InitType.has_old_table:
             _check = self._rename_table()
+            if _check is True:
+                _check = self._create_indexes()
 
         if _type is _InitType.has_table:
-            _check = True
+            _check = self._create_indexes()
 
         if _check is False:
             return False
@@ -318,9 +891,58 @@ class Table(object):
         self._counter = _count
         return True
 
-    def add(self, item: Data):
+    def start_writer(self, flush_size: int = 1000, flush_delay: float = 1.0, max_pending: int = 10000) -> bool:
+        if self.writer is not None:
+            bbutil.log.error("Write-behind for {0:s} is already running!".format(self.name))
+            return False
+
+        _writer = WriteBehind(table_name=self.name,
+                              names=list(self.names),
+                              sqlite=self.sqlite,
+                              flush_size=flush_size,
+                              flush_delay=flush_delay,
+                              max_pending=max_pending,
+                              on_write=self.invalidate)
+
+        _check = _writer.start()
+        if _check is False:
+            return False
+
+        self.writer = _writer
+        return True
+
+    def flush(self) -> bool:
+        if self.writer is None:
+            return True
+
+        _check = self.writer.flush()
+        return _check
+
+    def close(self) -> bool:
+        if self.cache is not None:
+            self.cache.report()
+
+        if self.writer is None:
+            return True
+
+        _check = self.writer.close()
+        self.writer = None
+        return _check
+
+    def add(self, item: Row):
+        if self.writer is not None:
+            self.writer.add(item)
+            return
+
+        self._append(item)
+        return
+
+    def _append(self, item: Row):
         self.data.append(item)
 
+        for _lookup in self.lookups.values():
+            _lookup.add(item)
+
         if self.keyword == "":
             return
 
@@ -356,6 +978,8 @@ class Table(object):
         self.missing_columns.clear()
         self.invalid_columns.clear()
         self.drop_columns.clear()
+        self.missing_indexes.clear()
+        self.drop_indexes.clear()
 
         for item in _data:
             _schemes[item[0]] = item[1]
@@ -392,22 +1016,149 @@ class Table(object):
         if len(self.drop_columns) > 0:
             return False
 
+        _check = self._check_indexes()
+        if _check is False:
+            return False
+
+        if (len(self.missing_indexes) > 0) or (len(self.drop_indexes) > 0):
+            return False
+
         return True
 
-    def load(self) -> int:
-        bbutil.log.inform(self.name, "Load {0:s}...".format(self.name))
+    @property
+    def primary_key(self) -> Optional[Column]:
+        for _column in self.columns:
+            if _column.primarykey is True:
+                return _column
+        return None
+
+    def _track(self, items: List[Row]):
+        _key = self.primary_key
+
+        for _item in items:
+            if _key is not None:
+                _value = getattr(_item, _key.name)
+                if (self.last_key is None) or (_value > self.last_key):
+                    self.last_key = _value
+
+            if self.version_column != "":
+                _value = getattr(_item, self.version_column, None)
+                if (_value is not None) and ((self.last_version is None) or (_value > self.last_version)):
+                    self.last_version = _value
+        return
+
+    def _rebuild(self):
+        self.index.clear()
 
-        _items = self.select()
-        _count = len(_items)
+        for _lookup in self.lookups.values():
+            _lookup.clear()
 
-        _max = _count + 1
-        _progress = bbutil.log.progress(_max, select_interval(_max))
+        _items = self.data
+        self.data = []
 
         for _item in _items:
-            self.add(_item)
-            _progress.inc()
+            self._append(_item)
+        return
+
+    def load(self, verbose: bool = True) -> int:
+        if verbose is True:
+            bbutil.log.inform(self.name, "Load {0:s}...".format(self.name))
+
+        _items = self._fetch("", [], verbose)
+        if _items is None:
+            bbutil.log.error("Unable to load {0:s}!".format(self.name))
+            return -1
 
-        bbutil.log.clear()
+        if verbose is True:
+            _count = len(_items)
+
+            _max = _count + 1
+            _progress = bbutil.log.progress(_max, select_interval(_max))
+
+            for _item in _items:
+                self._append(_item)
+                _progress.inc()
+
+            bbutil.log.clear()
+        else:
+            for _item in _items:
+                self._append(_item)
+
+        self._track(_items)
+        self.loaded = True
 
         _count = self.data_count
         return _count
+
+    def ensure(self) -> bool:
+        if self.loaded is True:
+            return True
+
+        _count = self.load()
+        if _count == -1:
+            return False
+        return True
+
+    def refresh(self) -> int:
+        if self.loaded is False:
+            _count = self.load()
+            return _count
+
+        if self.version_column != "":
+            _column = self.get_column(self.version_column)
+            if _column is None:
+                bbutil.log.error("Column {0:s} in {1:s} not found!".format(self.version_column, self.name))
+                return -1
+
+        _key = self.primary_key
+        if _key is None:
+            bbutil.log.debug1(self.name, "No primary key, reload {0:s}".format(self.name))
+            self.clear()
+            _count = self.load()
+            return _count
+
+        _filters = []
+        _values = []
+
+        if self.last_key is not None:
+            _filters.append("{0:s} > ?".format(_key.name))
+            _values.append(self.last_key)
+
+        if (self.version_column != "") and (self.last_version is not None):
+            _filters.append("{0:s} > ?".format(self.version_column))
+            _values.append(self.last_version)
+
+        _filter = " OR ".join(["({0:s})".format(_line) for _line in _filters])
+
+        _items = self._fetch(_filter, _values, False)
+        if _items is None:
+            return -1
+
+        if len(_items) == 0:
+            return 0
+
+        _positions = {}
+        for _number, _item in enumerate(self.data):
+            _positions[getattr(_item, _key.name)] = _number
+
+        _changed = 0
+        for _item in _items:
+            _value = getattr(_item, _key.name)
+
+            try:
+                _number = _positions[_value]
+            except KeyError:
+                self._append(_item)
+                continue
+
+            self.data[_number] = _item
+            _changed += 1
+
+        if _changed > 0:
+            self._rebuild()
+
+        self._track(_items)
+        self.invalidate()
+
+        bbutil.log.debug1(self.name, "Refresh {0:d}, changed {1:d}".format(len(_items), _changed))
+        return len(_items)
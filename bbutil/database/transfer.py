@@ -0,0 +1,413 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import csv
+import json
+import os
+import struct
+
+from array import array
+from datetime import datetime
+from typing import Optional, List, Dict, Iterator, Tuple, Callable, Any
+
+from bbutil.database.types import Types, Column, ListValue, array_codes
+
+__all__ = [
+    "formats",
+
+    "get_format",
+    "write_file",
+    "read_file"
+]
+
+formats = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".bbc": "columnar"
+}
+
+_magic = b"BBCOL\x01"
+_size = struct.Struct("<I")
+_block = struct.Struct("<BI")
+
+_kind_json = 0
+_kind_array = 1
+
+
+def get_format(filename: str, file_format: str = "") -> Optional[str]:
+    if file_format != "":
+        if file_format not in formats.values():
+            return None
+        return file_format
+
+    _extension = os.path.splitext(filename)[1].lower()
+    _format = formats.get(_extension, None)
+    return _format
+
+
+def _dump_json(value: Any) -> Any:
+    if isinstance(value, str) is True:
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _dump_bool(value: Any) -> int:
+    return int(value)
+
+
+def _dump_bytes(value: bytes) -> str:
+    return value.hex()
+
+
+def _dump_datetime(value: datetime) -> str:
+    return value.isoformat()
+
+
+def _load_bool(value: Any) -> bool:
+    if isinstance(value, str) is True:
+        return value in ("1", "true", "True")
+    return bool(value)
+
+
+def _dump_list(value: Any) -> Any:
+    # list columns hold JSON bytes, anything else written to them is kept as hex
+    if isinstance(value, bytes) is False:
+        return value
+
+    try:
+        _value = json.loads(value)
+    except ValueError:
+        return value.hex()
+
+    if isinstance(_value, list) is False:
+        return value.hex()
+    return _value
+
+
+def _dump_list_text(value: Any) -> str:
+    _value = _dump_list(value)
+    if isinstance(_value, str) is True:
+        return _value
+    return json.dumps(_value, separators=(",", ":"))
+
+
+def _load_list(value: Any) -> Any:
+    if isinstance(value, list) is True:
+        return ListValue(value)
+
+    if value.startswith("[") is True:
+        return ListValue(json.loads(value))
+    return bytes.fromhex(value)
+
+
+# CSV holds text only, JSON Lines and columnar blocks keep dicts and lists
+_text_dumps = {
+    Types.json: _dump_json,
+    Types.list: _dump_list_text,
+    Types.bool: _dump_bool,
+    Types.bytes: _dump_bytes,
+    Types.datetime: _dump_datetime
+}
+
+_json_dumps = {
+    Types.bool: bool,
+    Types.list: _dump_list,
+    Types.bytes: _dump_bytes,
+    Types.datetime: _dump_datetime
+}
+
+_text_loads = {
+    Types.integer: int,
+    Types.biginteger: int,
+    Types.float: float,
+    Types.bool: _load_bool,
+    Types.json: _dump_json,
+    Types.list: _load_list,
+    Types.bytes: bytes.fromhex,
+    Types.datetime: datetime.fromisoformat
+}
+
+_json_loads = {
+    Types.bool: _load_bool,
+    Types.json: _dump_json,
+    Types.list: _load_list,
+    Types.bytes: bytes.fromhex,
+    Types.datetime: datetime.fromisoformat
+}
+
+
+def _get_functions(columns: List[Column], functions: Dict[Types, Callable]) -> List[Optional[Callable]]:
+    _result = []
+    for _column in columns:
+        _result.append(functions.get(_column.type, None))
+    return _result
+
+
+def _convert(row: tuple, functions: List[Optional[Callable]], empty: Any) -> tuple:
+    _values = []
+
+    for _value, _function in zip(row, functions):
+        if _value is None:
+            _values.append(None)
+            continue
+
+        # empty CSV fields are NULL, except for text columns
+        if (_function is not None) and (_value == empty):
+            _values.append(None)
+            continue
+
+        if _function is not None:
+            _value = _function(_value)
+        _values.append(_value)
+    return tuple(_values)
+
+
+def _get_columns(names: List[str], columns: Dict[str, Column]) -> List[Column]:
+    _columns = []
+
+    for _name in names:
+        try:
+            _column = columns[_name]
+        except KeyError:
+            raise ValueError("Column {0:s} not found!".format(_name))
+        _columns.append(_column)
+    return _columns
+
+
+def _write_csv(filename: str, columns: List[Column], batches: Iterator[List[tuple]]) -> int:
+    _functions = _get_functions(columns, _text_dumps)
+    _count = 0
+
+    with open(filename, "w", newline="", encoding="utf-8") as _file:
+        _writer = csv.writer(_file)
+        _writer.writerow([_column.name for _column in columns])
+
+        for _batch in batches:
+            _writer.writerows(_convert(_row, _functions, None) for _row in _batch)
+            _count += len(_batch)
+    return _count
+
+
+def _read_csv(filename: str, columns: Dict[str, Column], batch_size: int) -> Iterator[Tuple[List[str], list]]:
+    with open(filename, "r", newline="", encoding="utf-8") as _file:
+        _reader = csv.reader(_file)
+
+        _names = next(_reader, None)
+        if _names is None:
+            return
+
+        _functions = _get_functions(_get_columns(_names, columns), _text_loads)
+
+        _rows = []
+        for _row in _reader:
+            _rows.append(_convert(_row, _functions, ""))
+
+            if len(_rows) == batch_size:
+                yield _names, _rows
+                _rows = []
+
+        if len(_rows) > 0:
+            yield _names, _rows
+    return
+
+
+def _write_jsonl(filename: str, columns: List[Column], batches: Iterator[List[tuple]]) -> int:
+    _functions = _get_functions(columns, _json_dumps)
+    _names = [_column.name for _column in columns]
+    _count = 0
+
+    with open(filename, "w", encoding="utf-8") as _file:
+        for _batch in batches:
+            _lines = []
+            for _row in _batch:
+                _values = _convert(_row, _functions, None)
+                _lines.append(json.dumps(dict(zip(_names, _values)), separators=(",", ":")))
+                _lines.append("\n")
+
+            _file.write("".join(_lines))
+            _count += len(_batch)
+    return _count
+
+
+def _read_jsonl(filename: str, columns: Dict[str, Column], batch_size: int) -> Iterator[Tuple[List[str], list]]:
+    _names = None
+    _functions = []
+    _rows = []
+
+    with open(filename, "r", encoding="utf-8") as _file:
+        for _line in _file:
+            if _line.strip() == "":
+                continue
+
+            _item = json.loads(_line)
+
+            if _names is None:
+                _names = list(_item.keys())
+                _functions = _get_functions(_get_columns(_names, columns), _json_loads)
+
+            _row = tuple(_item.get(_name, None) for _name in _names)
+            _rows.append(_convert(_row, _functions, None))
+
+            if len(_rows) == batch_size:
+                yield _names, _rows
+                _rows = []
+
+    if len(_rows) > 0:
+        yield _names, _rows
+    return
+
+
+def _write_block(file, column: Column, values: tuple, function: Optional[Callable]):
+    _code = array_codes.get(column.type, None)
+
+    if (_code is not None) and (None not in values):
+        try:
+            _payload = array(_code, values).tobytes()
+        except (TypeError, OverflowError):
+            _payload = None
+
+        if _payload is not None:
+            file.write(_block.pack(_kind_array, len(_payload)))
+            file.write(_payload)
+            return
+
+    if function is not None:
+        values = [None if _value is None else function(_value) for _value in values]
+
+    _payload = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    file.write(_block.pack(_kind_json, len(_payload)))
+    file.write(_payload)
+    return
+
+
+def _write_columnar(filename: str, columns: List[Column], batches: Iterator[List[tuple]]) -> int:
+    _functions = _get_functions(columns, _json_dumps)
+    _header = {
+        "columns": [[_column.name, _column.type.name] for _column in columns]
+    }
+    _header = json.dumps(_header).encode("utf-8")
+    _count = 0
+
+    with open(filename, "wb") as _file:
+        _file.write(_magic)
+        _file.write(_size.pack(len(_header)))
+        _file.write(_header)
+
+        for _batch in batches:
+            _file.write(_size.pack(len(_batch)))
+
+            for _column, _values, _function in zip(columns, zip(*_batch), _functions):
+                _write_block(_file, _column, _values, _function)
+
+            _count += len(_batch)
+    return _count
+
+
+def _read_exact(file, size: int) -> bytes:
+    _data = file.read(size)
+    if len(_data) != size:
+        raise ValueError("Columnar file is truncated!")
+    return _data
+
+
+def _read_block(file, column: Column, function: Optional[Callable]) -> list:
+    _kind, _length = _block.unpack(_read_exact(file, _block.size))
+    _payload = _read_exact(file, _length)
+
+    if _kind == _kind_array:
+        _code = array_codes.get(column.type, None)
+        if _code is None:
+            raise ValueError("Column {0:s} has no array type!".format(column.name))
+
+        _values = array(_code)
+        _values.frombytes(_payload)
+        return _values.tolist()
+
+    _values = json.loads(_payload)
+    if function is not None:
+        _values = [None if _value is None else function(_value) for _value in _values]
+    return _values
+
+
+def _read_columnar(filename: str, columns: Dict[str, Column],
+                   batch_size: int) -> Iterator[Tuple[List[str], list]]:
+    with open(filename, "rb") as _file:
+        if _file.read(len(_magic)) != _magic:
+            raise ValueError("No columnar file: {0:s}".format(filename))
+
+        (_length,) = _size.unpack(_read_exact(_file, _size.size))
+        _header = json.loads(_read_exact(_file, _length))
+
+        _names = []
+        _types = []
+        for _name, _type in _header["columns"]:
+            _names.append(_name)
+            _types.append(_type)
+
+        _columns = _get_columns(_names, columns)
+        for _column, _type in zip(_columns, _types):
+            if _column.type.name != _type:
+                raise ValueError("Column {0:s} type does not match: {1:s} != {2:s}".format(_column.name, _type,
+                                                                                          _column.type.name))
+        _functions = _get_functions(_columns, _json_loads)
+
+        while True:
+            _data = _file.read(_size.size)
+            if len(_data) == 0:
+                break
+
+            (_count,) = _size.unpack(_data)
+
+            _values = []
+            for _column, _function in zip(_columns, _functions):
+                _values.append(_read_block(_file, _column, _function))
+
+            # blocks are written per fetched batch, so they are split again for the insert batches
+            _rows = list(zip(*_values))
+            for _start in range(0, _count, batch_size):
+                yield _names, _rows[_start:_start + batch_size]
+    return
+
+
+_writers = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "columnar": _write_columnar
+}
+
+_readers = {
+    "csv": _read_csv,
+    "jsonl": _read_jsonl,
+    "columnar": _read_columnar
+}
+
+
+def write_file(filename: str, file_format: str, columns: List[Column], batches: Iterator[List[tuple]]) -> int:
+    _writer = _writers[file_format]
+    _count = _writer(filename, columns, batches)
+    return _count
+
+
+def read_file(filename: str, file_format: str, columns: List[Column],
+              batch_size: int) -> Iterator[Tuple[List[str], list]]:
+    _columns = {}
+    for _column in columns:
+        _columns[_column.name] = _column
+
+    _reader = _readers[file_format]
+    return _reader(filename, _columns, batch_size)
@@ -17,17 +17,29 @@
 #
 
 
-from dataclasses import dataclass
+import json
+import sqlite3
+
+from datetime import datetime
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from keyword import iskeyword
+from typing import Any, List, Callable, Tuple
 
 __all__ = [
     "select_interval",
+    "create_row_type",
+    "create_row_decoder",
+    "array_codes",
 
+    "ListValue",
+    "JsonValue",
     "DataType",
     "Types",
+    "Row",
     "Data",
-    "Column"
+    "Column",
+    "Index"
 ]
 
 
@@ -45,6 +57,14 @@ def select_interval(count) -> int:
     return _interval
 
 
+class ListValue(list):
+    pass
+
+
+class JsonValue(dict):
+    pass
+
+
 @dataclass
 class DataType(object):
 
@@ -55,7 +75,7 @@ class DataType(object):
 class Types(Enum):
 
     none = DataType(type="NULL", value=None)
-    json = DataType(type="JSON", value={})
+    json = DataType(type="JSON", value=JsonValue())
     bool = DataType(type="BOOLEAN", value=False)
     datetime = DataType(type="timestamp", value=None)
     integer = DataType(type="INTEGER", value=0)
@@ -66,7 +86,22 @@ class Types(Enum):
     list = DataType(type="BLOB", value=b"")
 
 
-class Data(object):
+array_codes = {
+    Types.integer: "q",
+    Types.biginteger: "q",
+    Types.float: "d",
+    Types.bool: "b"
+}
+
+
+class Row(object):
+
+    __slots__ = ()
+
+    _fields: tuple = ()
+
+
+class Data(Row):
 
     def __init__(self, keys: list, values: list):
         for (key, value) in zip(keys, values):
@@ -74,12 +109,172 @@ class Data(object):
         return
 
 
+def _create_data_type(name: str, fields: tuple) -> type:
+
+    def __init__(self, *values):
+        for (key, value) in zip(fields, values):
+            self.__dict__[key] = value
+        return
+
+    _type = type(name, (Data,), {
+        "__init__": __init__,
+        "_fields": fields
+    })
+    return _type
+
+
+def create_row_type(name: str, keys: List[str]) -> type:
+    _fields = tuple(keys)
+
+    for _key in _fields:
+        if (_key.isidentifier() is False) or (iskeyword(_key) is True):
+            return _create_data_type(name, _fields)
+
+        # slots can not replace class attributes like _fields or __init__
+        if hasattr(Row, _key) is True:
+            return _create_data_type(name, _fields)
+
+    _args = []
+    _lines = []
+    _number = 0
+
+    for _key in _fields:
+        _arg = "_{0:d}".format(_number)
+        _args.append(_arg)
+        _lines.append("    self.{0:s} = {1:s}".format(_key, _arg))
+        _number += 1
+
+    if len(_lines) == 0:
+        _lines.append("    return")
+
+    _signature = ", ".join(["self"] + _args)
+    _source = "def __init__({0:s}):\n{1:s}\n".format(_signature, "\n".join(_lines))
+    _namespace = {}
+    exec(_source, _namespace)
+
+    _type = type(name, (Row,), {
+        "__slots__": _fields,
+        "__init__": _namespace["__init__"],
+        "_fields": _fields
+    })
+    return _type
+
+
+def _adapt_json(value: JsonValue) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _adapt_list(value: ListValue) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _adapt_datetime(value: datetime) -> str:
+    return value.isoformat(" ")
+
+
+def _convert_datetime(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode("utf-8"))
+
+
+def _is_default(function: Any) -> bool:
+    if function is None:
+        return True
+
+    if getattr(function, "__module__", "") == "sqlite3.dbapi2":
+        return True
+    return False
+
+
+# only the bbutil wrappers are registered, plain dicts and lists are still rejected by sqlite3
+sqlite3.register_adapter(JsonValue, _adapt_json)
+sqlite3.register_adapter(ListValue, _adapt_list)
+
+# the deprecated sqlite3 defaults are replaced with the same ISO text, adapters set by the application are kept
+if _is_default(sqlite3.adapters.get((datetime, sqlite3.PrepareProtocol), None)) is True:
+    sqlite3.register_adapter(datetime, _adapt_datetime)
+
+if _is_default(sqlite3.converters.get("TIMESTAMP", None)) is True:
+    sqlite3.register_converter("timestamp", _convert_datetime)
+
+
+def _decode_json(value: Any) -> Any:
+    if isinstance(value, (str, bytes)) is False:
+        return value
+
+    if len(value) == 0:
+        return JsonValue()
+
+    try:
+        _value = json.loads(value)
+    except ValueError:
+        return value
+
+    # only objects have a wrapper that sqlite3 can store again, other JSON is kept as text
+    if isinstance(_value, dict) is False:
+        return value
+    return JsonValue(_value)
+
+
+def _decode_list(value: Any) -> Any:
+    if isinstance(value, bytes) is False:
+        return value
+
+    if len(value) == 0:
+        return ListValue()
+
+    # only JSON arrays are written by ListValue, other bytes are returned as they are
+    if value[:1] != b"[":
+        return value
+
+    try:
+        _value = json.loads(value)
+    except ValueError:
+        return value
+
+    if isinstance(_value, list) is False:
+        return value
+    return ListValue(_value)
+
+
+_decoders = {
+    Types.json: "_decode_json({0:s})",
+    Types.list: "_decode_list({0:s})",
+    Types.bool: "({0:s} == 1)"
+}
+
+
+def create_row_decoder(row_type: type, types: List[Types]) -> Callable[[Tuple], Row]:
+    _values = []
+    _number = 0
+
+    for _type in types:
+        _value = "data[{0:d}]".format(_number)
+
+        try:
+            _value = _decoders[_type].format(_value)
+        except KeyError:
+            pass
+
+        _values.append(_value)
+        _number += 1
+
+    _source = "def decode(data):\n    return row_type({0:s})\n".format(", ".join(_values))
+    _namespace = {
+        "row_type": row_type,
+        "_decode_json": _decode_json,
+        "_decode_list": _decode_list
+    }
+    exec(_source, _namespace)
+    return _namespace["decode"]
+
+
 @dataclass
 class Column(object):
 
     name: str = ""
     primarykey: bool = False
     unique: bool = False
+    indexed: bool = False
     type: Types = Types.none
 
     @property
@@ -92,3 +287,34 @@ class Column(object):
 
         _ret = '"{0:s}" {1:s}'.format(self.name, _datatype.type)
         return _ret
+
+
+@dataclass
+class Index(object):
+
+    name: str = ""
+    columns: List[str] = field(default_factory=list)
+    unique: bool = False
+
+    def create(self, table_name: str) -> str:
+        _columns = []
+        for _name in self.columns:
+            _columns.append('"{0:s}"'.format(_name))
+
+        _unique = ""
+        if self.unique is True:
+            _unique = "UNIQUE "
+
+        _ret = 'CREATE {0:s}INDEX IF NOT EXISTS "{1:s}" ON "{2:s}" ({3:s})'.format(_unique,
+                                                                                  self.name,
+                                                                                  table_name,
+                                                                                  ", ".join(_columns))
+        return _ret
+
+    def match(self, index) -> bool:
+        if self.unique != index.unique:
+            return False
+
+        if self.columns != index.columns:
+            return False
+        return True
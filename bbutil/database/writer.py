@@ -0,0 +1,192 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import threading
+import time
+
+from dataclasses import dataclass, field
+from typing import Optional, List, Callable
+
+import bbutil
+
+from bbutil.database.types import Row
+from bbutil.database.sqlite import SQLite
+
+__all__ = [
+    "WriteBehind"
+]
+
+
+@dataclass
+class WriteBehind(object):
+
+    table_name: str = ""
+    names: List[str] = field(default_factory=list)
+    sqlite: Optional[SQLite] = None
+    flush_size: int = 1000
+    flush_delay: float = 1.0
+    max_pending: int = 10000
+    on_write: Optional[Callable[[], None]] = None
+    stored: int = 0
+    dropped: int = 0
+    failed: int = 0
+    batches: int = 0
+    _queue: List[Row] = field(default_factory=list)
+    _busy: int = 0
+    _since: float = 0.0
+    _flush: bool = False
+    _running: bool = False
+    _condition: Optional[threading.Condition] = None
+    _thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue) + self._busy
+
+    def start(self) -> bool:
+        if self._running is True:
+            return True
+
+        if self.sqlite is None:
+            bbutil.log.error("No database for write-behind: {0:s}".format(self.table_name))
+            return False
+
+        if self.flush_size <= 0:
+            bbutil.log.error("Invalid flush size: {0:d}".format(self.flush_size))
+            return False
+
+        self._condition = threading.Condition()
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, name="bbutil-writer-{0:s}".format(self.table_name),
+                                        daemon=True)
+        self._thread.start()
+        return True
+
+    def add(self, item: Row) -> bool:
+        if self._condition is None:
+            bbutil.log.error("Write-behind for {0:s} is not running!".format(self.table_name))
+            return False
+
+        with self._condition:
+            if self._running is False:
+                bbutil.log.error("Write-behind for {0:s} is not running!".format(self.table_name))
+                return False
+
+            while len(self._queue) >= self.max_pending:
+                self._condition.notify_all()
+                self._condition.wait()
+
+            _count = len(self._queue)
+            if _count == 0:
+                self._since = time.monotonic()
+
+            self._queue.append(item)
+
+            # wake the flusher to start the delay timer or to write a full batch
+            if (_count == 0) or ((_count + 1) >= self.flush_size):
+                self._condition.notify_all()
+        return True
+
+    def _take(self) -> Optional[List[Row]]:
+        with self._condition:
+            while True:
+                _count = len(self._queue)
+
+                if _count == 0:
+                    self._flush = False
+                    if self._running is False:
+                        return None
+                    self._condition.wait()
+                    continue
+
+                if (_count >= self.flush_size) or (self._flush is True) or (self._running is False):
+                    break
+
+                _timeout = self._since + self.flush_delay - time.monotonic()
+                if _timeout <= 0:
+                    break
+
+                self._condition.wait(_timeout)
+
+            _batch = self._queue[:self.flush_size]
+            del self._queue[:self.flush_size]
+
+            self._busy = len(_batch)
+            self._since = time.monotonic()
+            self._condition.notify_all()
+        return _batch
+
+    def _run(self):
+        while True:
+            _batch = self._take()
+            if _batch is None:
+                return
+
+            _count = self.sqlite.insert(self.table_name, self.names, _batch, bulk=True)
+
+            if (_count > 0) and (self.on_write is not None):
+                self.on_write()
+
+            with self._condition:
+                if _count == -1:
+                    self.failed += len(_batch)
+                    bbutil.log.error("Unable to write {0:d} rows to {1:s}!".format(len(_batch), self.table_name))
+                else:
+                    self.stored += _count
+                    self.dropped += len(_batch) - _count
+
+                self.batches += 1
+                self._busy = 0
+                self._condition.notify_all()
+
+    def flush(self) -> bool:
+        if self._condition is None:
+            return True
+
+        with self._condition:
+            _failed = self.failed
+            self._flush = True
+            self._condition.notify_all()
+
+            while (self.pending > 0) and (self._thread.is_alive() is True):
+                self._condition.wait()
+
+            _check = (self.failed == _failed) and (self.pending == 0)
+        return _check
+
+    def close(self) -> bool:
+        if self._running is False:
+            return True
+
+        _check = self.flush()
+
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+
+        self._thread.join()
+        self._thread = None
+
+        if (self.stored > 0) or (self.dropped > 0):
+            bbutil.log.inform(self.table_name, "Stored {0:d}, dropped {1:d}".format(self.stored, self.dropped))
+        return _check
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import time
+
+import bbutil
+from bbutil.logging import Logging
+from bbutil.database import SQLite, Table, Types
+
+__all__ = [
+    "concurrency",
+    "decode",
+    "insert",
+    "memory",
+    "suite",
+    "transfer",
+
+    "set_log",
+    "get_sqlite",
+    "get_table",
+    "fill_table",
+    "measure"
+]
+
+
+def set_log():
+    if bbutil.log is not None:
+        return
+
+    _log = Logging()
+    _log.setup(app="Bench", level=0, index={0: ["INFORM", "WARN", "ERROR", "EXCEPTION"]})
+
+    console = _log.get_writer("console")
+    _log.register(console)
+    _log.open()
+
+    bbutil.set_log(_log)
+    return
+
+
+def get_sqlite(filename: str, **kwargs) -> SQLite:
+    if os.path.exists(filename) is True:
+        os.remove(filename)
+
+    _sqlite = SQLite(filename=filename, name="Bench", **kwargs)
+    _sqlite.prepare()
+    return _sqlite
+
+
+def get_table(name: str, sqlite_object: SQLite) -> Table:
+    _table = Table(name=name, sqlite=sqlite_object, suppress_warnings=True)
+    _table.add_column(name="testid", data_type=Types.integer, unique=True, keyword=True)
+    _table.add_column(name="use_test", data_type=Types.bool)
+    _table.add_column(name="testname", data_type=Types.string)
+    _table.add_column(name="path", data_type=Types.string)
+    _table.add_column(name="value", data_type=Types.float)
+    return _table
+
+
+def fill_table(table: Table, count: int):
+    _width = len(str(count))
+
+    for _number in range(0, count):
+        _data = table.new_data()
+        _data.testid = _number
+        _data.use_test = (_number % 2) == 0
+        _data.testname = "Test{0:s}".format(str(_number).rjust(_width, "0"))
+        _data.path = "/blo/bka/{0:s}".format(_data.testname)
+        _data.value = _number * 0.5
+        table.add(_data)
+    return
+
+
+def measure(function, *args, **kwargs) -> tuple:
+    _start = time.perf_counter()
+    _result = function(*args, **kwargs)
+    _duration = time.perf_counter() - _start
+    return _result, _duration
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import sys
+import threading
+import time
+
+from bbutil.database import Table
+
+from benchmarks import set_log, get_sqlite, get_table, fill_table
+
+__all__ = [
+    "run"
+]
+
+_readers = [1, 2, 4, 8]
+_rows = 10000
+_duration = 2.0
+
+
+def _reader(table: Table, stop: threading.Event, counter: list):
+    _count = 0
+    _number = 0
+
+    while stop.is_set() is False:
+        table.sqlite.select(table.name, [], "testid = ?", [_number % _rows])
+        _number += 7
+        _count += 1
+
+    counter.append(_count)
+    return
+
+
+def _writer(table: Table, stop: threading.Event, counter: list):
+    _count = 0
+    _number = _rows
+
+    while stop.is_set() is False:
+        _data = table.new_data()
+        _data.testid = _number
+        _data.testname = "Test{0:d}".format(_number)
+        table.sqlite.insert(table.name, table.names, _data)
+        _number += 1
+        _count += 1
+
+    counter.append(_count)
+    return
+
+
+def _run_stress(filename: str, readers: int, use_threads: bool) -> tuple:
+    _sqlite = get_sqlite(filename, use_threads=use_threads)
+    _table = get_table("bench01", _sqlite)
+    _table.init()
+
+    fill_table(_table, _rows)
+    _table.store(bulk=True)
+    _table.clear()
+
+    _stop = threading.Event()
+    _reads = []
+    _writes = []
+
+    _threads = [threading.Thread(target=_writer, args=(_table, _stop, _writes))]
+    for _index in range(0, readers):
+        _threads.append(threading.Thread(target=_reader, args=(_table, _stop, _reads)))
+
+    for _thread in _threads:
+        _thread.start()
+
+    time.sleep(_duration)
+    _stop.set()
+
+    for _thread in _threads:
+        _thread.join()
+
+    _sqlite.close()
+
+    for _suffix in ["", "-wal", "-shm"]:
+        if os.path.exists(filename + _suffix) is True:
+            os.remove(filename + _suffix)
+
+    return sum(_reads) / _duration, sum(_writes) / _duration
+
+
+def run(readers: list = None):
+    if readers is None:
+        readers = _readers
+
+    set_log()
+
+    _filename = os.path.abspath("bench_concurrency.sqlite")
+
+    for _count in readers:
+        _locked_reads, _locked_writes = _run_stress(_filename, _count, False)
+        _reads, _writes = _run_stress(_filename, _count, True)
+
+        print("{0:>3d} readers: locked {1:9.0f} reads/s {2:7.0f} writes/s, "
+              "threads {3:9.0f} reads/s {4:7.0f} writes/s".format(_count,
+                                                                  _locked_reads,
+                                                                  _locked_writes,
+                                                                  _reads,
+                                                                  _writes))
+    return
+
+
+if __name__ == '__main__':
+    _args = [int(_arg) for _arg in sys.argv[1:]]
+    if len(_args) == 0:
+        _args = None
+    run(_args)
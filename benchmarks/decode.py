@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+import os
+import sys
+
+from typing import List, Tuple
+
+from bbutil.database import Table, Types
+
+from benchmarks import set_log, get_sqlite, get_table, fill_table, measure
+
+__all__ = [
+    "run"
+]
+
+_sizes = [10000, 100000, 1000000]
+
+
+def _decode_cells(table: Table, data_list: List[Tuple]) -> list:
+    # per-cell conversion as done before the generated row decoder
+    _row_type = table.row_type
+    _result = []
+
+    for _data in data_list:
+        _values = []
+        _number = 0
+
+        for _col in table.columns:
+            _value = _data[_number]
+
+            if _col.type is Types.bool:
+                if _value == 1:
+                    _value = True
+                else:
+                    _value = False
+
+            _values.append(_value)
+            _number += 1
+
+        _result.append(_row_type(*_values))
+    return _result
+
+
+def _run_decode(filename: str, count: int) -> tuple:
+    _sqlite = get_sqlite(filename)
+    _table = get_table("bench01", _sqlite)
+    _table.init()
+
+    fill_table(_table, count)
+    _table.store(bulk=True)
+    _table.clear()
+
+    _data_list = _sqlite.select(_table.name, [], "", [])
+
+    _rows, _cells = measure(_decode_cells, _table, _data_list)
+    _rows, _decoder = measure(_table._process_datalist, _data_list, False)
+    if len(_rows) != count:
+        print("Decoded {0:d} of {1:d}!".format(len(_rows), count))
+
+    _sqlite.close()
+    os.remove(filename)
+    return count / _cells, count / _decoder
+
+
+def run(sizes: list = None):
+    if sizes is None:
+        sizes = _sizes
+
+    set_log()
+
+    _filename = os.path.abspath("bench_decode.sqlite")
+
+    for _count in sizes:
+        _cells, _decoder = _run_decode(_filename, _count)
+
+        print("{0:>8d} rows: per cell {1:10.0f} rows/s, decoder {2:10.0f} rows/s, {3:6.1f}x".format(_count,
+                                                                                                _cells,
+                                                                                                _decoder,
+                                                                                                _decoder / _cells))
+    return
+
+
+if __name__ == '__main__':
+    _args = [int(_arg) for _arg in sys.argv[1:]]
+    if len(_args) == 0:
+        _args = None
+    run(_args)
@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import sys
+
+from benchmarks import set_log, get_sqlite, get_table, fill_table, measure
+
+__all__ = [
+    "run"
+]
+
+_sizes = [10000, 100000, 1000000]
+
+
+def _run_insert(filename: str, count: int, bulk: bool) -> float:
+    _sqlite = get_sqlite(filename)
+    _table = get_table("bench01", _sqlite)
+    _table.init()
+
+    fill_table(_table, count)
+
+    _stored, _duration = measure(_table.store, bulk=bulk)
+    if _stored != count:
+        print("Stored {0:d} of {1:d}!".format(_stored, count))
+
+    _sqlite.close()
+    os.remove(filename)
+    return _duration
+
+
+def run(sizes: list = None):
+    if sizes is None:
+        sizes = _sizes
+
+    set_log()
+
+    _filename = os.path.abspath("bench_insert.sqlite")
+
+    for _count in sizes:
+        _chunked = _run_insert(_filename, _count, False)
+        _bulk = _run_insert(_filename, _count, True)
+
+        print("{0:>8d} rows: chunked {1:8.3f}s, bulk {2:8.3f}s, {3:6.1f}x".format(_count,
+                                                                                  _chunked,
+                                                                                  _bulk,
+                                                                                  _chunked / _bulk))
+    return
+
+
+if __name__ == '__main__':
+    _args = [int(_arg) for _arg in sys.argv[1:]]
+    if len(_args) == 0:
+        _args = None
+    run(_args)
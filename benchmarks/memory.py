@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import sys
+import tracemalloc
+
+from bbutil.database import Data, SQLite
+
+from benchmarks import set_log, get_table
+
+__all__ = [
+    "run"
+]
+
+_sizes = [100000, 1000000]
+
+
+def _measure(function, count: int) -> int:
+    tracemalloc.start()
+
+    _items = function(count)
+
+    _current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del _items
+    return _current
+
+
+def _values(number: int) -> list:
+    _values = [
+        number,
+        (number % 2) == 0,
+        "Test{0:d}".format(number),
+        "/blo/bka/Test{0:d}".format(number),
+        number * 0.5
+    ]
+    return _values
+
+
+def run(sizes: list = None):
+    if sizes is None:
+        sizes = _sizes
+
+    set_log()
+
+    _table = get_table("bench01", SQLite(name="Bench", use_memory=True))
+    _keys = [_column.name for _column in _table.columns]
+    _row_type = _table.row_type
+
+    def _create_data(count: int) -> list:
+        return [Data(_keys, _values(_number)) for _number in range(0, count)]
+
+    def _create_row(count: int) -> list:
+        return [_row_type(*_values(_number)) for _number in range(0, count)]
+
+    for _count in sizes:
+        _data = _measure(_create_data, _count)
+        _row = _measure(_create_row, _count)
+
+        print("{0:>8d} rows: Data {1:8.1f} MiB, {2:s} {3:8.1f} MiB, {4:5.1f}% saved".format(_count,
+                                                                                      _data / 1048576,
+                                                                                      _row_type.__name__,
+                                                                                      _row / 1048576,
+                                                                                      100.0 - (_row * 100.0 / _data)))
+    return
+
+
+if __name__ == '__main__':
+    _args = [int(_arg) for _arg in sys.argv[1:]]
+    if len(_args) == 0:
+        _args = None
+    run(_args)
@@ -0,0 +1,356 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import sys
+
+from dataclasses import dataclass
+from typing import Optional, List, Tuple
+
+from bbutil.database import Database, Table
+
+from benchmarks import set_log, get_sqlite, get_table, fill_table, measure
+
+__all__ = [
+    "run",
+    "compare"
+]
+
+_sizes = [1000, 10000, 100000]
+_single_limit = 1000
+_database_tables = 4
+_schema_tables = 20
+
+
+@dataclass
+class _BenchData(Database):
+
+    count: int = 0
+
+    def init(self):
+        self.name = "Bench"
+        return
+
+    def prepare(self, **kwargs) -> bool:
+        for _number in range(0, self.count):
+            self.tables.append(get_table("bench{0:02d}".format(_number), self.sqlite))
+        return True
+
+    def clear_data(self):
+        return
+
+
+def _remove(filename: str):
+    for _suffix in ["", "-wal", "-shm"]:
+        if os.path.exists(filename + _suffix) is True:
+            os.remove(filename + _suffix)
+    return
+
+
+def _get_filled(filename: str, count: int) -> Table:
+    _sqlite = get_sqlite(filename)
+    _table = get_table("bench01", _sqlite)
+    _table.init()
+
+    fill_table(_table, count)
+    return _table
+
+
+def _get_stored(filename: str, count: int) -> Table:
+    _table = _get_filled(filename, count)
+    _table.store(bulk=True)
+    _table.clear()
+    return _table
+
+
+def _close(table: Table, filename: str):
+    table.sqlite.close()
+    _remove(filename)
+    return
+
+
+def _insert_single(filename: str, count: int) -> Tuple[int, float]:
+    _count = min(count, _single_limit)
+    _table = _get_filled(filename, _count)
+
+    def _insert():
+        for _data in _table.data:
+            _table.sqlite.insert(_table.name, _table.names, _data)
+        return
+
+    _result, _duration = measure(_insert)
+    _close(_table, filename)
+    return _count, _duration
+
+
+def _insert_list(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_filled(filename, count)
+    _count, _duration = measure(_table.store)
+    _close(_table, filename)
+    return _count, _duration
+
+
+def _insert_bulk(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_filled(filename, count)
+    _count, _duration = measure(_table.store, bulk=True)
+    _close(_table, filename)
+    return _count, _duration
+
+
+def _select_full(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_stored(filename, count)
+    _rows, _duration = measure(_table.select, verbose=False)
+    _close(_table, filename)
+    return len(_rows), _duration
+
+
+def _select_filtered(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_stored(filename, count)
+    _rows, _duration = measure(_table.select, sql_filter="testid < ?", data_values=[count // 2], verbose=False)
+    _close(_table, filename)
+    return len(_rows), _duration
+
+
+def _select_stream(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_stored(filename, count)
+
+    def _stream() -> int:
+        _count = 0
+        for _row in _table.iter_select(batch_size=1000):
+            _count += 1
+        return _count
+
+    _count, _duration = measure(_stream)
+    _close(_table, filename)
+    return _count, _duration
+
+
+def _update(filename: str, count: int) -> Tuple[int, float]:
+    _table = _get_stored(filename, count)
+
+    _rows = _table.select(verbose=False)
+    for _row in _rows:
+        _row.testname = "Update{0:d}".format(_row.testid)
+
+    _count, _duration = measure(_table.update_many, _rows, "testid")
+    _close(_table, filename)
+    return _count, _duration
+
+
+def _get_database(filename: str, tables: int) -> _BenchData:
+    _database = _BenchData(filename=filename, count=tables)
+    _database.start()
+    return _database
+
+
+def _database_store(filename: str, count: int) -> Tuple[int, float]:
+    _remove(filename)
+    _database = _get_database(filename, _database_tables)
+
+    for _table in _database.tables:
+        fill_table(_table, count // _database_tables)
+
+    _count, _duration = measure(_database.store)
+    _database.sqlite.close()
+    _remove(filename)
+    return _count, _duration
+
+
+def _database_load(filename: str, count: int) -> Tuple[int, float]:
+    _remove(filename)
+    _database = _get_database(filename, _database_tables)
+
+    for _table in _database.tables:
+        fill_table(_table, count // _database_tables)
+
+    _database.store()
+    _database.clear()
+
+    _count, _duration = measure(_database.load)
+    _database.sqlite.close()
+    _remove(filename)
+    return _count, _duration
+
+
+def _schema_init(filename: str, count: int) -> Tuple[int, float]:
+    _remove(filename)
+    _database = _get_database(filename, _schema_tables)
+    _database.sqlite.close()
+
+    # start on an existing file, as every application start does
+    _database = _BenchData(filename=filename, count=_schema_tables)
+    _check, _duration = measure(_database.start)
+    _database.sqlite.close()
+    _remove(filename)
+    return _schema_tables, _duration
+
+
+# cases that do not depend on the table size run once, with size 0
+_cases = {
+    "insert_single": (_insert_single, True),
+    "insert_list": (_insert_list, True),
+    "insert_bulk": (_insert_bulk, True),
+    "select_full": (_select_full, True),
+    "select_filtered": (_select_filtered, True),
+    "select_stream": (_select_stream, True),
+    "update": (_update, True),
+    "database_store": (_database_store, True),
+    "database_load": (_database_load, True),
+    "schema_init": (_schema_init, False)
+}
+
+
+def _run_case(filename: str, name: str, size: int, repeat: int) -> dict:
+    _function = _cases[name][0]
+
+    _best = None
+    _rows = 0
+
+    # the fastest run is the one least disturbed by the rest of the system
+    for _number in range(0, repeat):
+        _rows, _duration = _function(filename, size)
+        if (_best is None) or (_duration < _best):
+            _best = _duration
+
+    _result = {
+        "case": name,
+        "size": size,
+        "rows": _rows,
+        "seconds": _best,
+        "rows_per_second": _rows / max(_best, 1e-9)
+    }
+    return _result
+
+
+def run(sizes: List[int] = None, cases: List[str] = None, repeat: int = 3) -> dict:
+    if sizes is None:
+        sizes = _sizes
+
+    if cases is None:
+        cases = list(_cases.keys())
+
+    set_log()
+
+    _filename = os.path.abspath("bench_suite.sqlite")
+    _results = []
+
+    for _name in cases:
+        _sized = _cases[_name][1]
+
+        _case_sizes = sizes
+        if _sized is False:
+            _case_sizes = [0]
+
+        for _size in _case_sizes:
+            _result = _run_case(_filename, _name, _size, repeat)
+            _results.append(_result)
+
+            print("{0:<16s} {1:>8d} rows: {2:8.4f}s {3:12.0f} rows/s".format(_name,
+                                                                             _result["rows"],
+                                                                             _result["seconds"],
+                                                                             _result["rows_per_second"]))
+
+    _report = {
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": _results
+    }
+    return _report
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.1) -> List[dict]:
+    _baseline = {}
+    for _item in baseline.get("results", []):
+        _baseline[(_item["case"], _item["size"])] = _item
+
+    _changes = []
+
+    for _item in report["results"]:
+        _base: Optional[dict] = _baseline.get((_item["case"], _item["size"]), None)
+        if (_base is None) or (_base["rows_per_second"] <= 0):
+            continue
+
+        _ratio = _item["rows_per_second"] / _base["rows_per_second"]
+
+        _status = "ok"
+        if _ratio < (1.0 - threshold):
+            _status = "regression"
+        if _ratio > (1.0 + threshold):
+            _status = "improvement"
+
+        _changes.append({
+            "case": _item["case"],
+            "size": _item["size"],
+            "baseline": _base["rows_per_second"],
+            "current": _item["rows_per_second"],
+            "ratio": _ratio,
+            "status": _status
+        })
+    return _changes
+
+
+def _print_changes(changes: List[dict]):
+    for _change in changes:
+        print("{0:<16s} {1:>8d}: {2:12.0f} -> {3:12.0f} rows/s {4:6.2f}x {5:s}".format(_change["case"],
+                                                                                      _change["size"],
+                                                                                      _change["baseline"],
+                                                                                      _change["current"],
+                                                                                      _change["ratio"],
+                                                                                      _change["status"]))
+    return
+
+
+def main(args: List[str] = None) -> int:
+    _parser = argparse.ArgumentParser(prog="benchmarks.suite", description="bbutil.database benchmark suite")
+    _parser.add_argument("--sizes", type=int, nargs="+", default=_sizes, help="table sizes in rows")
+    _parser.add_argument("--cases", nargs="+", choices=list(_cases.keys()), default=None, help="cases to run")
+    _parser.add_argument("--repeat", type=int, default=3, help="runs per case, the fastest one is kept")
+    _parser.add_argument("--output", default="", help="write the results as JSON")
+    _parser.add_argument("--baseline", default="", help="compare against a stored JSON result")
+    _parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported as regression")
+
+    _args = _parser.parse_args(args)
+
+    _report = run(_args.sizes, _args.cases, _args.repeat)
+
+    if _args.output != "":
+        with open(_args.output, "w") as _file:
+            json.dump(_report, _file, indent=4)
+
+    if _args.baseline == "":
+        return 0
+
+    with open(_args.baseline, "r") as _file:
+        _baseline = json.load(_file)
+
+    _changes = compare(_report, _baseline, _args.threshold)
+    _print_changes(_changes)
+
+    for _change in _changes:
+        if _change["status"] == "regression":
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
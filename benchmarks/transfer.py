@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+import os
+import sys
+
+from benchmarks import set_log, get_sqlite, get_table, fill_table, measure
+
+__all__ = [
+    "run"
+]
+
+_sizes = [10000, 100000, 1000000]
+_formats = ["csv", "jsonl", "bbc"]
+
+
+def _run_transfer(filename: str, count: int) -> list:
+    _sqlite = get_sqlite(filename)
+    _table = get_table("bench01", _sqlite)
+    _table.init()
+
+    fill_table(_table, count)
+    _table.store(bulk=True)
+    _table.clear()
+
+    _target = get_sqlite(filename + ".import")
+    _imported = get_table("bench01", _target)
+    _imported.init()
+
+    _result = []
+
+    for _format in _formats:
+        _exportfile = "{0:s}.{1:s}".format(filename, _format)
+
+        _exported, _export = measure(_table.export_file, _exportfile)
+        _stored, _import = measure(_imported.import_file, _exportfile)
+        if _stored != count:
+            print("Imported {0:d} of {1:d}!".format(_stored, count))
+
+        _result.append((_export, _import, os.path.getsize(_exportfile)))
+
+        os.remove(_exportfile)
+        _target.close()
+        os.remove(_target.filename)
+        _imported.init()
+
+    _target.close()
+    os.remove(_target.filename)
+    _sqlite.close()
+    os.remove(filename)
+    return _result
+
+
+def run(sizes: list = None):
+    if sizes is None:
+        sizes = _sizes
+
+    set_log()
+
+    _filename = os.path.abspath("bench_transfer.sqlite")
+
+    for _count in sizes:
+        _results = _run_transfer(_filename, _count)
+
+        for _format, (_export, _import, _size) in zip(_formats, _results):
+            print("{0:>8d} rows {1:>5s}: export {2:8.3f}s, import {3:8.3f}s, "
+                  "{4:10.0f} rows/s, {5:10d} bytes".format(_count, _format, _export, _import,
+                                                           _count / _import, _size))
+    return
+
+
+if __name__ == '__main__':
+    _args = [int(_arg) for _arg in sys.argv[1:]]
+    if len(_args) == 0:
+        _args = None
+    run(_args)
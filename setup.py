@@ -22,7 +22,7 @@ import bbutil
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
-packages = find_packages(where=".", exclude=["tests", "tests.logging", "tests.lang"])
+packages = find_packages(where=".", exclude=["tests", "tests.logging", "tests.lang", "benchmarks"])
 
 setup(
     name=bbutil.__name__,
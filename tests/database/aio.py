@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import asyncio
+import os
+import unittest
+
+from bbutil.database.aio import AsyncDatabase, AsyncTable
+
+from tests.helper import set_log
+from tests.helper.database import TestData
+
+__all__ = [
+    "TestAsync"
+]
+
+
+def _get_database() -> AsyncDatabase:
+    _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+    if os.path.exists(_filename) is True:
+        os.remove(_filename)
+
+    _database = AsyncDatabase(database=TestData(filename=_filename), readers=2)
+    return _database
+
+
+def _clean(database: AsyncDatabase):
+    _filename = database.database.filename
+
+    if os.path.exists(_filename) is True:
+        os.remove(_filename)
+    return
+
+
+def _new_data(table: AsyncTable, number: int):
+    _data = table.table.new_data()
+    _data.use_test = (number % 2) == 0
+    _data.testname = "Test{0:d}".format(number)
+    _data.path = "/path/{0:d}".format(number)
+    return _data
+
+
+class TestAsync(unittest.TestCase):
+    """Testing class for locking module."""
+
+    def setUp(self):
+        set_log()
+        return
+
+    def test_store_01(self):
+        async def _test():
+            _database = _get_database()
+
+            _check = await _database.start()
+            self.assertTrue(_check)
+
+            _table = _database.get_table("tester01")
+            _results = await asyncio.gather(*[_table.store(_new_data(_table, _number)) for _number in range(0, 20)])
+
+            self.assertListEqual(_results, [1] * 20)
+            self.assertLess(_table.commits, 20)
+            self.assertEqual(_table.pending, 0)
+            self.assertEqual(await _table.count(), 20)
+
+            _data = await _table.select(sql_filter="testname = ?", data_values=["Test5"])
+            self.assertEqual(len(_data), 1)
+            self.assertEqual(_data[0].path, "/path/5")
+
+            _data[0].path = "/path/new"
+            _check = await _table.update(_data[0], "testid = ?", _data[0].testid)
+            self.assertTrue(_check)
+
+            _data = await _table.select(sql_filter="path = ?", data_values=["/path/new"])
+            self.assertEqual(len(_data), 1)
+
+            _check = await _database.stop()
+            self.assertTrue(_check)
+            _clean(_database)
+            return
+
+        asyncio.run(_test())
+        return
+
+    def test_store_02(self):
+        async def _test():
+            _database = _get_database()
+            _database.batch_size = 5
+
+            _check = await _database.start()
+            self.assertTrue(_check)
+
+            _table = _database.get_table("tester01")
+            for _number in range(0, 12):
+                _table.table.add(_new_data(_table, _number))
+
+            _count = await _database.store()
+            self.assertEqual(_count, 12)
+            self.assertEqual(_table.commits, 1)
+
+            _results = await asyncio.gather(*[_table.store([_new_data(_table, _number)] * 2) for _number in range(0, 5)])
+            self.assertListEqual(_results, [2] * 5)
+            self.assertEqual(_table.commits, 4)
+            self.assertEqual(await _table.count(), 22)
+
+            _check = await _database.stop()
+            self.assertTrue(_check)
+            _clean(_database)
+            return
+
+        asyncio.run(_test())
+        return
+
+    def test_iterate_01(self):
+        async def _test():
+            _database = _get_database()
+
+            _check = await _database.start()
+            self.assertTrue(_check)
+
+            _table = _database.get_table("tester01")
+            await _table.store([_new_data(_table, _number) for _number in range(0, 10)])
+
+            _names = []
+            async for _item in _table.iterate(batch_size=3):
+                _names.append(_item.testname)
+
+                _data = await _table.select(sql_filter="testid = ?", data_values=[_item.testid])
+                self.assertEqual(len(_data), 1)
+
+            self.assertEqual(len(_names), 10)
+            self.assertEqual(_names[0], "Test0")
+            self.assertLessEqual(_table.table.sqlite.manager.thread_count, 3)
+
+            _check = await _database.stop()
+            self.assertTrue(_check)
+            _clean(_database)
+            return
+
+        asyncio.run(_test())
+        return
+
+    def test_start_01(self):
+        async def _test():
+            _database = AsyncDatabase()
+
+            _check = await _database.start()
+            self.assertFalse(_check)
+
+            _database = AsyncDatabase(database=TestData(filename=""))
+
+            _check = await _database.start()
+            self.assertFalse(_check)
+            self.assertIsNone(_database.get_table("tester01"))
+            return
+
+        asyncio.run(_test())
+        return
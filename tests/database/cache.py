@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+from bbutil.database.cache import ResultCache
+
+from tests.helper import set_log
+
+__all__ = [
+    "TestResultCache"
+]
+
+
+class TestResultCache(unittest.TestCase):
+    """Testing class for locking module."""
+
+    def setUp(self):
+        set_log()
+        return
+
+    def test_cache_01(self):
+        _cache = ResultCache(name="Test", max_rows=5)
+
+        _check = _cache.put("a", [1, 2])
+        self.assertTrue(_check)
+
+        _check = _cache.put("b", [3, 4])
+        self.assertTrue(_check)
+
+        _result = _cache.get("a")
+        self.assertListEqual(_result, [1, 2])
+
+        _result.append(10)
+        self.assertListEqual(_cache.get("a"), [1, 2])
+
+        _check = _cache.put("c", [5, 6])
+        self.assertTrue(_check)
+        self.assertEqual(_cache.evictions, 1)
+        self.assertEqual(_cache.rows, 4)
+        self.assertIsNone(_cache.get("b"))
+        self.assertListEqual(_cache.get("c"), [5, 6])
+
+        self.assertEqual(_cache.hits, 3)
+        self.assertEqual(_cache.misses, 1)
+        return
+
+    def test_cache_02(self):
+        _cache = ResultCache(name="Test", max_rows=5)
+
+        _check = _cache.put("a", [1, 2, 3, 4, 5, 6])
+        self.assertFalse(_check)
+        self.assertEqual(_cache.count, 0)
+
+        _cache.put("a", [1, 2])
+        _cache.put("a", [1, 2, 3])
+        self.assertEqual(_cache.rows, 3)
+        self.assertEqual(_cache.count, 1)
+
+        _cache.put("b", [])
+        self.assertListEqual(_cache.get("b"), [])
+        return
+
+    def test_cache_03(self):
+        _cache = ResultCache(name="Test", max_rows=5)
+        _cache.put("a", [1, 2])
+        _cache.get("a")
+
+        _cache.invalidate()
+        _cache.invalidate()
+        self.assertEqual(_cache.invalidations, 1)
+        self.assertEqual(_cache.rows, 0)
+        self.assertIsNone(_cache.get("a"))
+
+        _cache.report()
+
+        _cache.reset()
+        self.assertEqual(_cache.hits, 0)
+        self.assertEqual(_cache.misses, 0)
+        self.assertEqual(_cache.invalidations, 0)
+
+        _cache.report()
+        return
@@ -17,10 +17,11 @@
 #
 
 import os
+import sqlite3
 import unittest
 import unittest.mock as mock
 
-from bbutil.database import Database
+from bbutil.database import Database, Table
 
 from tests.helper import set_log
 from tests.helper.database import TestData
@@ -129,6 +130,63 @@ class TestDatabase(unittest.TestCase):
         self.assertIsNone(_table2)
         return
 
+    def test_get_table_02(self):
+        _filename = "{0:s}/testdata/database/test_database.sqlite".format(os.getcwd())
+        _database = TestData(filename=_filename)
+
+        _check1 = _database.start()
+        self.assertTrue(_check1)
+
+        _table1 = _database.get_table("tester02")
+        self.assertIs(_table1, _database.table02)
+
+        _table = Table(name="tester03", sqlite=_database.sqlite)
+        _database.tables.append(_table)
+
+        _table2 = _database.get_table("tester03")
+        self.assertIs(_table2, _table)
+
+        _database.table02.name = "tester02X"
+        self.assertIsNone(_database.get_table("tester02"))
+        self.assertIs(_database.get_table("tester02X"), _database.table02)
+        return
+
+    def test_lazy_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename, lazy=True)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+
+        _data = _database.table01.new_data()
+        _data.testname = "01"
+        _database.table01.store(_data)
+
+        _count = _database.load()
+        self.assertEqual(_count, 0)
+        self.assertFalse(_database.table01.loaded)
+
+        _table = _database.get_table("tester01")
+        self.assertTrue(_table.loaded)
+        self.assertEqual(_table.data_count, 1)
+        self.assertFalse(_database.table02.loaded)
+
+        _data = _table.new_data()
+        _data.testname = "02"
+        _table.store(_data)
+
+        _count = _database.refresh()
+        self.assertEqual(_count, 1)
+        self.assertEqual(_table.data_count, 2)
+        self.assertFalse(_database.table02.loaded)
+
+        self._clean(_database)
+        return
+
     def test_store_01(self):
         _filename = "{0:s}/test.sqlite".format(os.getcwd())
 
@@ -168,6 +226,176 @@ class TestDatabase(unittest.TestCase):
         self._clean(_database)
         return
 
+    def test_parallel_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename, parallel=True, workers=2)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+        self.assertTrue(_database.sqlite.use_threads)
+
+        for _number in range(0, 10):
+            _data = _database.table01.new_data()
+            _data.testname = "{0:d}".format(_number)
+            _database.table01.add(_data)
+
+        _data = _database.table02.new_data()
+        _data.category = "01"
+        _data.testname = "01"
+        _database.table02.add(_data)
+
+        _count = _database.store()
+        self.assertEqual(_count, 11)
+
+        _database.clear()
+
+        _count = _database.load()
+        self.assertEqual(_count, 11)
+        self.assertEqual(_database.table01.data_count, 10)
+        self.assertEqual(_database.table02.data_count, 1)
+        self.assertTrue(_database.table01.loaded)
+
+        _database.sqlite.close()
+        self._clean(_database)
+        return
+
+    def test_parallel_02(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename, parallel=True)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+
+        _count = _database.store()
+        self.assertEqual(_count, 0)
+
+        _database.sqlite.use_threads = False
+
+        _count = _database.load()
+        self.assertEqual(_count, 0)
+
+        _database.sqlite.close()
+        self._clean(_database)
+        return
+
+    def test_catalog_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename, use_catalog=True)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+        _database.sqlite.close()
+
+        _database = TestData(filename=_filename, use_catalog=True)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+        self.assertTrue(_database.sqlite.use_catalog)
+        self.assertEqual(_database.sqlite.catalog.loads, 1)
+        self.assertIn("tester01", _database.sqlite.catalog.tables)
+        self.assertIn("tester02", _database.sqlite.catalog.tables)
+
+        self._clean(_database)
+        return
+
+    def test_transaction_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+
+        _database.table01.enable_cache()
+
+        with _database.transaction() as _transaction:
+            _data = _database.table01.new_data()
+            _data.testname = "01"
+            self.assertEqual(_database.table01.store(_data), 1)
+
+            _data = _database.table02.new_data()
+            _data.category = "01"
+            _data.testname = "01"
+            self.assertEqual(_database.table02.store(_data), 1)
+
+        self.assertTrue(_transaction.committed)
+        self.assertEqual(_database.table01.check(), 1)
+        self.assertEqual(_database.table02.check(), 1)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with _database.transaction() as _transaction:
+                _data = _database.table01.new_data()
+                _data.testname = "02"
+                _database.table01.store(_data)
+
+                self.assertEqual(len(_database.table01.select(verbose=False)), 2)
+                self.assertEqual(_database.table01.cache.count, 1)
+
+                _database.sqlite.manager.abort()
+
+        self.assertFalse(_transaction.committed)
+        self.assertEqual(_database.table01.cache.count, 0)
+        self.assertEqual(len(_database.table01.select(verbose=False)), 1)
+
+        self._clean(_database)
+        return
+
+    def test_maintenance_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+        _target = "{0:s}/test_backup.sqlite".format(os.getcwd())
+
+        for _file in [_filename, _target]:
+            if os.path.exists(_file) is True:
+                os.remove(_file)
+
+        _database = TestData(filename=_filename)
+
+        _check = _database.start()
+        self.assertTrue(_check)
+
+        _data = _database.table01.new_data()
+        _data.testname = "01"
+        _database.table01.store(_data)
+
+        _result = _database.backup(_target)
+        self.assertTrue(_result.success)
+        self.assertTrue(os.path.exists(_target))
+
+        _check = _database.maintain()
+        self.assertTrue(_check)
+        self.assertListEqual(sorted(_database.maintenance.keys()), ["backup", "optimize"])
+
+        _check = _database.maintain(incremental=False)
+        self.assertTrue(_check)
+        self.assertListEqual(sorted(_database.maintenance.keys()), ["backup", "optimize", "vacuum"])
+
+        _result = _database.analyze()
+        self.assertTrue(_result.success)
+        self.assertIs(_database.maintenance["analyze"], _result)
+
+        with _database.transaction():
+            _check = _database.maintain(incremental=False)
+            self.assertFalse(_check)
+
+        os.remove(_target)
+        self._clean(_database)
+        return
+
     def test_load_01(self):
         _filename = "{0:s}/testdata/database/test_database.sqlite".format(os.getcwd())
         _database = TestData(filename=_filename)
@@ -203,3 +431,34 @@ class TestDatabase(unittest.TestCase):
         self.assertEqual(_database.table01.data_count, 0)
         self.assertEqual(_database.table02.data_count, 0)
         return
+
+    def test_profile_01(self):
+        _filename = "{0:s}/test.sqlite".format(os.getcwd())
+        if os.path.exists(_filename) is True:
+            os.remove(_filename)
+
+        _database = TestData(filename=_filename, profile="read-mostly")
+
+        _check1 = _database.start()
+        self.assertTrue(_check1)
+
+        _profile = _database.sqlite.manager.profile
+        self.assertIsNotNone(_profile)
+        self.assertEqual(_profile.name, "read-mostly")
+
+        _manager = _database.sqlite.manager
+        _manager.connect()
+        c = _manager.cursor()
+        c.execute("PRAGMA journal_mode;")
+        (_mode,) = c.fetchone()
+        _manager.release()
+
+        self.assertEqual(_mode, "wal")
+        self._clean(_database)
+
+        _database = TestData(filename=_filename, profile="read_mostly")
+
+        _check1 = _database.start()
+        self.assertFalse(_check1)
+        self._clean(_database)
+        return
@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+from bbutil.database import SQLite
+from bbutil.database.lookup import HashLookup, SortedLookup
+
+from tests.helper import set_log
+from tests.helper.table import get_table_04
+
+__all__ = [
+    "TestLookup"
+]
+
+
+class TestLookup(unittest.TestCase):
+    """Testing class for locking module."""
+
+    def setUp(self):
+        set_log()
+        return
+
+    @staticmethod
+    def _get_table():
+        _table = get_table_04(SQLite(name="Test", use_memory=True))
+
+        _values = [
+            [1, True, "TestMain", "Test01", "path/a"],
+            [2, True, "TestMain", "Test02", "path/b"],
+            [3, False, "TestSub", "Test03", "path/a"],
+            [4, True, "TestSub", "Test04", None],
+            [5, False, "TestMain", "Test05", "path/c"]
+        ]
+
+        for _value in _values:
+            _data = _table.row_type(*_value)
+            _table.add(_data)
+        return _table
+
+    def test_hash_01(self):
+        _table = self._get_table()
+
+        _lookup = HashLookup(name="category", columns=["category"])
+        for _item in _table.data:
+            _lookup.add(_item)
+
+        _result = _lookup.find("TestMain")
+        self.assertEqual(len(_result), 3)
+
+        _result = _lookup.find("TestXXX")
+        self.assertEqual(len(_result), 0)
+
+        _lookup.clear()
+        _result = _lookup.find("TestMain")
+        self.assertEqual(len(_result), 0)
+        return
+
+    def test_hash_02(self):
+        _table = self._get_table()
+
+        _lookup = HashLookup(name="category_path", columns=["category", "path"])
+        for _item in _table.data:
+            _lookup.add(_item)
+
+        self.assertTrue(_lookup.match(["path", "category"]))
+        self.assertFalse(_lookup.match(["path"]))
+
+        _result = _lookup.find(("TestMain", "path/a"))
+        self.assertEqual(len(_result), 1)
+        self.assertEqual(_result[0].testid, 1)
+        return
+
+    def test_sorted_01(self):
+        _table = self._get_table()
+
+        _lookup = SortedLookup(name="path", columns=["path"])
+        for _item in reversed(_table.data):
+            _lookup.add(_item)
+
+        _result = _lookup.range("path/a", "path/b")
+        self.assertListEqual([_item.testid for _item in _result], [3, 1, 2])
+
+        _result = _lookup.range(low="path/b")
+        self.assertListEqual([_item.testid for _item in _result], [2, 5])
+
+        _result = _lookup.range(high="path/a")
+        self.assertEqual(len(_result), 2)
+
+        _result = _lookup.find("path/c")
+        self.assertEqual(len(_result), 1)
+
+        _result = _lookup.find(None)
+        self.assertEqual(len(_result), 0)
+
+        _result = _lookup.range()
+        self.assertEqual(len(_result), 4)
+
+        _lookup.clear()
+        self.assertEqual(len(_lookup.range()), 0)
+        return
@@ -18,12 +18,14 @@
 
 import sqlite3
 import os
+import threading
 import unittest
 import unittest.mock as mock
 
 from unittest.mock import Mock
 
 from bbutil.database.sqlite.manager import Connection
+from bbutil.database.sqlite.pragma import Profile
 from bbutil.utils import full_path
 
 from tests.helper.sqlite import sqlite_operational_error, mock_operational_error
@@ -330,3 +332,368 @@ class TestSQLiteManager(unittest.TestCase):
         _check = _connection.commit()
         self.assertFalse(_check)
         return
+
+    def test_pool_01(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, use_pool=True)
+
+        self.assertTrue(_connection.use_pool)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        _con = _connection.connection
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+        self.assertIsNone(_connection.connection)
+        self.assertEqual(_connection.pool_count, 1)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        self.assertIs(_connection.connection, _con)
+        self.assertEqual(_connection.pool_count, 0)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.close()
+        self.assertTrue(_check)
+        self.assertEqual(_connection.pool_count, 0)
+        self._clean(_testfile)
+        return
+
+    def test_pool_02(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, use_pool=False)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+        self.assertEqual(_connection.pool_count, 0)
+        self._clean(_testfile)
+        return
+
+    def test_pool_03(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, use_pool=True, pool_timeout=-1.0)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        _con = _connection.connection
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        self.assertIsNot(_connection.connection, _con)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _connection.close()
+        self._clean(_testfile)
+        return
+
+    def test_pool_04(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, use_pool=True)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        c = _connection.cursor()
+        c.execute("CREATE TABLE tester (testid INTEGER);")
+        _connection.commit()
+        c.execute("INSERT INTO tester (testid) VALUES (1);")
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        self.assertFalse(_connection.connection.in_transaction)
+
+        c = _connection.cursor()
+        c.execute("SELECT count(*) FROM tester;")
+        (_count,) = c.fetchone()
+        self.assertEqual(_count, 0)
+
+        _connection.release()
+        _connection.close()
+        self._clean(_testfile)
+        return
+
+    def test_memory_01(self):
+        _connection = Connection()
+        _connection.setup(use_memory=True)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        c = _connection.cursor()
+        c.execute("CREATE TABLE tester (testid INTEGER);")
+        c.execute("INSERT INTO tester (testid) VALUES (1);")
+        _connection.commit()
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        c = _connection.cursor()
+        c.execute("SELECT count(*) FROM tester;")
+        (_count,) = c.fetchone()
+        self.assertEqual(_count, 1)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.close()
+        self.assertTrue(_check)
+        return
+
+    def test_memory_02(self):
+        _connection1 = Connection()
+        _connection1.setup(use_memory=True)
+
+        _connection2 = Connection()
+        _connection2.setup(use_memory=True)
+
+        _connection1.connect()
+        c = _connection1.cursor()
+        c.execute("CREATE TABLE tester (testid INTEGER);")
+        _connection1.commit()
+        _connection1.release()
+
+        _connection2.connect()
+        c = _connection2.cursor()
+        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='tester';")
+        self.assertIsNone(c.fetchone())
+        _connection2.release()
+
+        _connection1.close()
+        _connection2.close()
+        return
+
+    def test_profile_01(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, profile="fast-bulk")
+
+        self.assertIsNotNone(_connection.profile)
+        self.assertEqual(_connection.profile.name, "fast-bulk")
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        c = _connection.cursor()
+        c.execute("PRAGMA journal_mode;")
+        (_mode,) = c.fetchone()
+        c.execute("PRAGMA synchronous;")
+        (_synchronous,) = c.fetchone()
+        c.execute("PRAGMA temp_store;")
+        (_temp_store,) = c.fetchone()
+
+        self.assertEqual(_mode, "wal")
+        self.assertEqual(_synchronous, 0)
+        self.assertEqual(_temp_store, 2)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+        self._clean(_testfile)
+        return
+
+    def test_profile_02(self):
+        _connection = Connection()
+        _check = _connection.setup(use_memory=True, profile="turbo")
+        self.assertFalse(_check)
+
+        _check = _connection.setup(use_memory=True)
+        self.assertTrue(_check)
+
+        _check = _connection.set_profile("turbo")
+        self.assertFalse(_check)
+        self.assertIsNone(_connection.profile)
+
+        _check = _connection.set_profile("durable")
+        self.assertTrue(_check)
+        self.assertEqual(_connection.profile.name, "durable")
+
+        _check = _connection.set_profile("")
+        self.assertTrue(_check)
+        self.assertIsNone(_connection.profile)
+        return
+
+    def test_profile_03(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, profile=Profile(name="broken",
+                                                                                journal_mode="NOPE;XX"))
+
+        _check = _connection.connect()
+        self.assertFalse(_check)
+        self.assertIsNone(_connection.connection)
+        self._clean(_testfile)
+        return
+
+    def test_abort_02(self):
+        _connection = Connection()
+        _connection.setup(use_memory=True)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        _connection.abort()
+        self.assertIsNone(_connection.connection)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+        _connection.close()
+        return
+
+    def test_threads_01(self):
+        _testfile = full_path("{0:s}/test.sqlite".format(os.getcwd()))
+
+        if os.path.exists(_testfile) is True:
+            os.remove(_testfile)
+
+        _connection = Connection()
+        _connection.setup(filename=_testfile, use_memory=False, use_threads=True)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        c = _connection.cursor()
+        c.execute("PRAGMA journal_mode;")
+        (_mode,) = c.fetchone()
+        self.assertEqual(_mode, "wal")
+
+        c.execute("CREATE TABLE tester (testid INTEGER);")
+        c.execute("INSERT INTO tester (testid) VALUES (1);")
+        _connection.commit()
+
+        c.execute("INSERT INTO tester (testid) VALUES (2);")
+
+        _result = []
+
+        def _reader():
+            _check_reader = _connection.connect(write=False)
+            _result.append(_check_reader)
+
+            _c = _connection.cursor()
+            _c.execute("SELECT count(*) FROM tester;")
+            _result.append(_c.fetchone()[0])
+            _connection.release()
+            return
+
+        _thread = threading.Thread(target=_reader)
+        _thread.start()
+        _thread.join(5)
+
+        self.assertListEqual(_result, [True, 1])
+        self.assertEqual(_connection.thread_count, 2)
+
+        _connection.commit()
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+        self.assertIsNone(_connection.connection)
+
+        _check = _connection.close()
+        self.assertTrue(_check)
+        self.assertEqual(_connection.thread_count, 0)
+        self._clean(_testfile)
+        return
+
+    def test_threads_02(self):
+        _connection = Connection()
+        _connection.setup(use_memory=True, use_threads=True)
+
+        _check = _connection.release()
+        self.assertFalse(_check)
+
+        _check = _connection.connect(write=False)
+        self.assertTrue(_check)
+        _con = _connection.connection
+
+        _check = _connection.connect()
+        self.assertFalse(_check)
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+        self.assertIs(_connection.connection, _con)
+
+        _connection.abort()
+        self.assertIsNone(_connection.connection)
+        self.assertEqual(_connection.thread_count, 0)
+
+        _connection.close()
+        return
+
+    def test_threads_03(self):
+        _connection = Connection()
+        _connection.setup(use_memory=True, use_threads=True)
+
+        _check = _connection.connect()
+        self.assertTrue(_check)
+
+        _result = []
+
+        def _writer():
+            _result.append(_connection.connect())
+            _connection.release()
+            return
+
+        _thread = threading.Thread(target=_writer)
+        _thread.start()
+        _thread.join(0.2)
+
+        self.assertTrue(_thread.is_alive())
+        self.assertListEqual(_result, [])
+
+        _check = _connection.release()
+        self.assertTrue(_check)
+
+        _thread.join(5)
+        self.assertListEqual(_result, [True])
+
+        _connection.close()
+        return
@@ -18,10 +18,12 @@
 
 import sqlite3
 import os
+import threading
 import unittest
 import unittest.mock as mock
 
-from bbutil.database import SQLite, Table, Types
+from bbutil.database import SQLite, Table, Types, Index
+from bbutil.database.sqlite.pragma import Profile
 from bbutil.utils import full_path
 
 from tests.helper.sqlite import get_sqlite_operational_error, get_sqlite_integrity_error, get_sqlite_return_false
@@ -1324,6 +1326,29 @@ class TestSQLite(unittest.TestCase):
         self._clean(_sqlite)
         return
 
+    def test_update_08(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+
+        _new = get_data_01()
+        _new.testname = ["Test"]
+
+        _check = _sqlite.update(_table.name, _table.names, _new, "testid = ?", 4)
+        self.assertFalse(_check)
+        self.assertIsNone(_sqlite.manager.connection)
+
+        _batches = list(_sqlite.iter_batches(_table.name, [], "testid = ?", [1, 2]))
+        self.assertListEqual(_batches, [])
+        self.assertIsNone(_sqlite.manager.connection)
+
+        _count = _sqlite.count(_table.name)
+        self.assertGreater(_count, 0)
+
+        self._clean(_sqlite)
+        return
+
     def test_select_01(self):
         _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
         _sqlite.prepare()
@@ -1481,3 +1506,814 @@ class TestSQLite(unittest.TestCase):
 
         self._clean(_sqlite)
         return
+
+    def test_memory_01(self):
+        _sqlite = SQLite(name="Test", use_memory=True)
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+
+        _check = _sqlite.create_table(_table.name, _table.column_list, _table.unique_list)
+        self.assertTrue(_check)
+
+        self._fill_bulk(_table, 500)
+
+        count = _sqlite.insert(_table.name, _table.names, _table.data)
+        self.assertEqual(count, 500)
+
+        data = _sqlite.select(_table.name, _table.names, "", [])
+        self.assertEqual(len(data), 500)
+        self._compare_bulk(data)
+
+        _check = _sqlite.close()
+        self.assertTrue(_check)
+        return
+
+    def test_bulk_insert_09(self):
+        _sqlite = copy_sqlite(filename="test_check_table.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+        _table.name = "tester01"
+
+        self._fill_bulk(_table, 5000)
+
+        count = _sqlite.insert(_table.name, _table.names, _table.data, bulk=True)
+        self.assertEqual(count, 5000)
+
+        data = _sqlite.select(_table.name, _table.names, "", [])
+        self.assertEqual(len(data), 5000)
+
+        count = _sqlite.insert(_table.name, _table.names, _table.data, bulk=True)
+        self.assertEqual(count, 0)
+
+        self._clean(_sqlite)
+        return
+
+    def test_bulk_insert_10(self):
+        _sqlite = copy_sqlite(filename="test_check_table.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+        _table.name = "tester01"
+
+        self._fill_bulk(_table, 10)
+        self._fill_bulk(_table, 1000)
+
+        count = _sqlite.insert(_table.name, _table.names, _table.data, bulk=True, batch_size=300)
+        self.assertEqual(count, 1000)
+
+        count = _sqlite.count(_table.name)
+        self.assertEqual(count, 1000)
+
+        self._clean(_sqlite)
+        return
+
+    def test_bulk_insert_11(self):
+        _sqlite = copy_sqlite(filename="test_check_table.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+        _data = get_data_06()
+
+        count = _sqlite.insert(_table.name, _table.names, _data, bulk=True)
+        self.assertEqual(count, -1)
+
+        count = _sqlite.count(_table.name)
+        self.assertEqual(count, 0)
+
+        self._clean(_sqlite)
+        return
+
+    def test_bulk_insert_12(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+        _table = get_table_01(_sqlite)
+
+        _check = _sqlite.create_table(_table.name, _table.column_list, _table.unique_list)
+        self.assertTrue(_check)
+
+        count = _sqlite.insert(_table.name, _table.names, [], bulk=True)
+        self.assertEqual(count, 0)
+
+        count = _sqlite.insert(_table.name, _table.names, [], bulk=True, batch_size=10)
+        self.assertEqual(count, 0)
+
+        count = _sqlite.count(_table.name)
+        self.assertEqual(count, 0)
+
+        self._clean(_sqlite)
+        return
+
+    def test_statement_01(self):
+        _sqlite = SQLite(name="Test", use_memory=True, statement_cache_size=2)
+
+        _sql1 = _sqlite.statement("insert", "tester01", ["testid", "testname"])
+        _sql2 = _sqlite.statement("insert", "tester01", ["testid", "testname"])
+
+        self.assertEqual(_sql1, 'INSERT INTO "tester01" (testid, testname) VALUES (?, ?);')
+        self.assertIs(_sql1, _sql2)
+        self.assertEqual(_sqlite.statement_hits, 1)
+        self.assertEqual(_sqlite.statement_misses, 1)
+
+        _sql = _sqlite.statement("insert_ignore", "tester01", ["testid"])
+        self.assertEqual(_sql, 'INSERT OR IGNORE INTO "tester01" (testid) VALUES (?);')
+
+        _sql = _sqlite.statement("update", "tester01", ["testid", "testname"], "testid = ?")
+        self.assertEqual(_sql, 'UPDATE "tester01" SET testid = ?, testname = ? WHERE testid = ?;')
+
+        _sql = _sqlite.statement("select", "tester01", [], "testid = ?")
+        self.assertEqual(_sql, "SELECT * FROM tester01 WHERE testid = ?;")
+
+        _sql = _sqlite.statement("count", "tester01", [])
+        self.assertEqual(_sql, "SELECT count(*) FROM tester01;")
+
+        self.assertEqual(_sqlite.statement_misses, 5)
+        self.assertEqual(len(_sqlite._statements), 2)
+
+        _sqlite.clear_statements()
+        self.assertEqual(_sqlite.statement_hits, 0)
+        self.assertEqual(_sqlite.statement_misses, 0)
+        self.assertEqual(len(_sqlite._statements), 0)
+        return
+
+    def test_statement_02(self):
+        _sqlite = copy_sqlite(filename="test_check_table.sqlite", path="testdata/database")
+        _sqlite.cached_statements = 32
+        _sqlite.prepare()
+
+        self.assertEqual(_sqlite.manager.cached_statements, 32)
+
+        _table = get_table_01(_sqlite)
+        _data = get_data_05()
+
+        for _item in _data:
+            count = _sqlite.insert(_table.name, _table.names, _item)
+            self.assertEqual(count, 1)
+
+        self.assertEqual(_sqlite.statement_misses, 1)
+        self.assertEqual(_sqlite.statement_hits, 5)
+
+        self._clean(_sqlite)
+        return
+
+    def test_update_many_01(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+        _data = get_data_05()
+
+        for _item in _data:
+            _item.testname = "{0:s}X".format(_item.testname)
+
+        _data[0].testid = 100
+
+        count = _sqlite.update_many(_table.name, _table.names, _data[1:] + [_data[0]], "testid")
+        self.assertEqual(count, 5)
+
+        data = _sqlite.select(_table.name, ["testname"], "testid = ?", [2])
+        self.assertEqual(data[0][0], "Test02X")
+
+        count = _sqlite.update_many(_table.name, _table.names, [], "testid")
+        self.assertEqual(count, 0)
+
+        self._clean(_sqlite)
+        return
+
+    def test_update_many_02(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+        _data = get_data_06()
+
+        count = _sqlite.update_many(_table.name, _table.names, _data, "testid")
+        self.assertEqual(count, -1)
+
+        data = _sqlite.select(_table.name, ["path"], "testid = ?", [1])
+        self.assertEqual(data[0][0], "testers/")
+
+        self._clean(_sqlite)
+        return
+
+    def test_upsert_01(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+
+        _data = get_data_07()
+        _data.testname = "Test04Y"
+
+        _new = get_data_01()
+        _new.testid = 7
+
+        count = _sqlite.upsert(_table.name, _table.names, [_data, _new], ["testid"])
+        self.assertEqual(count, 2)
+
+        count = _sqlite.count(_table.name)
+        self.assertEqual(count, 7)
+
+        data = _sqlite.select(_table.name, ["testname"], "testid = ?", [4])
+        self.assertEqual(data[0][0], "Test04Y")
+
+        count = _sqlite.upsert(_table.name, _table.names, _data, [])
+        self.assertEqual(count, -1)
+
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('sqlite3.sqlite_version_info', new=(3, 20, 0))
+    def test_upsert_02(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _table = get_table_01(_sqlite)
+
+        count = _sqlite.upsert(_table.name, _table.names, get_data_07(), ["testid"])
+        self.assertEqual(count, -1)
+
+        self._clean(_sqlite)
+        return
+
+    def test_upsert_03(self):
+        _sqlite = SQLite(name="Test", use_memory=True)
+
+        _sql = _sqlite.statement("upsert", "tester01", ["testid", "testname"], "testid")
+        self.assertEqual(_sql, 'INSERT INTO "tester01" (testid, testname) VALUES (?, ?) '
+                               'ON CONFLICT (testid) DO UPDATE SET testname = excluded.testname;')
+
+        _sql = _sqlite.statement("upsert", "tester01", ["testid"], "testid")
+        self.assertEqual(_sql, 'INSERT INTO "tester01" (testid) VALUES (?) ON CONFLICT (testid) DO NOTHING;')
+        return
+
+    def test_catalog_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+        _table.add_index("index_tester01_name", ["testname", "path"])
+
+        _check = _table.init()
+        self.assertTrue(_check)
+        _sqlite.close()
+
+        _sqlite = get_sqlite(filename="test.sqlite")
+        _sqlite.use_catalog = True
+
+        _table = get_table_01(_sqlite)
+        _table.add_index("index_tester01_name", ["testname", "path"])
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _check = _table.check_scheme()
+        self.assertTrue(_check)
+        self.assertTrue(_sqlite.check_table("tester01"))
+        self.assertFalse(_sqlite.check_table("tester02"))
+        self.assertEqual(_sqlite.catalog.loads, 1)
+
+        _indexes = _sqlite.get_indexes("tester01")
+        self.assertEqual(len(_indexes), 1)
+        self.assertListEqual(_indexes[0].columns, ["testname", "path"])
+        self.assertListEqual(_sqlite.get_indexes("tester02"), [])
+        self.assertIsNone(_sqlite.get_scheme("tester02"))
+
+        _check = _sqlite.add_columns("tester01", ['"category" TEXT'])
+        self.assertTrue(_check)
+        self.assertFalse(_sqlite.catalog.loaded)
+
+        _scheme = _sqlite.get_scheme("tester01")
+        self.assertIn(("category", "TEXT"), _scheme)
+        self.assertEqual(_sqlite.catalog.loads, 2)
+
+        _check = _sqlite.rename_table("tester01", "tester02")
+        self.assertTrue(_check)
+        self.assertTrue(_sqlite.check_table("tester02"))
+        self.assertFalse(_sqlite.check_table("tester01"))
+        self.assertEqual(_sqlite.catalog.loads, 3)
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('bbutil.database.sqlite.manager.Connection.connect', new=mock.Mock(return_value=False))
+    def test_catalog_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.use_catalog = True
+        _sqlite.prepare()
+
+        self.assertFalse(_sqlite.check_table("tester01"))
+        self.assertIsNone(_sqlite.get_scheme("tester01"))
+        self.assertIsNone(_sqlite.get_indexes("tester01"))
+        self.assertFalse(_sqlite.catalog.loaded)
+        return
+
+    def test_catalog_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.use_catalog = True
+        _sqlite.prepare()
+
+        _sqlite.manager.cursor = mock.Mock(return_value=mock.Mock(execute=mock.Mock(
+            side_effect=sqlite3.OperationalError("catalog"))))
+
+        self.assertFalse(_sqlite.check_table("tester01"))
+        self.assertFalse(_sqlite.catalog.loaded)
+        self._clean(_sqlite)
+        return
+
+    def test_transaction_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data1 = get_data_01()
+        _data2 = get_data_01()
+        _data2.testid = 2
+
+        with _sqlite.transaction() as _transaction:
+            self.assertTrue(_sqlite.manager.in_transaction)
+            self.assertEqual(_sqlite.insert(_table.name, _table.names, _data1), 1)
+            self.assertEqual(_sqlite.insert(_table.name, _table.names, [_data2]), 1)
+
+            _data2.testname = "Test02"
+            self.assertTrue(_sqlite.update(_table.name, _table.names, _data2, "testid = ?", 2))
+            self.assertEqual(_sqlite.count(_table.name), 2)
+
+        self.assertFalse(_sqlite.manager.in_transaction)
+        self.assertTrue(_transaction.committed)
+        self.assertIsNone(_sqlite.manager.connection)
+        self.assertEqual(_sqlite.count(_table.name), 2)
+
+        _result = _sqlite.select(_table.name, [], "testid = ?", [2])
+        self.assertEqual(_result[0][2], "Test02")
+        self._clean(_sqlite)
+        return
+
+    def test_transaction_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with _sqlite.transaction() as _transaction:
+                self.assertEqual(_sqlite.insert(_table.name, _table.names, get_data_01()), 1)
+                self.assertEqual(_sqlite.insert(_table.name, _table.names, get_data_02()), -1)
+
+        self.assertTrue(_transaction.failed)
+        self.assertFalse(_transaction.committed)
+        self.assertEqual(_sqlite.count(_table.name), 0)
+
+        _data = get_data_01()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with _sqlite.transaction() as _transaction:
+                self.assertEqual(_sqlite.insert(_table.name, _table.names, _data), 1)
+                self.assertFalse(_sqlite.update(_table.name, _table.names, _data, "missing = ?", 1))
+
+        self.assertTrue(_transaction.failed)
+        self.assertFalse(_transaction.committed)
+        self.assertEqual(_sqlite.count(_table.name), 0)
+        self.assertFalse(_sqlite.update(_table.name, _table.names, _data, "missing = ?", 1))
+
+        with self.assertRaises(ValueError):
+            with _sqlite.transaction():
+                _sqlite.insert(_table.name, _table.names, get_data_01())
+                raise ValueError("abort")
+
+        self.assertFalse(_sqlite.manager.in_transaction)
+        self.assertEqual(_sqlite.count(_table.name), 0)
+        self.assertEqual(_sqlite.insert(_table.name, _table.names, get_data_01()), 1)
+        self._clean(_sqlite)
+        return
+
+    def test_transaction_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data2 = get_data_01()
+        _data2.testid = 2
+
+        with _sqlite.transaction() as _outer:
+            _sqlite.insert(_table.name, _table.names, get_data_01())
+
+            with self.assertRaises(sqlite3.OperationalError):
+                with _sqlite.transaction() as _inner1:
+                    self.assertEqual(_inner1.depth, 2)
+                    _sqlite.insert(_table.name, _table.names, _data2)
+                    _sqlite.insert(_table.name, _table.names, get_data_02())
+
+            with _sqlite.transaction() as _inner2:
+                _sqlite.insert(_table.name, _table.names, _data2)
+
+            self.assertEqual(_sqlite.count(_table.name), 2)
+
+        self.assertFalse(_inner1.committed)
+        self.assertTrue(_inner2.committed)
+        self.assertTrue(_outer.committed)
+        self.assertEqual(_sqlite.count(_table.name), 2)
+
+        _check = _sqlite.manager.end(_outer)
+        self.assertFalse(_check)
+        self._clean(_sqlite)
+        return
+
+    def test_transaction_04(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.use_threads = True
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _counts = []
+
+        def _count():
+            _counts.append(_sqlite.count(_table.name))
+            _sqlite.manager.close_thread()
+            return
+
+        with _sqlite.transaction() as _transaction:
+            _sqlite.insert(_table.name, _table.names, get_data_01())
+
+            _thread = threading.Thread(target=_count)
+            _thread.start()
+            _thread.join()
+
+            self.assertEqual(_sqlite.count(_table.name), 1)
+
+        self.assertTrue(_transaction.committed)
+        self.assertListEqual(_counts, [0])
+        self.assertEqual(_sqlite.count(_table.name), 1)
+
+        _sqlite.close()
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('bbutil.database.sqlite.manager.Connection.connect', new=mock.Mock(return_value=False))
+    def test_transaction_05(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+
+        with self.assertRaises(sqlite3.OperationalError):
+            with _sqlite.transaction():
+                pass
+        return
+
+    @staticmethod
+    def _fill_maintenance(sqlite: SQLite) -> Table:
+        _table = get_table_01(sqlite)
+        _table.init()
+
+        _data_list = []
+        for _number in range(0, 2000):
+            _data = get_data_01()
+            _data.testid = _number
+            _data.path = "testers/{0:s}".format("X" * 200)
+            _data_list.append(_data)
+
+        sqlite.insert(_table.name, _table.names, _data_list)
+        return _table
+
+    @staticmethod
+    def _delete_all(sqlite: SQLite, table: Table):
+        _connection = sqlite3.connect(sqlite.filename)
+        _connection.execute('DELETE FROM "{0:s}"'.format(table.name))
+        _connection.commit()
+        _connection.close()
+        return
+
+    def test_backup_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._fill_maintenance(_sqlite)
+
+        _target = full_path("{0:s}/test_backup.sqlite".format(os.getcwd()))
+        if os.path.exists(_target) is True:
+            os.remove(_target)
+
+        _result = _sqlite.backup(_target, pages_per_step=10)
+        self.assertTrue(_result.success)
+        self.assertEqual(_result.operation, "backup")
+        self.assertGreater(_result.pages, 10)
+        self.assertGreater(_result.steps, 1)
+        self.assertIsNone(_sqlite.manager.connection)
+
+        _backup = get_sqlite(filename="test_backup.sqlite")
+        _backup.prepare()
+        self.assertEqual(_backup.count(_table.name), 2000)
+
+        self._clean(_backup)
+        self._clean(_sqlite)
+        return
+
+    def test_backup_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+
+        _result = _sqlite.backup("test_backup.sqlite", pages_per_step=0)
+        self.assertFalse(_result.success)
+
+        _target = full_path("{0:s}/missing/test_backup.sqlite".format(os.getcwd()))
+        _result = _sqlite.backup(_target)
+        self.assertFalse(_result.success)
+
+        self._clean(_sqlite)
+        return
+
+    def test_vacuum_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._fill_maintenance(_sqlite)
+        self._delete_all(_sqlite, _table)
+
+        self.assertEqual(_sqlite.get_auto_vacuum(), 0)
+
+        _result = _sqlite.vacuum()
+        self.assertFalse(_result.success)
+        self.assertEqual(_result.operation, "incremental_vacuum")
+        self.assertIsNone(_sqlite.manager.connection)
+
+        _result = _sqlite.vacuum(incremental=False)
+        self.assertTrue(_result.success)
+        self.assertEqual(_result.operation, "vacuum")
+        self.assertGreater(_result.free_pages, 0)
+        self.assertLess(_result.pages_after, _result.pages_before)
+        self.assertEqual(_result.pages, _result.pages_before - _result.pages_after)
+
+        with _sqlite.transaction():
+            _result = _sqlite.vacuum()
+            self.assertFalse(_result.success)
+
+        self._clean(_sqlite)
+        return
+
+    def test_vacuum_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+        _sqlite.manager.set_profile(Profile(name="vacuum", auto_vacuum="INCREMENTAL"))
+
+        _table = self._fill_maintenance(_sqlite)
+        self._delete_all(_sqlite, _table)
+        self.assertEqual(_sqlite.get_auto_vacuum(), 2)
+
+        _result = _sqlite.vacuum(incremental=True, pages=5)
+        self.assertTrue(_result.success)
+        self.assertEqual(_result.operation, "incremental_vacuum")
+        self.assertEqual(_result.pages, 5)
+
+        _result = _sqlite.vacuum(incremental=True)
+        self.assertTrue(_result.success)
+        self.assertEqual(_result.pages, _result.free_pages)
+
+        self._clean(_sqlite)
+        return
+
+    def test_maintenance_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.use_catalog = True
+        self._fill_maintenance(_sqlite)
+
+        _result = _sqlite.analyze()
+        self.assertTrue(_result.success)
+        self.assertGreater(_result.duration, 0.0)
+        self.assertTrue(_sqlite.check_table("sqlite_stat1"))
+
+        _result = _sqlite.optimize()
+        self.assertTrue(_result.success)
+        self.assertEqual(_result.operation, "optimize")
+
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('bbutil.database.sqlite.manager.Connection.connect', new=mock.Mock(return_value=False))
+    def test_maintenance_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+
+        self.assertFalse(_sqlite.vacuum().success)
+        self.assertFalse(_sqlite.analyze().success)
+        self.assertFalse(_sqlite.optimize().success)
+        self.assertEqual(_sqlite.get_auto_vacuum(), -1)
+        return
+
+    def test_maintenance_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+
+        _sqlite.manager.cursor = mock.Mock(return_value=mock.Mock(execute=mock.Mock(
+            side_effect=sqlite3.OperationalError("maintenance"))))
+
+        self.assertFalse(_sqlite.vacuum().success)
+        self.assertFalse(_sqlite.analyze().success)
+        self.assertIsNone(_sqlite.manager.connection)
+        self._clean(_sqlite)
+        return
+
+    def test_index_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _indexes = _sqlite.get_indexes(_table.name)
+        self.assertListEqual(_indexes, [])
+
+        _index1 = Index(name="index_name", columns=["testname"])
+        _index2 = Index(name="index_path", columns=["path", "testname"], unique=True)
+
+        _check = _sqlite.create_indexes(_table.name, [_index1, _index2])
+        self.assertTrue(_check)
+
+        _indexes = _sqlite.get_indexes(_table.name)
+        self.assertListEqual(_indexes, [_index1, _index2])
+
+        _check = _sqlite.drop_indexes(["index_name"])
+        self.assertTrue(_check)
+
+        _indexes = _sqlite.get_indexes(_table.name)
+        self.assertListEqual(_indexes, [_index2])
+        self._clean(_sqlite)
+        return
+
+    def test_index_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _index = Index(name="index_unknown", columns=["testname"])
+
+        _check = _sqlite.create_indexes("tester99", [_index])
+        self.assertFalse(_check)
+
+        _check = _sqlite.create_indexes(_table.name, [])
+        self.assertTrue(_check)
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('sqlite3.connect', new=get_sqlite_operational_error())
+    def test_index_03(self):
+        _sqlite = SQLite(filename="test.sqlite", name="Test")
+        _sqlite.prepare()
+
+        _indexes = _sqlite.get_indexes("tester01")
+        self.assertIsNone(_indexes)
+
+        _check = _sqlite.create_indexes("tester01", [Index(name="index_name", columns=["testname"])])
+        self.assertFalse(_check)
+
+        _check = _sqlite.drop_indexes(["index_name"])
+        self.assertFalse(_check)
+        return
+
+    def test_threads_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.use_threads = True
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _results = []
+
+        def _worker(offset: int):
+            for _number in range(offset, offset + 10):
+                _data = get_data_01()
+                _data.testid = _number
+                _results.append(_sqlite.insert(_table.name, _table.names, _data))
+                _results.append(_sqlite.count(_table.name) > 0)
+            return
+
+        _threads = [threading.Thread(target=_worker, args=(_offset,)) for _offset in range(0, 40, 10)]
+        for _thread in _threads:
+            _thread.start()
+
+        for _thread in _threads:
+            _thread.join(10)
+
+        self.assertEqual(len(_results), 80)
+        self.assertNotIn(-1, _results)
+        self.assertNotIn(False, _results)
+        self.assertEqual(_sqlite.count(_table.name), 40)
+
+        _check = _sqlite.close()
+        self.assertTrue(_check)
+        self._clean(_sqlite)
+        return
+
+    def test_insert_groups_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data1 = get_data_01()
+        _data2 = get_data_01()
+        _data2.testid = 2
+        _data3 = get_data_01()
+        _data3.testid = 3
+
+        _result = _sqlite.insert_groups(_table.name, _table.names, [[_data1, _data2], [_data2, _data3]])
+        self.assertListEqual(_result, [2, 1])
+        self.assertEqual(_sqlite.count(_table.name), 3)
+
+        _result = _sqlite.insert_groups(_table.name, _table.names, [[get_data_01()], [get_data_02()]])
+        self.assertListEqual(_result, [-1, -1])
+        self.assertEqual(_sqlite.count(_table.name), 3)
+        self._clean(_sqlite)
+        return
+
+    def test_insert_tables_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table1 = get_table_01(_sqlite)
+
+        _table2 = Table(name="tester02", sqlite=_sqlite)
+        _table2.add_column(name="testid", data_type=Types.integer, unique=True)
+        _table2.add_column(name="testname", data_type=Types.string)
+
+        self.assertTrue(_table1.init())
+        self.assertTrue(_table2.init())
+
+        _data1 = get_data_01()
+        _data2 = get_data_01()
+        _data2.testid = 2
+
+        _data3 = _table2.new_data()
+        _data3.testid = 1
+        _data3.testname = "Test01"
+
+        _groups = [
+            (_table1.name, _table1.names, [_data1, _data2]),
+            (_table2.name, _table2.names, [_data3])
+        ]
+
+        _result = _sqlite.insert_tables(_groups)
+        self.assertListEqual(_result, [2, 1])
+        self.assertEqual(_sqlite.count(_table1.name), 2)
+        self.assertEqual(_sqlite.count(_table2.name), 1)
+
+        _data4 = get_data_01()
+        _data4.testid = 3
+
+        _groups = [
+            (_table1.name, _table1.names, [_data4]),
+            (_table2.name, _table1.names, [get_data_02()])
+        ]
+
+        _result = _sqlite.insert_tables(_groups)
+        self.assertListEqual(_result, [-1, -1])
+        self.assertEqual(_sqlite.count(_table1.name), 2)
+        self.assertEqual(_sqlite.count(_table2.name), 1)
+        self._clean(_sqlite)
+        return
+
+    @mock.patch('bbutil.database.sqlite.manager.Connection.connect', new=mock.Mock(return_value=False))
+    def test_insert_groups_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _sqlite.prepare()
+
+        _result = _sqlite.insert_groups("tester01", ["testid"], [[get_data_01()]])
+        self.assertListEqual(_result, [-1])
+        return
+
+    def test_page_01(self):
+        _sqlite = SQLite(name="Test", use_memory=True)
+
+        _sql = _sqlite.statement("page", "tester01", [], "ORDER BY testid LIMIT ?")
+        self.assertEqual(_sql, "SELECT * FROM tester01 ORDER BY testid LIMIT ?;")
+
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _sqlite.prepare()
+
+        _data = _sqlite.page("tester01", ["testid"], ["testid"], [2], 2, "use_test = ?", [True])
+        self.assertListEqual(_data, [(3,), (5,)])
+        self.assertIn(("page", "tester01", ("testid",),
+                       "WHERE (use_test = ?) AND (testid) > (?) ORDER BY testid LIMIT ?"), _sqlite._statements)
+
+        _data = _sqlite.page("tester01", ["testid"], ["path", "testid"], ["testers/", 2], 2, descending=True)
+        self.assertListEqual(_data, [(1,), (6,)])
+
+        _data = _sqlite.page("tester01", [], [])
+        self.assertIsNone(_data)
+
+        _data = _sqlite.page("tester01", [], ["unknown"])
+        self.assertIsNone(_data)
+        return
+
+    @mock.patch('bbutil.database.sqlite.manager.Connection.connect', new=mock.Mock(return_value=False))
+    def test_page_02(self):
+        _sqlite = SQLite(name="Test", use_memory=True)
+        _sqlite.prepare()
+
+        _data = _sqlite.page("tester01", [], ["testid"])
+        self.assertIsNone(_data)
+
+        _count = _sqlite.count("tester01", "testid = ?", [1])
+        self.assertEqual(_count, -1)
+        return
@@ -16,15 +16,23 @@
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
 
+import json
 import os
+import pickle
+import sqlite3
+import struct
 import unittest
 import unittest.mock as mock
+import warnings
+
+from array import array
+from datetime import datetime
 
 from unittest.mock import Mock
 
 import bbutil
 
-from bbutil.database import Table, Types, SQLite
+from bbutil.database import Table, Types, SQLite, Row, Data, ListValue, JsonValue
 
 from tests.helper import get_sqlite, set_log, copy_sqlite
 from tests.helper.table import TestData, get_table_01, get_table_02, get_table_03, get_table_04
@@ -133,6 +141,74 @@ class TestTable(unittest.TestCase):
         self._clean(_table.sqlite)
         return
 
+    def test_row_type_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _row_type = _table.row_type
+        self.assertIs(_table.row_type, _row_type)
+        self.assertTupleEqual(_row_type._fields, ("testid", "use_test", "testname", "path"))
+
+        _data = _table.new_data()
+        self.assertIs(type(_data), _row_type)
+        self.assertFalse(hasattr(_data, "__dict__"))
+        self.assertRaises(AttributeError, setattr, _data, "xcategory", "Test")
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _items = _table.select()
+        self.assertEqual(len(_items), 6)
+        self.assertIs(type(_items[0]), _row_type)
+        self.assertIsInstance(_items[0], Row)
+
+        _table.add_column(name="file", data_type=Types.string)
+        self.assertIsNot(_table.row_type, _row_type)
+        self.assertHasAttr(_table.new_data(), "file")
+        return
+
+    def test_row_type_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="test01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, unique=True, keyword=True)
+        _table.add_column(name="test name", data_type=Types.string)
+        _table.add_column(name="class", data_type=Types.string)
+
+        _data = _table.new_data()
+        self.assertIsInstance(_data, Data)
+        self.assertEqual(getattr(_data, "test name"), "")
+        self.assertEqual(getattr(_data, "class"), "")
+        self.assertEqual(_data.testid, 0)
+        return
+
+    def test_row_type_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="test01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="_fields", data_type=Types.string)
+        _table.add_column(name="__init__", data_type=Types.string)
+
+        _data = _table.new_data()
+        self.assertIsInstance(_data, Data)
+        self.assertEqual(getattr(_data, "_fields"), "")
+        self.assertEqual(getattr(_data, "__init__"), "")
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data._fields = "Test01"
+        _count = _table.store(_data)
+        self.assertEqual(_count, 1)
+
+        _items = _table.select(verbose=False)
+        self.assertEqual(_items[0]._fields, "Test01")
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
     def test_init_01(self):
         _sqlite = get_sqlite(filename="test_check_table.sqlite", path="testdata/database")
         _table = get_table_01(sqlite_object=_sqlite)
@@ -575,6 +651,159 @@ class TestTable(unittest.TestCase):
         self.assertEqual(_count, 0)
         return
 
+    def test_iter_select_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = []
+        for _item in _table.iter_select(batch_size=4):
+            self.assertIsNotNone(_sqlite.manager.connection)
+            _data.append(_item)
+
+        self.assertEqual(len(_data), 6)
+        self.assertIsNone(_sqlite.manager.connection)
+        self.assertIs(type(_data[0].use_test), bool)
+        self.assertEqual(_data[0].testid, 1)
+        return
+
+    def test_iter_select_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _iter = _table.iter_select(sql_filter="testid > ?", data_values=[2], batch_size=1)
+        _item = next(_iter)
+        self.assertEqual(_item.testid, 3)
+
+        _iter.close()
+        self.assertIsNone(_sqlite.manager.connection)
+
+        _data = _table.select()
+        self.assertEqual(len(_data), 6)
+        return
+
+    def test_iter_select_03(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        with mock.patch('sqlite3.connect', new=get_sqlite_operational_error()):
+            _data = list(_table.iter_select())
+
+        self.assertEqual(len(_data), 0)
+        return
+
+    def test_iter_select_04(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = []
+        for _item in _table.iter_select(batch_size=4):
+            self.assertEqual(_sqlite.count(_table.name), -1)
+            _data.append(_item)
+
+        self.assertEqual(len(_data), 6)
+        self.assertIsNone(_sqlite.manager.connection)
+        self.assertEqual(_sqlite.count(_table.name), 6)
+        return
+
+    def test_select_columns_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _columns = _table.select_columns(batch_size=4)
+        self.assertListEqual(list(_columns.keys()), ["testid", "use_test", "testname", "path"])
+
+        _testid = _columns["testid"]
+        self.assertIsInstance(_testid, array)
+        self.assertEqual(_testid.typecode, "q")
+        self.assertListEqual(_testid.tolist(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(_columns["use_test"].typecode, "b")
+        self.assertIs(type(_columns["testname"]), list)
+        self.assertEqual(len(_columns["testname"]), 6)
+        return
+
+    def test_select_columns_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _columns = _table.select_columns(names=["testid"], sql_filter="testid > ?", data_values=[4])
+        self.assertListEqual(list(_columns.keys()), ["testid"])
+        self.assertListEqual(_columns["testid"].tolist(), [5, 6])
+
+        _columns = _table.select_columns(names=["testidx"])
+        self.assertIsNone(_columns)
+        return
+
+    def test_select_columns_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data1 = _table.new_data()
+        _data1.testid = 1
+
+        _data2 = _table.new_data()
+        _data2.testid = None
+
+        _count = _table.store([_data1, _data2])
+        self.assertEqual(_count, 2)
+
+        _columns = _table.select_columns(names=["testid"], batch_size=1)
+        self.assertIs(type(_columns["testid"]), list)
+        self.assertCountEqual(_columns["testid"], [1, None])
+        self._clean(_table.sqlite)
+        return
+
+    @mock.patch.dict('sys.modules', {'numpy': None})
+    def test_select_columns_04(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _columns = _table.select_columns(use_numpy=True)
+        self.assertIsNone(_columns)
+        return
+
+    def test_select_columns_05(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        with mock.patch('sqlite3.connect', new=get_sqlite_operational_error()):
+            _columns = _table.select_columns(names=["testid"])
+
+        self.assertIsNone(_columns)
+
+        _columns = _table.select_columns(names=["testid"], sql_filter="testid > ?", data_values=[4, 5])
+        self.assertIsNone(_columns)
+
+        _columns = _table.select_columns(names=["testid"], sql_filter="testid > ?", data_values=[6])
+        self.assertListEqual(_columns["testid"].tolist(), [])
+        return
+
     def test_store_01(self):
         _sqlite = get_sqlite(filename="test.sqlite", clean=True)
         _table = get_table_01(sqlite_object=_sqlite)
@@ -762,52 +991,920 @@ class TestTable(unittest.TestCase):
         self.assertEqual(_data_count, limit)
         return
 
-    def test_load_01(self):
-        _sqlite = get_sqlite(filename="test_bulk.sqlite", path="testdata/database")
+    def test_update_many_01(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
 
-        _table0 = get_table_03("interval0", sqlite_object=_sqlite)
-        _table1 = get_table_03("interval1", sqlite_object=_sqlite)
-        _table2 = get_table_03("interval2", sqlite_object=_sqlite)
-        _table3 = get_table_03("interval3", sqlite_object=_sqlite)
-        _table4 = get_table_03("interval4", sqlite_object=_sqlite)
-        _table5 = get_table_03("interval5", sqlite_object=_sqlite)
-        _table6 = get_table_03("interval6", sqlite_object=_sqlite)
+        _check = _table.init()
+        self.assertTrue(_check)
 
-        _tables = [
-            _table0,
-            _table1,
-            _table2,
-            _table3,
-            _table4,
-            _table5,
-            _table6
-        ]
+        _data = _table.select()
+        for _item in _data:
+            _item.path = "changed/"
 
-        for _table in _tables:
-            _check = _table.init()
-            self.assertTrue(_check)
+        _count = _table.update_many(_data, "testid")
+        self.assertEqual(_count, 6)
 
-        self._load_table(_table0, 500)
-        self._load_table(_table1, 1000)
-        self._load_table(_table2, 5000)
-        self._load_table(_table3, 10000)
-        self._load_table(_table4, 20000)
-        self._load_table(_table5, 50000)
-        self._load_table(_table6, 100000)
+        _data = _table.select(sql_filter="path = ?", data_values=["changed/"])
+        self.assertEqual(len(_data), 6)
+        self._clean(_table.sqlite)
         return
 
-    def test_load_02(self):
-        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+    def test_upsert_01(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = _table.new_data()
+        _data.testid = 1
+        _data.testname = "Test01Y"
+        _table.add(_data)
+
+        _data = _table.new_data()
+        _data.testid = 10
+        _data.testname = "Test10"
+        _table.add(_data)
+
+        _count = _table.upsert()
+        self.assertEqual(_count, 2)
+
+        _data = _table.select(sql_filter="testid = ?", data_values=[1])
+        self.assertEqual(_data[0].testname, "Test01Y")
+        self.assertEqual(_table.check(), 7)
+        self._clean(_table.sqlite)
+        return
+
+    def test_upsert_02(self):
+        _sqlite = copy_sqlite(filename="test_update.sqlite", path="testdata/database")
+        _table = get_table_03("tester01", sqlite_object=_sqlite)
+
+        _count = _table.upsert([_table.new_data()])
+        self.assertEqual(_count, -1)
+        self._clean(_table.sqlite)
+        return
+
+    def test_lookup_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_04(sqlite_object=_sqlite)
+
+        _check = _table.add_lookup("category_path", ["category", "path"])
+        self.assertTrue(_check)
+
+        _check = _table.add_lookup("testname", ["testname"], ordered=True)
+        self.assertTrue(_check)
+
+        _check = _table.add_lookup("unknown", ["xcategory"])
+        self.assertFalse(_check)
+
+        _check = _table.add_lookup("empty", [])
+        self.assertFalse(_check)
+
+        for _number in range(0, 10):
+            _data = _table.new_data()
+            _data.testid = _number
+            _data.category = "Test{0:d}".format(_number % 3)
+            _data.testname = "Test{0:02d}".format(_number)
+            _data.path = "path{0:d}".format(_number % 2)
+            _table.add(_data)
+
+        _result = _table.find(path="path0", category="Test0")
+        self.assertListEqual([_item.testid for _item in _result], [0, 6])
+
+        _result = _table.find(category="Test1")
+        self.assertListEqual([_item.testid for _item in _result], [1, 4, 7])
+
+        _result = _table.range("testname", "Test03", "Test05")
+        self.assertListEqual([_item.testid for _item in _result], [3, 4, 5])
+
+        _result = _table.range("testid", 7)
+        self.assertListEqual([_item.testid for _item in _result], [7, 8, 9])
+
+        _data = _table.new_data()
+        _data.testid = 10
+        _data.testname = None
+        _table.add(_data)
 
+        _result = _table.find(testname=None)
+        self.assertListEqual([_item.testid for _item in _result], [10])
+
+        _table.clear()
+        self.assertEqual(len(_table.find(category="Test1")), 0)
+        self.assertEqual(len(_table.range("testname")), 0)
+        self._clean(_table.sqlite)
+        return
+
+    def test_lookup_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
         _table = get_table_01(sqlite_object=_sqlite)
 
-        _check_init = _table.init()
+        _check = _table.init()
+        self.assertTrue(_check)
 
-        with mock.patch('sqlite3.connect', new=get_sqlite_operational_error()):
-            _count = _table.load()
+        _count = _table.load()
+        self.assertEqual(_count, 6)
 
-        self.assertTrue(_check_init)
-        self.assertEqual(_count, 0)
+        _check = _table.add_lookup("path", ["path"])
+        self.assertTrue(_check)
+
+        _result = _table.find(path="testXXs/")
+        self.assertListEqual([_item.testid for _item in _result], [4, 5, 6])
+        return
+
+    def test_index_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="testname", data_type=Types.string, indexed=True)
+        _table.add_column(name="path", data_type=Types.string)
+
+        _check = _table.add_index("index_tester01_path_name", ["path", "testname"], unique=True)
+        self.assertTrue(_check)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _indexes = _table.sqlite.get_indexes("tester01")
+        _names = [_index.name for _index in _indexes]
+        self.assertCountEqual(_names, ["index_tester01_testname", "index_tester01_path_name"])
+
+        _check = _table.check_scheme()
+        self.assertTrue(_check)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+        return
+
+    def test_index_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="testname", data_type=Types.string)
+        _table.add_column(name="path", data_type=Types.string, indexed=True)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="testname", data_type=Types.string, indexed=True)
+        _table.add_column(name="path", data_type=Types.string)
+        _table.add_index("index_tester01_path", ["path", "testname"])
+
+        _check = _table.check_scheme()
+        self.assertFalse(_check)
+        self.assertEqual(len(_table.missing_indexes), 2)
+        self.assertListEqual(_table.drop_indexes, ["index_tester01_path"])
+
+        _check = _table.upgrade()
+        self.assertTrue(_check)
+
+        _check = _table.check_scheme()
+        self.assertTrue(_check)
+
+        _indexes = _table.sqlite.get_indexes("tester01")
+        _columns = {_index.name: _index.columns for _index in _indexes}
+        self.assertListEqual(_columns["index_tester01_path"], ["path", "testname"])
+        self.assertListEqual(_columns["index_tester01_testname"], ["testname"])
+        return
+
+    def test_index_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.add_index("index_empty", [])
+        self.assertFalse(_check)
+
+        _check = _table.add_index("index_unknown", ["unknown"])
+        self.assertFalse(_check)
+
+        _check = _table.add_index("index_path", ["path"])
+        self.assertTrue(_check)
+
+        _check = _table.add_index("index_path", ["testname"])
+        self.assertFalse(_check)
+        self.assertEqual(len(_table.indexes), 1)
+        return
+
+    @mock.patch('bbutil.database.sqlite.SQLite.get_indexes', new=Mock(return_value=None))
+    def test_index_04(self):
+        _sqlite = get_sqlite(filename="test_database.sqlite", path="testdata/database")
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="use_test", data_type=Types.bool)
+        _table.add_column(name="testname", data_type=Types.string)
+        _table.add_column(name="path", data_type=Types.string)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _check = _table.check_scheme()
+        self.assertFalse(_check)
+        return
+
+    def test_page_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _page = _table.page("testid", limit=4)
+        self.assertListEqual([_item.testid for _item in _page], [1, 2, 3, 4])
+        self.assertIs(_page[0].use_test, True)
+
+        _page = _table.page("testid", after=_page[-1].testid, limit=4)
+        self.assertListEqual([_item.testid for _item in _page], [5, 6])
+
+        _page = _table.page("testid", after=_page[-1].testid, limit=4)
+        self.assertListEqual(_page, [])
+
+        _page = _table.page(limit=2, descending=True)
+        self.assertListEqual([_item.testid for _item in _page], [6, 5])
+        return
+
+    def test_page_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _order = ["path", "testid"]
+
+        _page = _table.page(_order, limit=2, sql_filter="use_test = ?", data_values=[True])
+        self.assertListEqual([_item.testid for _item in _page], [5, 6])
+
+        _after = (_page[-1].path, _page[-1].testid)
+        _page = _table.page(_order, after=_after, limit=2, sql_filter="use_test = ?", data_values=[True])
+        self.assertListEqual([_item.testid for _item in _page], [1, 2])
+
+        _page = _table.page(_order, after=_after, limit=10, descending=True)
+        self.assertListEqual([_item.testid for _item in _page], [5, 4])
+        return
+
+    def test_page_03(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _page = _table.page("unknown")
+        self.assertListEqual(_page, [])
+
+        _page = _table.page(["path", "testid"], after=1)
+        self.assertListEqual(_page, [])
+
+        _page = _table.page([])
+        self.assertListEqual(_page, [])
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _page = _table.page()
+        self.assertListEqual(_page, [])
+        return
+
+    def test_count_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        self.assertEqual(_table.count(), 6)
+        self.assertEqual(_table.count("path = ?", ["testXXs/"]), 3)
+        self.assertEqual(_table.count("path = ? AND use_test = ?", ["testXXs/", True]), 2)
+        self.assertEqual(_table.count("path = ?"), -1)
+        self.assertEqual(_table.count("unknown = 1"), -1)
+        self.assertEqual(_table.data_count, 0)
+        return
+
+    def test_cache_01(self):
+        _sqlite = copy_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+        _table.enable_cache(max_rows=100)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data1 = _table.select(sql_filter="path = ?", data_values=["testXXs/"])
+        _data2 = _table.select(sql_filter="path = ?", data_values=["testXXs/"])
+        self.assertEqual(len(_data1), 3)
+        self.assertListEqual([_row.testid for _row in _data1], [_row.testid for _row in _data2])
+        self.assertIsNot(_data1, _data2)
+        self.assertIsNot(_data1[0], _data2[0])
+        self.assertEqual(_table.cache.hits, 1)
+        self.assertEqual(_table.cache.misses, 1)
+
+        _testname = _data1[0].testname
+        _data1[0].testname = "Changed"
+        _data2[0].testname = "Changed"
+
+        _data3 = _table.select(sql_filter="path = ?", data_values=["testXXs/"])
+        self.assertEqual(_data3[0].testname, _testname)
+        self.assertEqual(_table.cache.hits, 2)
+
+        _data = _table.new_data()
+        _data.testid = 7
+        _data.path = "testXXs/"
+
+        _count = _table.store(_data)
+        self.assertEqual(_count, 1)
+        self.assertEqual(_table.cache.invalidations, 1)
+
+        _data1 = _table.select(sql_filter="path = ?", data_values=["testXXs/"])
+        self.assertEqual(len(_data1), 4)
+
+        _data1[0].testname = "Test04X"
+        _check = _table.update(_data1[0], "testid = ?", _data1[0].testid)
+        self.assertTrue(_check)
+
+        _data2 = _table.select(sql_filter="testid = ?", data_values=[4])
+        self.assertEqual(_data2[0].testname, "Test04X")
+        self.assertEqual(_table.cache.invalidations, 2)
+
+        _table.clear()
+        self.assertEqual(_table.cache.count, 0)
+
+        _check = _table.close()
+        self.assertTrue(_check)
+        self._clean(_sqlite)
+        return
+
+    def test_cache_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+        _table.enable_cache()
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = _table.select(sql_filter="testid = ?", data_values=[[1]])
+        self.assertListEqual(_data, [])
+        self.assertEqual(_table.cache.misses, 0)
+
+        _data = _table.select(sql_filter="unknown = ?", data_values=[1])
+        self.assertListEqual(_data, [])
+        self.assertEqual(_table.cache.count, 0)
+
+        _data = _table.select(sql_filter="testid = ?", data_values=[100])
+        self.assertListEqual(_data, [])
+        self.assertEqual(_table.cache.count, 1)
+        return
+
+    @staticmethod
+    def _get_refresh_table(sqlite: SQLite) -> Table:
+        _table = Table(name="tester01", sqlite=sqlite, version_column="changed")
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="testname", data_type=Types.string)
+        _table.add_column(name="changed", data_type=Types.integer)
+        return _table
+
+    def test_refresh_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._get_refresh_table(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data_list = []
+        for _number in range(1, 4):
+            _data = _table.new_data()
+            _data.testname = "Test{0:d}".format(_number)
+            _data.changed = _number
+            _data_list.append(_data)
+
+        _count = _table.store(_data_list)
+        self.assertEqual(_count, 3)
+
+        _count = _table.load()
+        self.assertEqual(_count, 3)
+        self.assertTrue(_table.loaded)
+        self.assertEqual(_table.last_key, 3)
+        self.assertEqual(_table.last_version, 3)
+
+        _check = _table.add_lookup("testname", ["testname"])
+        self.assertTrue(_check)
+
+        _count = _table.refresh()
+        self.assertEqual(_count, 0)
+
+        _data_list = []
+        for _number in range(4, 6):
+            _data = _table.new_data()
+            _data.testname = "Test{0:d}".format(_number)
+            _data.changed = _number
+            _data_list.append(_data)
+        _table.store(_data_list)
+
+        _data = _table.row_type(1, "Test1X", 6)
+        _check = _table.update(_data, "testid = ?", 1)
+        self.assertTrue(_check)
+
+        _count = _table.refresh()
+        self.assertEqual(_count, 3)
+        self.assertEqual(_table.data_count, 5)
+        self.assertEqual(_table.last_key, 5)
+        self.assertEqual(_table.last_version, 6)
+        self.assertEqual(_table.data[0].testname, "Test1X")
+        self.assertEqual(len(_table.find(testname="Test1X")), 1)
+        self.assertEqual(len(_table.find(testname="Test1")), 0)
+        self.assertEqual(len(_table.find(testname="Test5")), 1)
+        return
+
+    def test_refresh_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _count = _table.refresh()
+        self.assertEqual(_count, 6)
+        self.assertTrue(_table.loaded)
+        self.assertIsNone(_table.last_key)
+
+        _count = _table.refresh()
+        self.assertEqual(_count, 6)
+        self.assertEqual(_table.data_count, 6)
+
+        _table.clear()
+        self.assertFalse(_table.loaded)
+
+        _check = _table.ensure()
+        self.assertTrue(_check)
+        self.assertEqual(_table.data_count, 6)
+
+        _table.version_column = "unknown"
+        _count = _table.refresh()
+        self.assertEqual(_count, -1)
+        return
+
+    def test_refresh_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._get_refresh_table(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _count = _table.load()
+        self.assertEqual(_count, 0)
+        self.assertIsNone(_table.last_key)
+
+        _data = _table.new_data()
+        _data.testname = "Test1"
+        _table.store(_data)
+
+        _count = _table.refresh()
+        self.assertEqual(_count, 1)
+        self.assertEqual(_table.last_key, 1)
+        self.assertEqual(_table.last_version, 0)
+
+        _table.version_column = "unknown"
+        _count = _table.refresh()
+        self.assertEqual(_count, -1)
+
+        _table.version_column = "changed"
+        with mock.patch('bbutil.database.sqlite.SQLite.select', new=Mock(return_value=None)):
+            _count = _table.refresh()
+        self.assertEqual(_count, -1)
+        return
+
+
+    def test_ensure_01(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        with mock.patch('bbutil.database.sqlite.SQLite.select', new=Mock(return_value=None)):
+            _count = _table.load()
+            self.assertEqual(_count, -1)
+            self.assertFalse(_table.loaded)
+
+            _check = _table.ensure()
+            self.assertFalse(_check)
+            self.assertFalse(_table.loaded)
+
+        _broken = get_table_01(sqlite_object=_sqlite)
+        _broken.add_column(name="missing", data_type=Types.string)
+
+        _count = _broken.load()
+        self.assertEqual(_count, -1)
+        self.assertFalse(_broken.loaded)
+        self.assertFalse(_broken.ensure())
+
+        _check = _table.ensure()
+        self.assertTrue(_check)
+        self.assertTrue(_table.loaded)
+        self.assertEqual(_table.data_count, 6)
+        return
+
+    def test_decode_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="use_test", data_type=Types.bool)
+        _table.add_column(name="options", data_type=Types.json)
+        _table.add_column(name="items", data_type=Types.list)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _names = ["use_test", "options", "items"]
+        _data_list = [
+            Data(_names, [1, '{"name": "Test01"}', b'[1, 2, 3]']),
+            Data(_names, [0, "", b""]),
+            Data(_names, [0, None, None]),
+            Data(_names, [0, "Test04", None])
+        ]
+
+        _count = _sqlite.insert(_table.name, _names, _data_list)
+        self.assertEqual(_count, 4)
+
+        _data = _table.select(verbose=False)
+        self.assertEqual(len(_data), 4)
+        self.assertIs(_data[0].use_test, True)
+        self.assertIsInstance(_data[0].options, JsonValue)
+        self.assertDictEqual(_data[0].options, {"name": "Test01"})
+        self.assertListEqual(_data[0].items, [1, 2, 3])
+        self.assertIs(_data[1].use_test, False)
+        self.assertDictEqual(_data[1].options, {})
+        self.assertListEqual(_data[1].items, [])
+        self.assertIsNone(_data[2].options)
+        self.assertIsNone(_data[2].items)
+        self.assertEqual(_data[3].options, "Test04")
+
+        _table.add_column(name="missing", data_type=Types.string)
+
+        _entry = _table._process_data((1, 1, "", b""), 0)
+        self.assertIsNone(_entry)
+
+        _data = _table._process_datalist([(1, 1, None, b"[", "")], False)
+        self.assertEqual(len(_data), 1)
+        self.assertEqual(_data[0].items, b"[")
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_decode_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="options", data_type=Types.json)
+        _table.add_column(name="items", data_type=Types.list)
+        _table.add_column(name="changed", data_type=Types.datetime)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _changed = datetime(2023, 5, 17, 12, 30, 15, 123456)
+
+        _data = _table.new_data()
+        _data.options = JsonValue({"name": "Test01", "count": 2})
+        _data.items = ListValue(["List1", "List2"])
+        _data.changed = _changed
+
+        _count = _table.store([_data])
+        self.assertEqual(_count, 1)
+
+        _raw = _sqlite.select(_table.name, [], "", [])
+        self.assertEqual(_raw[0][1], '{"name":"Test01","count":2}')
+
+        _connection = sqlite3.connect(_sqlite.filename)
+        _cursor = _connection.execute("SELECT options, items, changed FROM tester01")
+        _stored = _cursor.fetchone()
+        _connection.close()
+
+        self.assertEqual(_stored[0], '{"name":"Test01","count":2}')
+        self.assertEqual(_stored[1], b'["List1","List2"]')
+        self.assertEqual(_stored[2], "2023-05-17 12:30:15.123456")
+
+        _data = _table.select(verbose=False)
+        self.assertIsInstance(_data[0].options, JsonValue)
+        self.assertDictEqual(_data[0].options, {"name": "Test01", "count": 2})
+        self.assertIsInstance(_data[0].items, ListValue)
+        self.assertListEqual(_data[0].items, ["List1", "List2"])
+        self.assertEqual(_data[0].changed, _changed)
+
+        _data = _table.new_data()
+        _data.options = {"name": "Test02"}
+
+        _count = _table.store([_data])
+        self.assertEqual(_count, -1)
+
+        _data = _table.new_data()
+        self.assertIsInstance(_data.options, JsonValue)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", DeprecationWarning)
+            _data.changed = _changed
+            _count = _table.store([_data])
+            self.assertEqual(_count, 1)
+
+        _connection = sqlite3.connect(_sqlite.filename)
+        _connection.execute('UPDATE "tester01" SET "options" = ? WHERE "testid" = 2', ["[1,2]"])
+        _connection.commit()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            _connection.execute("SELECT ?", [{"name": "Test03"}])
+        _connection.close()
+
+        _data = _table.select(sql_filter="testid = ?", data_values=[2], verbose=False)
+        self.assertEqual(_data[0].options, "[1,2]")
+        self.assertEqual(_data[0].changed, _changed)
+
+        _check = _table.update(_data[0], "testid = ?", 2)
+        self.assertTrue(_check)
+        self.assertEqual(_sqlite.count(_table.name), 2)
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_decode_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _connection = sqlite3.connect(_sqlite.filename)
+        _connection.execute('CREATE TABLE "tester01" ("testid" INTEGER PRIMARY KEY AUTOINCREMENT, "items" BLOB)')
+        _connection.execute('INSERT INTO "tester01" ("items") VALUES (?)', [b'["List1"]'])
+        _connection.execute('INSERT INTO "tester01" ("items") VALUES (?)', [pickle.dumps(["List2"])])
+        _connection.execute('INSERT INTO "tester01" ("items") VALUES (?)', [b'[1, 2'])
+        _connection.commit()
+        _connection.close()
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="items", data_type=Types.list)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = _table.select(verbose=False)
+        self.assertIsInstance(_data[0].items, ListValue)
+        self.assertListEqual(_data[0].items, ["List1"])
+        self.assertEqual(_data[1].items, pickle.dumps(["List2"]))
+        self.assertEqual(_data[2].items, b'[1, 2')
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_decode_04(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+
+        _table = Table(name="tester01", sqlite=_sqlite)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="changed", data_type=Types.datetime)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _connection = sqlite3.connect(_sqlite.filename)
+        _connection.execute('INSERT INTO "tester01" ("changed") VALUES (?)', ["Test01"])
+        _connection.commit()
+        _connection.close()
+
+        _data = _sqlite.select(_table.name, [], "", [])
+        self.assertIsNone(_data)
+
+        _batches = list(_sqlite.iter_batches(_table.name, [], "", []))
+        self.assertListEqual(_batches, [])
+
+        _count = _sqlite.count(_table.name)
+        self.assertEqual(_count, 1)
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    @staticmethod
+    def _get_transfer_table(sqlite: SQLite) -> Table:
+        _table = Table(name="tester01", sqlite=sqlite, suppress_warnings=True)
+        _table.add_column(name="testid", data_type=Types.integer, primarykey=True)
+        _table.add_column(name="use_test", data_type=Types.bool)
+        _table.add_column(name="testname", data_type=Types.string)
+        _table.add_column(name="value", data_type=Types.float)
+        _table.add_column(name="options", data_type=Types.json)
+        _table.add_column(name="items", data_type=Types.list)
+        _table.add_column(name="changed", data_type=Types.datetime)
+        _table.add_column(name="blob", data_type=Types.bytes)
+        return _table
+
+    def test_transfer_01(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._get_transfer_table(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data_list = []
+        for _number in range(0, 25):
+            _data = _table.new_data()
+            _data.use_test = (_number % 2) == 0
+            _data.testname = "Test, \"{0:d}\"".format(_number)
+            _data.value = _number * 0.5
+            _data.options = JsonValue({"number": _number})
+            _data.items = ListValue([_number, "X"])
+            _data.changed = datetime(2023, 5, 17, 12, 30, _number)
+            _data.blob = bytes([_number, 255])
+            _data_list.append(_data)
+
+        _data = _table.new_data()
+        _data.testname = ""
+        _data.value = None
+        _data.options = None
+        _data.items = None
+        _data.changed = None
+        _data.blob = None
+        _data_list.append(_data)
+
+        self.assertEqual(_table.store(_data_list), 26)
+        _expected = _sqlite.select(_table.name, [], "", [])
+
+        _target = get_sqlite(filename="test_import.sqlite", clean=True)
+        _imported = self._get_transfer_table(_target)
+
+        _check = _imported.init()
+        self.assertTrue(_check)
+
+        for _filename in ["test_export.csv", "test_export.jsonl", "test_export.bbc"]:
+            _count = _table.export_file(_filename, batch_size=10)
+            self.assertEqual(_count, 26)
+
+            _count = _imported.import_file(_filename, batch_size=7)
+            self.assertEqual(_count, 26)
+
+            _result = _target.select(_imported.name, [], "", [])
+            self.assertListEqual(_result, _expected)
+
+            _connection = sqlite3.connect(_target.filename)
+            _connection.execute('DELETE FROM "tester01"')
+            _connection.commit()
+            _connection.close()
+            os.remove(_filename)
+
+        _count = _table.export_file("test_export.txt", file_format="jsonl", sql_filter="testid < ?",
+                                    data_values=[4])
+        self.assertEqual(_count, 3)
+        os.remove("test_export.txt")
+
+        _target.manager.close()
+        os.remove(_target.filename)
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_transfer_02(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._get_transfer_table(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        self.assertEqual(_table.export_file("test_export.txt"), -1)
+        self.assertEqual(_table.import_file("test_export.csv", file_format="xml"), -1)
+        self.assertEqual(_table.import_file("missing.csv"), -1)
+        self.assertEqual(_table.export_file("missing/test_export.csv"), -1)
+
+        with open("test_export.csv", "w") as _file:
+            _file.write("testname,value\n")
+            for _number in range(0, 20):
+                _file.write("Test{0:d},{1:d}\n".format(_number, _number))
+            _file.write("Test20,abc\n")
+
+        _count = _table.import_file("test_export.csv", batch_size=5)
+        self.assertEqual(_count, -1)
+        self.assertEqual(_table.check(), 0)
+
+        with open("test_export.csv", "w") as _file:
+            _file.write("testname,unknown\n")
+            _file.write("Test01,1\n")
+
+        self.assertEqual(_table.import_file("test_export.csv"), -1)
+        os.remove("test_export.csv")
+
+        with open("test_export.bbc", "wb") as _file:
+            _file.write(b"BBCOL\x01\x00")
+
+        self.assertEqual(_table.import_file("test_export.bbc"), -1)
+
+        with open("test_export.bbc", "wb") as _file:
+            _file.write(b"CSV")
+
+        self.assertEqual(_table.import_file("test_export.bbc"), -1)
+        os.remove("test_export.bbc")
+
+        self.assertFalse(_sqlite.manager.in_transaction)
+        self.assertEqual(_table.check(), 0)
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_transfer_03(self):
+        _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+        _table = self._get_transfer_table(_sqlite)
+
+        _check = _table.init()
+        self.assertTrue(_check)
+
+        _data = _table.new_data()
+        _data.testname = "Test01"
+        self.assertEqual(_table.store(_data), 1)
+
+        _count = _table.export_file("test_export.csv", sql_filter="testid > ?", data_values=[1, 2])
+        self.assertEqual(_count, -1)
+        self.assertFalse(os.path.exists("test_export.csv"))
+
+        with mock.patch('sqlite3.connect', new=get_sqlite_operational_error()):
+            _count = _table.export_file("test_export.bbc")
+
+        self.assertEqual(_count, -1)
+        self.assertFalse(os.path.exists("test_export.bbc"))
+
+        _header = json.dumps({"columns": [["testid", "string"]]}).encode("utf-8")
+        with open("test_export.bbc", "wb") as _file:
+            _file.write(b"BBCOL\x01")
+            _file.write(struct.pack("<I", len(_header)))
+            _file.write(_header)
+
+        self.assertEqual(_table.import_file("test_export.bbc"), -1)
+
+        _header = json.dumps({"columns": [["testname", "string"]]}).encode("utf-8")
+        with open("test_export.bbc", "wb") as _file:
+            _file.write(b"BBCOL\x01")
+            _file.write(struct.pack("<I", len(_header)))
+            _file.write(_header)
+            _file.write(struct.pack("<I", 1))
+            _file.write(struct.pack("<BI", 1, 8))
+            _file.write(bytes(8))
+
+        self.assertEqual(_table.import_file("test_export.bbc"), -1)
+        os.remove("test_export.bbc")
+
+        self.assertFalse(_sqlite.manager.in_transaction)
+        self.assertEqual(_table.check(), 1)
+
+        _sqlite.manager.close()
+        os.remove(_sqlite.filename)
+        return
+
+    def test_load_01(self):
+        _sqlite = get_sqlite(filename="test_bulk.sqlite", path="testdata/database")
+
+        _table0 = get_table_03("interval0", sqlite_object=_sqlite)
+        _table1 = get_table_03("interval1", sqlite_object=_sqlite)
+        _table2 = get_table_03("interval2", sqlite_object=_sqlite)
+        _table3 = get_table_03("interval3", sqlite_object=_sqlite)
+        _table4 = get_table_03("interval4", sqlite_object=_sqlite)
+        _table5 = get_table_03("interval5", sqlite_object=_sqlite)
+        _table6 = get_table_03("interval6", sqlite_object=_sqlite)
+
+        _tables = [
+            _table0,
+            _table1,
+            _table2,
+            _table3,
+            _table4,
+            _table5,
+            _table6
+        ]
+
+        for _table in _tables:
+            _check = _table.init()
+            self.assertTrue(_check)
+
+        self._load_table(_table0, 500)
+        self._load_table(_table1, 1000)
+        self._load_table(_table2, 5000)
+        self._load_table(_table3, 10000)
+        self._load_table(_table4, 20000)
+        self._load_table(_table5, 50000)
+        self._load_table(_table6, 100000)
+        return
+
+    def test_load_02(self):
+        _sqlite = get_sqlite(filename="test_select.sqlite", path="testdata/database")
+
+        _table = get_table_01(sqlite_object=_sqlite)
+
+        _check_init = _table.init()
+
+        with mock.patch('sqlite3.connect', new=get_sqlite_operational_error()):
+            _count = _table.load()
+
+        self.assertTrue(_check_init)
+        self.assertEqual(_count, -1)
+        self.assertFalse(_table.loaded)
         return
 
     def test_clear_01(self):
@@ -0,0 +1,186 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2023, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import time
+import unittest
+import unittest.mock as mock
+
+from unittest.mock import Mock
+
+from bbutil.database import Table
+from bbutil.database.writer import WriteBehind
+
+from tests.helper import get_sqlite, set_log
+from tests.helper.table import get_table_01
+
+__all__ = [
+    "TestWriteBehind"
+]
+
+
+def _get_table() -> Table:
+    _sqlite = get_sqlite(filename="test.sqlite", clean=True)
+    _table = get_table_01(sqlite_object=_sqlite)
+    _table.init()
+    return _table
+
+
+def _clean(table: Table):
+    if os.path.exists(table.sqlite.filename) is True:
+        os.remove(table.sqlite.filename)
+    return
+
+
+def _add(table: Table, start: int, stop: int):
+    for _number in range(start, stop):
+        _data = table.new_data()
+        _data.testid = _number
+        _data.testname = "Test{0:d}".format(_number)
+        table.add(_data)
+    return
+
+
+class TestWriteBehind(unittest.TestCase):
+    """Testing class for locking module."""
+
+    def setUp(self):
+        set_log()
+        return
+
+    def test_writer_01(self):
+        _table = _get_table()
+
+        _check = _table.start_writer(flush_size=10, flush_delay=60.0)
+        self.assertTrue(_check)
+
+        _add(_table, 0, 25)
+        self.assertEqual(_table.data_count, 0)
+
+        _start = time.monotonic()
+        while (_table.writer.stored < 20) and ((time.monotonic() - _start) < 5.0):
+            time.sleep(0.01)
+
+        self.assertEqual(_table.writer.stored, 20)
+        self.assertEqual(_table.writer.pending, 5)
+
+        _check = _table.flush()
+        self.assertTrue(_check)
+        self.assertEqual(_table.writer.pending, 0)
+        self.assertEqual(_table.writer.batches, 3)
+        self.assertEqual(_table.check(), 25)
+
+        _check = _table.close()
+        self.assertTrue(_check)
+        self.assertIsNone(_table.writer)
+        _clean(_table)
+        return
+
+    def test_writer_02(self):
+        _table = _get_table()
+
+        _check = _table.start_writer(flush_size=1000, flush_delay=0.05)
+        self.assertTrue(_check)
+
+        _add(_table, 0, 5)
+
+        _start = time.monotonic()
+        while (_table.writer.stored < 5) and ((time.monotonic() - _start) < 5.0):
+            time.sleep(0.01)
+
+        self.assertEqual(_table.writer.stored, 5)
+        self.assertEqual(_table.writer.batches, 1)
+
+        _add(_table, 3, 8)
+        _writer = _table.writer
+
+        _check = _table.close()
+        self.assertTrue(_check)
+        self.assertEqual(_writer.stored, 8)
+        self.assertEqual(_writer.dropped, 2)
+        self.assertEqual(_table.sqlite.dropped, 2)
+        self.assertEqual(_table.check(), 8)
+        _clean(_table)
+        return
+
+    def test_writer_03(self):
+        _table = _get_table()
+
+        _check = _table.start_writer(flush_size=5, flush_delay=60.0, max_pending=5)
+        self.assertTrue(_check)
+
+        _check = _table.start_writer()
+        self.assertFalse(_check)
+
+        _add(_table, 0, 50)
+        self.assertLessEqual(len(_table.writer._queue), 5)
+
+        _writer = _table.writer
+
+        _check = _table.close()
+        self.assertTrue(_check)
+        self.assertEqual(_writer.stored, 50)
+        self.assertEqual(_writer.batches, 10)
+
+        _check = _table.close()
+        self.assertTrue(_check)
+
+        _check = _writer.add(_table.new_data())
+        self.assertFalse(_check)
+        _clean(_table)
+        return
+
+    @mock.patch('bbutil.database.sqlite.SQLite.insert', new=Mock(return_value=-1))
+    def test_writer_04(self):
+        _table = _get_table()
+
+        _check = _table.start_writer(flush_size=5)
+        self.assertTrue(_check)
+
+        _add(_table, 0, 3)
+
+        _check = _table.flush()
+        self.assertFalse(_check)
+        self.assertEqual(_table.writer.failed, 3)
+
+        _check = _table.flush()
+        self.assertTrue(_check)
+
+        _table.close()
+        _clean(_table)
+        return
+
+    def test_writer_05(self):
+        _writer = WriteBehind(table_name="tester01")
+
+        _check = _writer.start()
+        self.assertFalse(_check)
+
+        _check = _writer.add(Mock())
+        self.assertFalse(_check)
+
+        _check = _writer.flush()
+        self.assertTrue(_check)
+
+        _table = _get_table()
+        _writer = WriteBehind(table_name="tester01", sqlite=_table.sqlite, flush_size=0)
+
+        _check = _writer.start()
+        self.assertFalse(_check)
+        _clean(_table)
+        return